@@ -0,0 +1,104 @@
+"""
+CloudWatch Embedded Metric Format (EMF) 메트릭 로거
+PutMetricData API 호출 없이 구조화된 로그 한 줄로 메트릭을 기록합니다.
+CloudWatch Logs가 로그를 수집하면서 메트릭을 자동으로 추출합니다.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# EMF 스펙 제한: 디렉티브당 최대 100개 메트릭, 메트릭당 최대 100개 값 (넘는 값은 여러 줄로 나눠 출력)
+MAX_METRICS_PER_DIRECTIVE = 100
+MAX_VALUES_PER_METRIC = 100
+
+
+class MetricsLogger:
+    """
+    메트릭을 메모리에 모았다가 flush() 시 EMF 로그 라인으로 출력합니다.
+    같은 차원(dimension) 조합의 메트릭은 한 줄로 묶입니다.
+    """
+
+    def __init__(self, namespace: str, properties: Optional[Dict[str, Any]] = None):
+        self.namespace = namespace
+        self.properties: Dict[str, Any] = dict(properties or {})
+        # (차원 튜플) -> {메트릭 이름: (단위, [값...])}
+        self._metrics: Dict[Tuple[Tuple[str, str], ...], Dict[str, Tuple[str, List[float]]]] = {}
+
+    def set_property(self, key: str, value: Any) -> None:
+        """
+        메트릭이 아닌 검색용 필드를 추가합니다 (Logs Insights에서 조회 가능).
+        """
+        self.properties[key] = value
+
+    def put_metric(self, name: str, value: float, unit: str = 'None',
+                   dimensions: Optional[Dict[str, str]] = None) -> None:
+        """
+        메트릭 값을 기록합니다. 같은 이름/차원으로 여러 번 기록하면 값 배열로 전송됩니다.
+        """
+        key = tuple(sorted((k, str(v)) for k, v in (dimensions or {}).items()))
+        group = self._metrics.setdefault(key, {})
+        if name in group:
+            group[name][1].append(value)
+        else:
+            group[name] = (unit, [value])
+
+    @contextmanager
+    def timed_call(self, operation: str, dimensions: Optional[Dict[str, str]] = None):
+        """
+        AWS API 호출 지연 시간(ApiLatency)과 실패 횟수(ApiFailures)를 기록합니다.
+        """
+        dims = dict(dimensions or {})
+        dims['Operation'] = operation
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.put_metric('ApiFailures', 1, 'Count', dims)
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.put_metric('ApiLatency', round(elapsed_ms, 2), 'Milliseconds', dims)
+
+    def serialize(self) -> List[str]:
+        """
+        기록된 메트릭을 EMF JSON 문자열 목록으로 변환합니다.
+        """
+        timestamp = int(time.time() * 1000)
+        lines = []
+
+        for dims, metrics in self._metrics.items():
+            names = list(metrics.keys())
+            for i in range(0, len(names), MAX_METRICS_PER_DIRECTIVE):
+                chunk = names[i:i + MAX_METRICS_PER_DIRECTIVE]
+                # 값이 100개를 넘는 메트릭은 버리지 않고 100개씩 다음 줄로 나눠 출력
+                line_count = max((len(metrics[name][1]) - 1) // MAX_VALUES_PER_METRIC + 1 for name in chunk)
+                for j in range(line_count):
+                    start = j * MAX_VALUES_PER_METRIC
+                    present = [name for name in chunk if len(metrics[name][1]) > start]
+                    payload: Dict[str, Any] = dict(self.properties)
+                    payload.update(dims)
+                    payload['_aws'] = {
+                        'Timestamp': timestamp,
+                        'CloudWatchMetrics': [{
+                            'Namespace': self.namespace,
+                            'Dimensions': [[k for k, _ in dims]],
+                            'Metrics': [{'Name': name, 'Unit': metrics[name][0]} for name in present]
+                        }]
+                    }
+                    for name in present:
+                        values = metrics[name][1][start:start + MAX_VALUES_PER_METRIC]
+                        payload[name] = values[0] if len(values) == 1 else values
+                    lines.append(json.dumps(payload, default=str))
+
+        return lines
+
+    def flush(self) -> None:
+        """
+        EMF 로그 라인을 stdout으로 출력하고 버퍼를 비웁니다.
+        Lambda의 stdout은 CloudWatch Logs로 전달되어 메트릭이 추출됩니다.
+        """
+        for line in self.serialize():
+            print(line)
+        self._metrics.clear()
@@ -0,0 +1,190 @@
+"""
+Lambda 공통 런타임 모듈
+- boto3 클라이언트 지연 생성 + 캐시 (실제로 사용하는 코드 경로에서만 생성 비용 발생)
+- 연결 풀 / 재시도 / 타임아웃 설정 튜닝
+- 콜드 스타트 시 모듈 import / init 시간 측정
+
+핸들러 모듈은 표준 라이브러리 다음에 이 모듈을 가장 먼저 import 해야
+import 시간이 정확하게 측정됩니다.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 이 모듈이 로드된 시점 (핸들러 모듈 import 시작 시점으로 간주)
+_LOADED_AT = time.perf_counter()
+
+_clients: Dict[str, Any] = {}
+_client_init_ms: Dict[str, float] = {}
+_clients_lock = threading.Lock()
+
+_init_ms: Optional[float] = None
+_cold_start = True
+
+# 클라이언트 설정 (환경 변수로 조정 가능)
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '10'))
+RETRY_MODE = os.environ.get('AWS_RETRY_MODE', 'standard')
+MAX_ATTEMPTS = int(os.environ.get('AWS_MAX_ATTEMPTS', '3'))
+CONNECT_TIMEOUT = float(os.environ.get('AWS_CONNECT_TIMEOUT', '2'))
+READ_TIMEOUT = float(os.environ.get('AWS_READ_TIMEOUT', '10'))
+
+
+def _build_client(service_name: str) -> Any:
+    # boto3/botocore import 자체가 콜드 스타트의 큰 비중을 차지하므로 첫 사용 시점에 import
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        retries={'mode': RETRY_MODE, 'max_attempts': MAX_ATTEMPTS},
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        tcp_keepalive=True
+    )
+    return boto3.client(service_name, config=config)
+
+
+def get_client(service_name: str) -> Any:
+    """
+    boto3 클라이언트를 반환합니다. 첫 호출 시 생성하고, 이후 warm 호출에서는 캐시를 재사용합니다.
+    """
+    client = _clients.get(service_name)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(service_name)
+        if client is None:
+            start = time.perf_counter()
+            client = _build_client(service_name)
+            _client_init_ms[service_name] = round((time.perf_counter() - start) * 1000, 2)
+            _clients[service_name] = client
+        return client
+
+
+def set_client(service_name: str, client: Any) -> None:
+    """
+    클라이언트를 직접 주입합니다 (로컬 시뮬레이션 / 테스트용).
+    """
+    with _clients_lock:
+        _clients[service_name] = client
+
+
+def reset_clients() -> None:
+    """
+    캐시된 클라이언트를 모두 제거합니다.
+    """
+    with _clients_lock:
+        _clients.clear()
+        _client_init_ms.clear()
+
+
+def mark_init() -> float:
+    """
+    핸들러 모듈의 import/init이 끝난 시점에 호출합니다.
+    이 모듈 로드 이후 경과 시간(ms)을 기록하고 반환합니다.
+    """
+    global _init_ms
+    _init_ms = round((time.perf_counter() - _LOADED_AT) * 1000, 2)
+    return _init_ms
+
+
+def consume_cold_start() -> bool:
+    """
+    컨테이너의 첫 번째 호출이면 True를 반환합니다 (이후 호출은 False).
+    """
+    global _cold_start
+    cold, _cold_start = _cold_start, False
+    return cold
+
+
+def init_stats() -> Dict[str, Any]:
+    """
+    init 시간과 클라이언트별 생성 시간을 반환합니다.
+    """
+    return {
+        'init_ms': _init_ms,
+        'client_init_ms': dict(_client_init_ms)
+    }
+
+
+def record_cold_start(metrics: Any, dimensions: Optional[Dict[str, str]] = None) -> None:
+    """
+    콜드 스타트 호출이면 init 시간과 클라이언트 생성 시간을 메트릭으로 기록합니다.
+    metrics는 put_metric(name, value, unit, dimensions)을 제공하는 객체 (emf_metrics.MetricsLogger)
+    """
+    if not consume_cold_start():
+        return
+
+    dims = dict(dimensions or {})
+    metrics.put_metric('ColdStart', 1, 'Count', dims)
+    if _init_ms is not None:
+        metrics.put_metric('InitDuration', _init_ms, 'Milliseconds', dims)
+    for service_name, elapsed_ms in _client_init_ms.items():
+        metrics.put_metric('ClientInitLatency', elapsed_ms, 'Milliseconds', dict(dims, Client=service_name))
+
+
+class CachedValue:
+    """
+    warm 호출 간에 유지되는 TTL 캐시 (SSM 파라미터 등 비밀 값 조회용)
+    - 만료 전 refresh_ahead 초 구간에 들어오면 호출 안에서 동기적으로 갱신
+      (Lambda는 호출 사이에 실행 환경을 멈추므로 백그라운드 스레드 갱신은 끝나지 않을 수 있음)
+      갱신에 실패하면 기존 값을 만료 시점까지 계속 사용하고, 다른 스레드는 갱신을 기다리지 않고 기존 값을 사용
+    - 만료되었거나 값이 없으면 동기적으로 조회
+    - invalidate() 후에는 다음 get()에서 다시 조회하며, invalidate() 전에 시작된 조회 결과는 저장하지 않음
+    - logger: 갱신 실패를 기록할 structured_log 로거 (기본 'lambda-runtime')
+    """
+
+    def __init__(self, loader, ttl: float, refresh_ahead: float = 0, logger: Any = None):
+        self._loader = loader
+        self._logger = logger
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self._value: Any = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _load(self, generation: int) -> Any:
+        value = self._loader()
+        with self._lock:
+            # 조회 중에 invalidate()되었으면 (예: 403/404/410 응답) 오래된 값을 되살리지 않음
+            if generation == self._generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    def _refresh(self, value: Any, generation: int) -> Any:
+        try:
+            return self._load(generation)
+        except Exception as e:
+            logger = self._logger
+            if logger is None:
+                from structured_log import get_logger
+                logger = get_logger('lambda-runtime')
+            logger.warning('Refresh failed, using cached value', error=str(e))
+            return value
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            value, expires_at, generation = self._value, self._expires_at, self._generation
+            if value is not None and now < expires_at:
+                if now < expires_at - self.refresh_ahead or self._refreshing:
+                    return value
+                self._refreshing = True
+        if value is not None and now < expires_at:
+            return self._refresh(value, generation)
+        return self._load(generation)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._value = None
+            self._expires_at = 0.0
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Lambda 핸들러 모듈 import(init) 시간 측정 도구
+매번 새 Python 프로세스에서 핸들러 모듈을 import 하여 콜드 스타트의 init 구간을 재현합니다.
+
+사용 예:
+    python lambda-common/measure_init.py lambda-scheduler/start_infrastructure.py
+    python lambda-common/measure_init.py lambda-slack-notification/slack_notification.py --runs 20 --json
+    python lambda-common/measure_init.py lambda-scheduler/start_infrastructure.zip
+
+.zip을 지정하면 임시 디렉터리에 풀어서 배포 패키지 내용(.py / .pyc)만으로 import 합니다.
+(핸들러 모듈 이름은 ZIP 파일 이름과 같다고 가정, Lambda의 /var/task처럼 바이트코드 캐시를 쓰지 않음)
+
+변경 전/후 revision에서 각각 실행해 init 시간 감소를 비교할 수 있습니다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+from typing import Any, Dict, List
+
+COMMON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 자식 프로세스에서 실행할 측정 코드
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed_ms = (time.perf_counter() - start) * 1000
+runtime = sys.modules.get('lambda_runtime')
+stats = runtime.init_stats() if runtime else {}
+print(json.dumps({'import_ms': elapsed_ms, 'init_ms': stats.get('init_ms'), 'modules': len(sys.modules)}))
+"""
+
+
+def measure(handler_path: str, runs: int) -> Dict[str, Any]:
+    """
+    핸들러 모듈을 runs번 새 프로세스에서 import 하고 통계를 반환합니다.
+    """
+    module_name = os.path.splitext(os.path.basename(handler_path))[0]
+    if handler_path.endswith('.zip'):
+        with tempfile.TemporaryDirectory() as package_dir:
+            with zipfile.ZipFile(handler_path) as package:
+                package.extractall(package_dir)
+            report = _measure(module_name, [package_dir], runs)
+        report['package_bytes'] = os.path.getsize(handler_path)
+        return report
+    return _measure(module_name, [os.path.dirname(os.path.abspath(handler_path)), COMMON_DIR], runs)
+
+
+def _measure(module_name: str, paths: List[str], runs: int) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+    env['PYTHONPATH'] = os.pathsep.join(paths + [env.get('PYTHONPATH', '')])
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+
+    samples: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE, module_name],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_ms = [s['import_ms'] for s in samples]
+    return {
+        'module': module_name,
+        'runs': runs,
+        'import_ms_median': round(statistics.median(import_ms), 2),
+        'import_ms_min': round(min(import_ms), 2),
+        'import_ms_max': round(max(import_ms), 2),
+        'loaded_modules': samples[-1]['modules']
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Lambda 핸들러 모듈 import(init) 시간 측정')
+    parser.add_argument('handlers', nargs='+', help='핸들러 파일 또는 배포 ZIP 경로')
+    parser.add_argument('--runs', type=int, default=10, help='측정 반복 횟수 (기본 10)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    reports = [measure(path, args.runs) for path in args.handlers]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for r in reports:
+            print(f"{r['module']}: median {r['import_ms_median']}ms "
+                  f"(min {r['import_ms_min']}ms, max {r['import_ms_max']}ms, "
+                  f"{r['loaded_modules']} modules, {r['runs']} runs)"
+                  + (f", package {r['package_bytes']} bytes" if 'package_bytes' in r else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Lambda 공용 구조화 로거
+한 줄에 JSON 객체 하나를 출력하여 CloudWatch Logs Insights로 필드 단위 조회가 가능하고,
+배포 폭주 시 로그 수집량과 핫 패스의 직렬화 비용을 줄이기 위한 기능을 제공합니다.
+
+- 레벨 제어: LOG_LEVEL (DEBUG / INFO / WARNING / ERROR, 기본 INFO)
+- 샘플링: 대량 이벤트 종류별 출력 비율 LOG_SAMPLE_RATES (예: "ECS Task State Change=0.01,Target Health=0.1")
+- 축약: 문자열은 LOG_MAX_FIELD_LENGTH 자, 목록은 LOG_MAX_LIST_ITEMS 개까지만 출력
+- 비용 측정: 호출별 출력 줄 수 / 바이트 수 / 소요 시간을 EMF 메트릭으로 기록 (record_stats)
+
+사용 예:
+    log = get_logger('slack-notification')
+    log.info('Notification sent', route='deployment', latency_ms=12.3)
+    log.sampled(event['detail-type'], 'Received event', event=summarize_event(event))
+"""
+
+import json
+import os
+import random
+import time
+import traceback
+from typing import Any, Dict, Optional
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# traceback 최대 길이 (문자)
+MAX_TRACEBACK_LENGTH = 4000
+
+# 이벤트 요약에 포함할 detail 필드 (전체 이벤트 대신 출력)
+EVENT_DETAIL_FIELDS = (
+    'serviceName', 'group', 'eventType', 'eventName', 'deploymentStatus',
+    'lastStatus', 'desiredStatus', 'stopCode', 'stoppedReason'
+)
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """
+    "키=비율,키=비율" 형식을 파싱합니다 (키에 공백 허용).
+    """
+    rates = {}
+    for part in value.split(','):
+        key, sep, rate = part.rpartition('=')
+        if sep and key.strip():
+            rates[key.strip()] = float(rate)
+    return rates
+
+
+def truncate(value: Any, max_length: int, max_items: int, depth: int = 0) -> Any:
+    """
+    긴 문자열 / 목록 / 깊은 중첩을 잘라냅니다.
+    """
+    if isinstance(value, str):
+        return value if len(value) <= max_length else f"{value[:max_length]}...(+{len(value) - max_length})"
+    if depth >= 4:
+        return '...'
+    if isinstance(value, dict):
+        return {key: truncate(item, max_length, max_items, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [truncate(item, max_length, max_items, depth + 1) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"...(+{len(value) - max_items})")
+        return items
+    return value
+
+
+def summarize_event(event: Any) -> Any:
+    """
+    EventBridge 이벤트에서 식별과 장애 분석에 필요한 필드만 골라냅니다.
+    """
+    if not isinstance(event, dict):
+        return event
+    detail = event.get('detail') or {}
+    summary = {
+        'id': event.get('id'),
+        'source': event.get('source'),
+        'detail-type': event.get('detail-type'),
+        'time': event.get('time'),
+        'resources': event.get('resources', [])
+    }
+    selected = {key: detail[key] for key in EVENT_DETAIL_FIELDS if key in detail}
+    if 'targetHealth' in detail:
+        selected['targetHealth'] = detail['targetHealth'].get('state')
+        selected['target'] = detail.get('target', {}).get('id')
+    if selected:
+        summary['detail'] = selected
+    return summary
+
+
+class StructuredLogger:
+    """
+    JSON Lines 로거 (호출 단위 출력량 통계 포함)
+    """
+
+    def __init__(self, name: str, level: Optional[str] = None,
+                 sample_rates: Optional[Dict[str, float]] = None,
+                 max_field_length: Optional[int] = None, max_list_items: Optional[int] = None):
+        self.name = name
+        self.level = LEVELS.get((level or os.environ.get('LOG_LEVEL', 'INFO')).upper(), LEVELS['INFO'])
+        self.sample_rates = (sample_rates if sample_rates is not None
+                             else parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES', '')))
+        self.max_field_length = max_field_length or int(os.environ.get('LOG_MAX_FIELD_LENGTH', '256'))
+        self.max_list_items = max_list_items or int(os.environ.get('LOG_MAX_LIST_ITEMS', '10'))
+        self.context: Dict[str, Any] = {}
+        self._random = random.random
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.lines = 0
+        self.bytes = 0
+        self.sampled_out = 0
+        self.elapsed_ms = 0.0
+
+    def bind(self, **fields: Any) -> None:
+        """
+        이후 모든 로그 줄에 포함할 필드를 설정합니다 (예: request_id). None 값은 제거합니다.
+        """
+        for key, value in fields.items():
+            if value is None:
+                self.context.pop(key, None)
+            else:
+                self.context[key] = value
+
+    def enabled(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def _emit(self, level: str, message: str, fields: Dict[str, Any],
+              raw: Optional[Dict[str, Any]] = None) -> None:
+        start = time.perf_counter()
+        record = {'level': level, 'logger': self.name, 'message': message}
+        record.update(self.context)
+        for key, value in fields.items():
+            record[key] = truncate(value, self.max_field_length, self.max_list_items)
+        if raw:
+            record.update(raw)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        print(line)
+        self.lines += 1
+        self.bytes += len(line.encode('utf-8')) + 1
+        self.elapsed_ms += (time.perf_counter() - start) * 1000
+
+    def log(self, level: str, message: str, **fields: Any) -> None:
+        if self.enabled(level):
+            self._emit(level, message, fields)
+
+    def debug(self, message: str, **fields: Any) -> None:
+        self.log('DEBUG', message, **fields)
+
+    def info(self, message: str, **fields: Any) -> None:
+        self.log('INFO', message, **fields)
+
+    def warning(self, message: str, **fields: Any) -> None:
+        self.log('WARNING', message, **fields)
+
+    def error(self, message: str, **fields: Any) -> None:
+        self.log('ERROR', message, **fields)
+
+    def exception(self, message: str, **fields: Any) -> None:
+        """
+        ERROR 레벨로 현재 처리 중인 예외의 traceback(끝부분)을 함께 출력합니다.
+        """
+        if self.enabled('ERROR'):
+            self._emit('ERROR', message, fields, {'traceback': traceback.format_exc()[-MAX_TRACEBACK_LENGTH:]})
+
+    def sampled(self, key: str, message: str, level: str = 'INFO', **fields: Any) -> None:
+        """
+        key(이벤트 종류 등)별 샘플링 비율에 따라 출력합니다. 비율이 없는 key는 항상 출력합니다.
+        """
+        if not self.enabled(level):
+            return
+        rate = self.sample_rates.get(key, 1.0)
+        if rate < 1.0 and self._random() >= rate:
+            self.sampled_out += 1
+            return
+        if rate < 1.0:
+            fields['sample_rate'] = rate
+        self._emit(level, message, fields)
+
+    def record_stats(self, metrics: Any, dimensions: Optional[Dict[str, str]] = None) -> None:
+        """
+        이번 호출의 로그 출력량 / 소요 시간을 메트릭으로 기록하고 통계를 초기화합니다.
+        출력한 로그가 없으면 메트릭 줄 자체가 로그를 늘리지 않도록 기록하지 않습니다.
+        """
+        if self.lines:
+            metrics.put_metric('LogLines', self.lines, 'Count', dimensions)
+            metrics.put_metric('LogBytes', self.bytes, 'Bytes', dimensions)
+            metrics.put_metric('LoggingTime', round(self.elapsed_ms, 3), 'Milliseconds', dimensions)
+        self.reset_stats()
+
+
+_loggers: Dict[str, StructuredLogger] = {}
+
+
+def get_logger(name: str, **kwargs: Any) -> StructuredLogger:
+    """
+    이름별로 하나의 로거를 공유합니다 (같은 Lambda의 여러 모듈이 출력량 통계를 함께 집계).
+    kwargs는 처음 생성할 때만 적용됩니다.
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = StructuredLogger(name, **kwargs)
+    return logger
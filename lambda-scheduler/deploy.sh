@@ -3,12 +3,18 @@
 
 set -e
 
+cd "$(dirname "$0")"
+
 echo "🚀 Lambda 함수 배포 시작..."
 
 # ZIP 파일 생성
 echo "📦 ZIP 파일 생성 중..."
-zip -j stop_infrastructure.zip stop_infrastructure.py
-zip -j start_infrastructure.zip start_infrastructure.py
+# 핸들러와 필요한 공통 모듈(../lambda-common)만 포함 (시뮬레이션 하네스 등은 제외)
+COMMON_MODULES="../lambda-common/lambda_runtime.py ../lambda-common/emf_metrics.py ../lambda-common/structured_log.py"
+# 같은 소스면 같은 ZIP이 나오는지 확인 (다르면 terraform apply마다 재배포됨)
+export PACKAGE_CHECK_REPRODUCIBLE=true
+../lambda-common/package.sh stop_infrastructure.zip stop_infrastructure.py $COMMON_MODULES
+../lambda-common/package.sh start_infrastructure.zip start_infrastructure.py $COMMON_MODULES
 
 echo "✅ ZIP 파일 생성 완료"
 echo ""
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+스케줄러 Lambda 오프라인 시뮬레이션 / 벤치마크 하네스
+실제 AWS 계정 없이 start/stop 핸들러를 시뮬레이션된 ECS 백엔드에 대해 실행합니다.
+
+- API 지연, 스로틀링(토큰 버킷 + botocore standard 재시도 모델), task 기동 지연을 설정 가능
+- 2~200개 서비스 클러스터에 대해 실행 시간, API 호출 수, 스로틀 재시도 수를 측정
+- 핸들러가 출력하는 EMF 로그를 수집하여 TimeToStable 등 메트릭도 요약
+
+사용 예:
+    python simulate_scheduler.py --action start --services 2 10 50 200
+    python simulate_scheduler.py --action stop --services 200 --rate 5 --burst 10 --json
+    python simulate_scheduler.py --action start --services 20 --time-scale 0.01  # 실제 sleep (동시성 측정용)
+
+기본값은 가상 시계(virtual clock)를 사용하므로 몇 분짜리 기동 대기도 즉시 끝납니다.
+가상 시계는 모든 대기를 하나의 타임라인에 누적하므로 순차 실행을 기준으로 측정합니다.
+스레드 동시성 효과를 측정하려면 --time-scale 로 실제 시간 축소 모드를 사용하세요.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+SCHEDULER_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMON_DIR = os.path.join(SCHEDULER_DIR, '..', 'lambda-common')
+
+# DescribeServices 호출당 최대 서비스 수 (실제 ECS 제한)
+DESCRIBE_SERVICES_LIMIT = 10
+
+
+class ThrottlingException(Exception):
+    pass
+
+
+class ServiceNotFoundException(Exception):
+    pass
+
+
+class InvalidParameterException(Exception):
+    pass
+
+
+class WaiterError(Exception):
+    pass
+
+
+class SimClock:
+    """
+    시뮬레이션 시계
+    - scale=None: 가상 시계 (sleep은 시간만 전진, 실제 대기 없음)
+    - scale=0.01: 실제 시간 축소 (시뮬레이션 1초 = 실제 10ms)
+    핸들러 모듈의 `time` 대신 주입할 수 있도록 perf_counter/monotonic/time/sleep을 제공합니다.
+    """
+
+    def __init__(self, scale: Optional[float] = None):
+        self.scale = scale
+        self._virtual = 0.0
+        self._lock = threading.Lock()
+        self._real_start = time.monotonic()
+        self._epoch_start = time.time()
+
+    def now(self) -> float:
+        if self.scale is None:
+            with self._lock:
+                return self._virtual
+        return (time.monotonic() - self._real_start) / self.scale
+
+    def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        if self.scale is None:
+            with self._lock:
+                self._virtual += seconds
+        else:
+            time.sleep(seconds * self.scale)
+
+    perf_counter = now
+    monotonic = now
+
+    def time(self) -> float:
+        return self._epoch_start + self.now()
+
+
+class TokenBucket:
+    """
+    API별 요청 속도 제한 (초당 rate개 충전, 최대 burst개)
+    """
+
+    def __init__(self, clock: SimClock, rate: float, burst: int):
+        self.clock = clock
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = clock.now()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = self.clock.now()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class SimulatedWaiter:
+    """
+    boto3 `services_stable` waiter와 동일한 규칙으로 동작하는 waiter
+    (모든 서비스의 runningCount == desiredCount 가 될 때까지 Delay 간격으로 폴링)
+    """
+
+    def __init__(self, backend: 'SimulatedECS'):
+        self.backend = backend
+
+    def wait(self, cluster: str, services: List[str], WaiterConfig: Optional[Dict[str, Any]] = None) -> None:
+        config = WaiterConfig or {}
+        delay = config.get('Delay', 15)
+        max_attempts = config.get('MaxAttempts', 40)
+
+        for attempt in range(max_attempts):
+            response = self.backend.describe_services(cluster=cluster, services=services)
+            if response['failures']:
+                raise WaiterError(f"Waiter services_stable failed: {response['failures']}")
+            if all(s['runningCount'] == s['desiredCount'] for s in response['services']):
+                return
+            if attempt < max_attempts - 1:
+                self.backend.clock.sleep(delay)
+
+        raise WaiterError('Waiter services_stable failed: Max attempts exceeded')
+
+
+class SimulatedECS:
+    """
+    ECS 클라이언트 대역 (update_service / describe_services / get_waiter)
+
+    스로틀링되면 botocore standard 재시도 모드처럼 지수 백오프 + 지터로
+    최대 max_attempts 회까지 내부 재시도하고, 재시도 횟수를 집계합니다.
+    """
+
+    class exceptions:
+        ServiceNotFoundException = ServiceNotFoundException
+        InvalidParameterException = InvalidParameterException
+        ThrottlingException = ThrottlingException
+
+    def __init__(self, clock: SimClock, services: Dict[str, int], api_latency: float = 0.08,
+                 rate: float = 20.0, burst: int = 40, task_start_delay: float = 45.0,
+                 task_start_jitter: float = 10.0, max_attempts: int = 3, seed: int = 0):
+        self.clock = clock
+        self.api_latency = api_latency
+        self.task_start_delay = task_start_delay
+        self.task_start_jitter = task_start_jitter
+        self.max_attempts = max_attempts
+        self.rng = random.Random(seed)
+        self.rate = rate
+        self.burst = burst
+
+        self.call_counts: Counter = Counter()
+        self.throttle_retries: Counter = Counter()
+        self.throttle_failures: Counter = Counter()
+
+        # 서비스 이름 -> {'desired': n, 'ready_at': [task별 RUNNING 전환 시각]}
+        self._services = {
+            name: {'desired': count, 'ready_at': [0.0] * count}
+            for name, count in services.items()
+        }
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, operation: str) -> TokenBucket:
+        with self._lock:
+            if operation not in self._buckets:
+                self._buckets[operation] = TokenBucket(self.clock, self.rate, self.burst)
+            return self._buckets[operation]
+
+    def _call(self, operation: str, fn):
+        bucket = self._bucket(operation)
+        for attempt in range(1, self.max_attempts + 1):
+            with self._lock:
+                self.call_counts[operation] += 1
+            self.clock.sleep(self.api_latency)
+            if bucket.try_acquire():
+                return fn()
+            if attempt == self.max_attempts:
+                break
+            with self._lock:
+                self.throttle_retries[operation] += 1
+                backoff = self.rng.random() * min(20.0, 2 ** (attempt - 1))
+            self.clock.sleep(backoff)
+
+        with self._lock:
+            self.throttle_failures[operation] += 1
+        raise ThrottlingException(f'An error occurred (ThrottlingException) when calling the {operation} operation: Rate exceeded')
+
+    def _running_count(self, state: Dict[str, Any]) -> int:
+        now = self.clock.now()
+        return sum(1 for ready_at in state['ready_at'] if ready_at <= now)
+
+    def update_service(self, cluster: str, service: str, desiredCount: int, **kwargs) -> Dict[str, Any]:
+        def apply():
+            with self._lock:
+                state = self._services.get(service)
+                if state is None:
+                    raise ServiceNotFoundException(f'Service not found: {service}')
+                running = self._running_count(state)
+                ready_at = sorted(state['ready_at'])[:desiredCount]
+                now = self.clock.now()
+                while len(ready_at) < desiredCount:
+                    jitter = self.rng.uniform(0, self.task_start_jitter)
+                    ready_at.append(now + self.task_start_delay + jitter)
+                state['desired'] = desiredCount
+                state['ready_at'] = ready_at
+                return {'service': {
+                    'serviceName': service,
+                    'desiredCount': desiredCount,
+                    'runningCount': running
+                }}
+
+        return self._call('UpdateService', apply)
+
+    def describe_services(self, cluster: str, services: List[str], **kwargs) -> Dict[str, Any]:
+        if len(services) > DESCRIBE_SERVICES_LIMIT:
+            raise InvalidParameterException(f'services can have at most {DESCRIBE_SERVICES_LIMIT} items')
+
+        def describe():
+            with self._lock:
+                found, failures = [], []
+                for name in services:
+                    state = self._services.get(name)
+                    if state is None:
+                        failures.append({'arn': name, 'reason': 'MISSING'})
+                        continue
+                    found.append({
+                        'serviceName': name,
+                        'desiredCount': state['desired'],
+                        'runningCount': self._running_count(state)
+                    })
+                return {'services': found, 'failures': failures}
+
+        return self._call('DescribeServices', describe)
+
+    def get_waiter(self, name: str) -> SimulatedWaiter:
+        if name != 'services_stable':
+            raise ValueError(f'Unsupported waiter: {name}')
+        return SimulatedWaiter(self)
+
+
+def load_handler(action: str, service_names: List[str], desired_count: int):
+    """
+    SCHEDULED_SERVICES 환경 변수를 설정한 뒤 핸들러 모듈을 새로 로드합니다.
+    """
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+    os.environ['SCHEDULED_SERVICES'] = ','.join(f'{name}:{desired_count}' for name in service_names)
+    if COMMON_DIR not in sys.path:
+        sys.path.insert(0, COMMON_DIR)
+
+    module_name = f'{action}_infrastructure'
+    path = os.path.join(SCHEDULER_DIR, f'{module_name}.py')
+    spec = importlib.util.spec_from_file_location(f'sim_{module_name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_emf_lines(output: str) -> List[Dict[str, Any]]:
+    """
+    핸들러 stdout에서 EMF 로그 라인만 골라 파싱합니다.
+    """
+    records = []
+    for line in output.splitlines():
+        if line.startswith('{') and '"_aws"' in line:
+            records.append(json.loads(line))
+    return records
+
+
+def collect_metric(records: List[Dict[str, Any]], name: str) -> List[float]:
+    values: List[float] = []
+    for record in records:
+        value = record.get(name)
+        if value is None:
+            continue
+        values.extend(value if isinstance(value, list) else [value])
+    return values
+
+
+def run_scenario(action: str, service_count: int, args) -> Dict[str, Any]:
+    """
+    서비스 service_count개 클러스터에 대해 핸들러를 한 번 실행하고 측정 결과를 반환합니다.
+    """
+    service_names = [f'sim-service-{i:03d}' for i in range(service_count)]
+    clock = SimClock(args.time_scale)
+    initial_count = 0 if action == 'start' else args.desired_count
+    backend = SimulatedECS(
+        clock,
+        {name: initial_count for name in service_names},
+        api_latency=args.latency,
+        rate=args.rate,
+        burst=args.burst,
+        task_start_delay=args.task_start_delay,
+        task_start_jitter=args.task_start_jitter,
+        max_attempts=args.max_attempts,
+        seed=args.seed
+    )
+
+    module = load_handler(action, service_names, args.desired_count)
+    lambda_runtime = sys.modules['lambda_runtime']
+    lambda_runtime.set_client('ecs', backend)
+    if hasattr(module, 'time'):
+        module.time = clock
+    emf_module = sys.modules.get('emf_metrics')
+    original_emf_time = emf_module.time if emf_module else None
+    if emf_module:
+        emf_module.time = clock
+
+    output = io.StringIO()
+    wall_start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            response = module.lambda_handler({}, None)
+    finally:
+        lambda_runtime.reset_clients()
+        if emf_module:
+            emf_module.time = original_emf_time
+    wall_seconds = time.perf_counter() - wall_start
+
+    body = json.loads(response['body'])
+    records = parse_emf_lines(output.getvalue())
+    time_to_stable = sorted(collect_metric(records, 'TimeToStable'))
+
+    return {
+        'action': action.upper(),
+        'services': service_count,
+        'wall_seconds': round(wall_seconds, 4),
+        'simulated_seconds': round(clock.now(), 2),
+        'api_calls': sum(backend.call_counts.values()),
+        'api_calls_by_operation': dict(backend.call_counts),
+        'throttle_retries': sum(backend.throttle_retries.values()),
+        'throttle_failures': sum(backend.throttle_failures.values()),
+        'successful': body['summary']['successful'],
+        'failed': body['summary']['failed'],
+        'emf_lines': len(records),
+        'time_to_stable_max_ms': time_to_stable[-1] if time_to_stable else None,
+        'time_to_stable_p50_ms': time_to_stable[len(time_to_stable) // 2] if time_to_stable else None
+    }
+
+
+def print_report(reports: List[Dict[str, Any]]) -> None:
+    header = f"{'action':<6} {'services':>8} {'wall(s)':>9} {'sim(s)':>10} {'api':>6} {'retries':>8} {'thr.fail':>8} {'ok':>5} {'fail':>5}"
+    print(header)
+    print('-' * len(header))
+    for r in reports:
+        print(f"{r['action']:<6} {r['services']:>8} {r['wall_seconds']:>9.3f} {r['simulated_seconds']:>10.1f} "
+              f"{r['api_calls']:>6} {r['throttle_retries']:>8} {r['throttle_failures']:>8} "
+              f"{r['successful']:>5} {r['failed']:>5}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='스케줄러 Lambda 오프라인 시뮬레이션 / 벤치마크')
+    parser.add_argument('--action', choices=['start', 'stop', 'both'], default='both')
+    parser.add_argument('--services', type=int, nargs='+', default=[2, 10, 50, 200],
+                        help='시뮬레이션할 서비스 수 목록 (기본: 2 10 50 200)')
+    parser.add_argument('--desired-count', type=int, default=1, help='서비스당 desired count')
+    parser.add_argument('--latency', type=float, default=0.08, help='API 호출당 지연 (초)')
+    parser.add_argument('--rate', type=float, default=20.0, help='API별 초당 허용 요청 수')
+    parser.add_argument('--burst', type=int, default=40, help='API별 버스트 허용량')
+    parser.add_argument('--max-attempts', type=int, default=3, help='스로틀 시 최대 시도 횟수 (botocore 기본 3)')
+    parser.add_argument('--task-start-delay', type=float, default=45.0, help='task가 RUNNING이 되기까지 걸리는 시간 (초)')
+    parser.add_argument('--task-start-jitter', type=float, default=10.0, help='task 기동 지연의 무작위 편차 (초)')
+    parser.add_argument('--time-scale', type=float, default=None,
+                        help='지정 시 가상 시계 대신 실제 sleep 사용 (예: 0.01 = 시뮬레이션 1초당 10ms)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    actions = ['stop', 'start'] if args.action == 'both' else [args.action]
+    reports = [run_scenario(action, count, args) for action in actions for count in args.services]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_report(reports)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,13 +5,14 @@
 """
 
 import json
-import boto3
+import time
 import os
 from datetime import datetime
 
-# AWS 클라이언트
-ecs = boto3.client('ecs')
-cloudwatch = boto3.client('cloudwatch')
+import lambda_runtime
+from emf_metrics import MetricsLogger
+from lambda_runtime import get_client
+from structured_log import get_logger
 
 # 환경 변수
 # AWS_REGION은 Lambda가 자동으로 제공
@@ -21,145 +22,165 @@ GREEN_SERVICE = os.environ.get('GREEN_SERVICE', 'chatapp-dev-service-green')
 BLUE_DESIRED_COUNT = int(os.environ.get('BLUE_DESIRED_COUNT', '1'))
 GREEN_DESIRED_COUNT = int(os.environ.get('GREEN_DESIRED_COUNT', '1'))
 
+# CloudWatch 메트릭 네임스페이스 (EMF 로그로 전송)
+METRIC_NAMESPACE = 'Infrastructure/Scheduler'
 
-def lambda_handler(event, context):
+# DescribeServices는 호출당 최대 10개 서비스만 조회 가능
+DESCRIBE_BATCH_SIZE = 10
+
+
+def load_targets():
     """
-    아침 시간대 인프라 재가동
-    - ECS 서비스 desired count를 원래대로 복구
+    재가동 대상 서비스 목록을 반환합니다.
+    {결과 키: (표시 이름, 서비스 이름, desired count)}
+
+    SCHEDULED_SERVICES (예: "svc-a:2,svc-b:1")가 설정되어 있으면
+    Blue/Green 서비스 대신 해당 목록을 사용합니다.
     """
+    scheduled = os.environ.get('SCHEDULED_SERVICES', '').strip()
+    if not scheduled:
+        return {
+            'ecs_blue': ('Blue', BLUE_SERVICE, BLUE_DESIRED_COUNT),
+            'ecs_green': ('Green', GREEN_SERVICE, GREEN_DESIRED_COUNT)
+        }
 
-    results = {
-        'timestamp': datetime.now().isoformat(),
-        'action': 'START',
-        'resources': {}
-    }
+    targets = {}
+    for entry in scheduled.split(','):
+        service_name, _, count = entry.strip().partition(':')
+        if service_name:
+            targets[service_name] = (service_name, service_name, int(count or 1))
+    return targets
 
-    try:
-        # 1. ECS Blue 서비스 재가동
-        print(f"Starting ECS service: {BLUE_SERVICE} (count: {BLUE_DESIRED_COUNT})")
-        blue_response = ecs.update_service(
-            cluster=CLUSTER_NAME,
-            service=BLUE_SERVICE,
-            desiredCount=BLUE_DESIRED_COUNT
-        )
-        results['resources']['ecs_blue'] = {
-            'status': 'SUCCESS',
-            'previous_count': 0,
-            'new_count': BLUE_DESIRED_COUNT,
-            'message': f'{BLUE_SERVICE} started'
-        }
-        print(f"✓ Blue service started: {BLUE_SERVICE}")
 
-        # 서비스 안정화 대기 (선택사항)
-        print(f"Waiting for {BLUE_SERVICE} to stabilize...")
-        waiter = ecs.get_waiter('services_stable')
-        waiter.wait(
-            cluster=CLUSTER_NAME,
-            services=[BLUE_SERVICE],
-            WaiterConfig={
-                'Delay': 15,
-                'MaxAttempts': 40  # 최대 10분 대기
-            }
-        )
-        print(f"✓ Blue service is now stable")
+TARGETS = load_targets()
 
-    except ecs.exceptions.ServiceNotFoundException:
-        results['resources']['ecs_blue'] = {
-            'status': 'FAILED',
-            'error': f'Service {BLUE_SERVICE} not found'
-        }
-        print(f"✗ Blue service not found: {BLUE_SERVICE}")
+# 구조화 로거 (LOG_LEVEL=DEBUG 이면 서비스별 진행 로그도 출력)
+log = get_logger('scheduler-start')
+
+# AWS 클라이언트는 lambda_runtime.get_client()로 첫 사용 시 생성
+lambda_runtime.mark_init()
 
-    except Exception as e:
-        results['resources']['ecs_blue'] = {
-            'status': 'FAILED',
-            'error': str(e)
-        }
-        print(f"✗ Failed to start Blue service: {e}")
+
+def start_service(label, service_name, desired_count, metrics):
+    """
+    ECS 서비스 하나를 재가동하고 안정화될 때까지 대기합니다.
+    서비스별 이전/신규 task 수와 안정화 소요 시간을 메트릭으로 기록합니다.
+    """
+    ecs = get_client('ecs')
+    dimensions = {'Action': 'START', 'Service': service_name}
 
     try:
-        # 2. ECS Green 서비스 재가동
-        print(f"Starting ECS service: {GREEN_SERVICE} (count: {GREEN_DESIRED_COUNT})")
-        green_response = ecs.update_service(
-            cluster=CLUSTER_NAME,
-            service=GREEN_SERVICE,
-            desiredCount=GREEN_DESIRED_COUNT
-        )
-        results['resources']['ecs_green'] = {
+        log.debug('Starting ECS service', service=service_name, desired_count=desired_count)
+        with metrics.timed_call('UpdateService', {'Action': 'START'}):
+            response = ecs.update_service(
+                cluster=CLUSTER_NAME,
+                service=service_name,
+                desiredCount=desired_count
+            )
+        previous_count = response['service'].get('runningCount', 0)
+        result = {
             'status': 'SUCCESS',
-            'previous_count': 0,
-            'new_count': GREEN_DESIRED_COUNT,
-            'message': f'{GREEN_SERVICE} started'
+            'previous_count': previous_count,
+            'new_count': desired_count,
+            'message': f'{service_name} started'
         }
-        print(f"✓ Green service started: {GREEN_SERVICE}")
+        metrics.put_metric('PreviousCount', previous_count, 'Count', dimensions)
+        metrics.put_metric('NewCount', desired_count, 'Count', dimensions)
+        log.debug('ECS service started', label=label, service=service_name, previous_count=previous_count)
 
         # 서비스 안정화 대기 (선택사항)
-        print(f"Waiting for {GREEN_SERVICE} to stabilize...")
+        # waiter는 수 분간 DescribeServices를 반복 호출하므로 ApiLatency(timed_call)가 아닌
+        # TimeToStable / StabilizationFailures로 따로 기록
+        wait_start = time.perf_counter()
         waiter = ecs.get_waiter('services_stable')
-        waiter.wait(
-            cluster=CLUSTER_NAME,
-            services=[GREEN_SERVICE],
-            WaiterConfig={
-                'Delay': 15,
-                'MaxAttempts': 40  # 최대 10분 대기
-            }
-        )
-        print(f"✓ Green service is now stable")
+        try:
+            waiter.wait(
+                cluster=CLUSTER_NAME,
+                services=[service_name],
+                WaiterConfig={
+                    'Delay': 15,
+                    'MaxAttempts': 40  # 최대 10분 대기
+                }
+            )
+        except Exception:
+            metrics.put_metric('StabilizationFailures', 1, 'Count', dimensions)
+            raise
+        time_to_stable_ms = round((time.perf_counter() - wait_start) * 1000, 2)
+        result['time_to_stable_ms'] = time_to_stable_ms
+        metrics.put_metric('TimeToStable', time_to_stable_ms, 'Milliseconds', dimensions)
+        log.debug('ECS service is stable', service=service_name, time_to_stable_ms=time_to_stable_ms)
 
     except ecs.exceptions.ServiceNotFoundException:
-        results['resources']['ecs_green'] = {
+        result = {
             'status': 'FAILED',
-            'error': f'Service {GREEN_SERVICE} not found'
+            'error': f'Service {service_name} not found'
         }
-        print(f"✗ Green service not found: {GREEN_SERVICE}")
+        log.error('ECS service not found', label=label, service=service_name)
 
     except Exception as e:
-        results['resources']['ecs_green'] = {
+        result = {
             'status': 'FAILED',
             'error': str(e)
         }
-        print(f"✗ Failed to start Green service: {e}")
+        log.error('Failed to start ECS service', label=label, service=service_name, error=str(e))
 
-    # 3. Health Check 확인
-    try:
-        print("Checking service health...")
-        services = ecs.describe_services(
-            cluster=CLUSTER_NAME,
-            services=[BLUE_SERVICE, GREEN_SERVICE]
-        )
+    metrics.put_metric('ServiceFailures', 0 if result['status'] == 'SUCCESS' else 1, 'Count', dimensions)
+    return result
 
-        for service in services['services']:
+
+def lambda_handler(event, context):
+    """
+    아침 시간대 인프라 재가동
+    - ECS 서비스 desired count를 원래대로 복구
+    """
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'action': 'START',
+        'resources': {}
+    }
+    metrics = MetricsLogger(METRIC_NAMESPACE, {'Cluster': CLUSTER_NAME})
+    log.bind(request_id=getattr(context, 'aws_request_id', None))
+
+    # 1. ECS 서비스 재가동
+    for key, (label, service_name, desired_count) in TARGETS.items():
+        results['resources'][key] = start_service(label, service_name, desired_count, metrics)
+
+    # 2. Health Check 확인 (10개 단위로 나누어 조회)
+    try:
+        ecs = get_client('ecs')
+        service_names = [service_name for _, service_name, _ in TARGETS.values()]
+        services = []
+        for i in range(0, len(service_names), DESCRIBE_BATCH_SIZE):
+            with metrics.timed_call('DescribeServices', {'Action': 'START'}):
+                response = ecs.describe_services(
+                    cluster=CLUSTER_NAME,
+                    services=service_names[i:i + DESCRIBE_BATCH_SIZE]
+                )
+            services.extend(response['services'])
+
+        keys_by_service = {service_name: key for key, (_, service_name, _) in TARGETS.items()}
+        for service in services:
             service_name = service['serviceName']
             running_count = service['runningCount']
             desired_count = service['desiredCount']
 
-            print(f"  {service_name}: {running_count}/{desired_count} tasks running")
+            log.debug('Service health', service=service_name, running_count=running_count,
+                      desired_count=desired_count)
 
-            if service_name in results['resources']:
-                results['resources'][service_name.replace('chatapp-dev-service-', 'ecs_')]['health'] = {
+            metrics.put_metric('RunningCount', running_count, 'Count',
+                               {'Action': 'START', 'Service': service_name})
+
+            key = keys_by_service.get(service_name)
+            if key:
+                results['resources'][key]['health'] = {
                     'running_count': running_count,
                     'desired_count': desired_count,
                     'healthy': running_count == desired_count
                 }
 
     except Exception as e:
-        print(f"Warning: Failed to check service health: {e}")
-
-    # 4. CloudWatch 메트릭 전송 (모니터링용)
-    try:
-        cloudwatch.put_metric_data(
-            Namespace='Infrastructure/Scheduler',
-            MetricData=[
-                {
-                    'MetricName': 'InfrastructureStatus',
-                    'Value': 1,  # 1 = Running
-                    'Unit': 'None',
-                    'Timestamp': datetime.now()
-                }
-            ]
-        )
-    except Exception as e:
-        print(f"Warning: Failed to send CloudWatch metric: {e}")
+        log.warning('Failed to check service health', error=str(e))
 
     # 결과 요약
     total_resources = len(results['resources'])
@@ -171,12 +192,14 @@ def lambda_handler(event, context):
         'failed': total_resources - successful
     }
 
-    print(f"\n{'='*60}")
-    print(f"Infrastructure Start Summary:")
-    print(f"  Total resources: {total_resources}")
-    print(f"  Successful: {successful}")
-    print(f"  Failed: {total_resources - successful}")
-    print(f"{'='*60}\n")
+    log.info('Infrastructure start summary', **results['summary'])
+
+    # 3. CloudWatch 메트릭 전송 (EMF 로그, API 호출 없음)
+    metrics.put_metric('InfrastructureStatus', 1, 'None')  # 1 = Running
+    metrics.put_metric('FailedServices', total_resources - successful, 'Count', {'Action': 'START'})
+    lambda_runtime.record_cold_start(metrics, {'Action': 'START'})
+    log.record_stats(metrics, {'Action': 'START'})
+    metrics.flush()
 
     return {
         'statusCode': 200,
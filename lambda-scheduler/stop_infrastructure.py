@@ -5,13 +5,13 @@
 """
 
 import json
-import boto3
 import os
 from datetime import datetime
 
-# AWS 클라이언트
-ecs = boto3.client('ecs')
-cloudwatch = boto3.client('cloudwatch')
+import lambda_runtime
+from emf_metrics import MetricsLogger
+from lambda_runtime import get_client
+from structured_log import get_logger
 
 # 환경 변수
 # AWS_REGION은 Lambda가 자동으로 제공
@@ -19,80 +19,97 @@ CLUSTER_NAME = os.environ.get('CLUSTER_NAME', 'chatapp-dev-cluster')
 BLUE_SERVICE = os.environ.get('BLUE_SERVICE', 'chatapp-dev-service-blue')
 GREEN_SERVICE = os.environ.get('GREEN_SERVICE', 'chatapp-dev-service-green')
 
+# CloudWatch 메트릭 네임스페이스 (EMF 로그로 전송)
+METRIC_NAMESPACE = 'Infrastructure/Scheduler'
 
-def lambda_handler(event, context):
+
+def load_targets():
     """
-    야간 시간대 인프라 중단
-    - ECS 서비스 desired count를 0으로 설정
+    중단 대상 서비스 목록을 반환합니다.
+    {결과 키: (표시 이름, 서비스 이름)}
+
+    SCHEDULED_SERVICES (예: "svc-a:2,svc-b:1")가 설정되어 있으면
+    Blue/Green 서비스 대신 해당 목록을 사용합니다 (desired count는 무시).
     """
+    scheduled = os.environ.get('SCHEDULED_SERVICES', '').strip()
+    if not scheduled:
+        return {
+            'ecs_blue': ('Blue', BLUE_SERVICE),
+            'ecs_green': ('Green', GREEN_SERVICE)
+        }
 
-    results = {
-        'timestamp': datetime.now().isoformat(),
-        'action': 'STOP',
-        'resources': {}
-    }
+    targets = {}
+    for entry in scheduled.split(','):
+        service_name = entry.strip().partition(':')[0]
+        if service_name:
+            targets[service_name] = (service_name, service_name)
+    return targets
 
-    try:
-        # 1. ECS Blue 서비스 중단
-        print(f"Stopping ECS service: {BLUE_SERVICE}")
-        blue_response = ecs.update_service(
-            cluster=CLUSTER_NAME,
-            service=BLUE_SERVICE,
-            desiredCount=0
-        )
-        results['resources']['ecs_blue'] = {
-            'status': 'SUCCESS',
-            'previous_count': blue_response['service']['runningCount'],
-            'new_count': 0,
-            'message': f'{BLUE_SERVICE} stopped'
-        }
-        print(f"✓ Blue service stopped: {BLUE_SERVICE}")
 
-    except Exception as e:
-        results['resources']['ecs_blue'] = {
-            'status': 'FAILED',
-            'error': str(e)
-        }
-        print(f"✗ Failed to stop Blue service: {e}")
+TARGETS = load_targets()
+
+# 구조화 로거 (LOG_LEVEL=DEBUG 이면 서비스별 진행 로그도 출력)
+log = get_logger('scheduler-stop')
+
+# AWS 클라이언트는 lambda_runtime.get_client()로 첫 사용 시 생성
+lambda_runtime.mark_init()
+
+
+def stop_service(label, service_name, metrics):
+    """
+    ECS 서비스 하나의 desired count를 0으로 설정합니다.
+    서비스별 이전/신규 task 수를 메트릭으로 기록합니다.
+    """
+    ecs = get_client('ecs')
+    dimensions = {'Action': 'STOP', 'Service': service_name}
 
     try:
-        # 2. ECS Green 서비스 중단
-        print(f"Stopping ECS service: {GREEN_SERVICE}")
-        green_response = ecs.update_service(
-            cluster=CLUSTER_NAME,
-            service=GREEN_SERVICE,
-            desiredCount=0
-        )
-        results['resources']['ecs_green'] = {
+        log.debug('Stopping ECS service', service=service_name)
+        with metrics.timed_call('UpdateService', {'Action': 'STOP'}):
+            response = ecs.update_service(
+                cluster=CLUSTER_NAME,
+                service=service_name,
+                desiredCount=0
+            )
+        previous_count = response['service']['runningCount']
+        result = {
             'status': 'SUCCESS',
-            'previous_count': green_response['service']['runningCount'],
+            'previous_count': previous_count,
             'new_count': 0,
-            'message': f'{GREEN_SERVICE} stopped'
+            'message': f'{service_name} stopped'
         }
-        print(f"✓ Green service stopped: {GREEN_SERVICE}")
+        metrics.put_metric('PreviousCount', previous_count, 'Count', dimensions)
+        metrics.put_metric('NewCount', 0, 'Count', dimensions)
+        log.debug('ECS service stopped', label=label, service=service_name, previous_count=previous_count)
 
     except Exception as e:
-        results['resources']['ecs_green'] = {
+        result = {
             'status': 'FAILED',
             'error': str(e)
         }
-        print(f"✗ Failed to stop Green service: {e}")
+        log.error('Failed to stop ECS service', label=label, service=service_name, error=str(e))
 
-    # 3. CloudWatch 메트릭 전송 (모니터링용)
-    try:
-        cloudwatch.put_metric_data(
-            Namespace='Infrastructure/Scheduler',
-            MetricData=[
-                {
-                    'MetricName': 'InfrastructureStatus',
-                    'Value': 0,  # 0 = Stopped
-                    'Unit': 'None',
-                    'Timestamp': datetime.now()
-                }
-            ]
-        )
-    except Exception as e:
-        print(f"Warning: Failed to send CloudWatch metric: {e}")
+    metrics.put_metric('ServiceFailures', 0 if result['status'] == 'SUCCESS' else 1, 'Count', dimensions)
+    return result
+
+
+def lambda_handler(event, context):
+    """
+    야간 시간대 인프라 중단
+    - ECS 서비스 desired count를 0으로 설정
+    """
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'action': 'STOP',
+        'resources': {}
+    }
+    metrics = MetricsLogger(METRIC_NAMESPACE, {'Cluster': CLUSTER_NAME})
+    log.bind(request_id=getattr(context, 'aws_request_id', None))
+
+    # 1. ECS 서비스 중단
+    for key, (label, service_name) in TARGETS.items():
+        results['resources'][key] = stop_service(label, service_name, metrics)
 
     # 결과 요약
     total_resources = len(results['resources'])
@@ -104,12 +121,14 @@ def lambda_handler(event, context):
         'failed': total_resources - successful
     }
 
-    print(f"\n{'='*60}")
-    print(f"Infrastructure Stop Summary:")
-    print(f"  Total resources: {total_resources}")
-    print(f"  Successful: {successful}")
-    print(f"  Failed: {total_resources - successful}")
-    print(f"{'='*60}\n")
+    log.info('Infrastructure stop summary', **results['summary'])
+
+    # 2. CloudWatch 메트릭 전송 (EMF 로그, API 호출 없음)
+    metrics.put_metric('InfrastructureStatus', 0, 'None')  # 0 = Stopped
+    metrics.put_metric('FailedServices', total_resources - successful, 'Count', {'Action': 'STOP'})
+    lambda_runtime.record_cold_start(metrics, {'Action': 'STOP'})
+    log.record_stats(metrics, {'Action': 'STOP'})
+    metrics.flush()
 
     return {
         'statusCode': 200,
@@ -0,0 +1,181 @@
+"""
+알림 중복 전송 방지 (idempotency)
+EventBridge / SQS는 at-least-once 전달이라 같은 이벤트가 여러 번 들어올 수 있으므로
+EventBridge 이벤트 id를 TTL 저장소에 조건부 쓰기로 선점하고, 이미 전송한 id면 전송을 생략합니다.
+
+선점은 두 단계로 기록합니다.
+- pending: 전송 직전에 짧은 TTL(pending_seconds)로 선점. 전송 도중 Lambda가 타임아웃/중단되어도
+  TTL이 지나면 재전달된 이벤트가 다시 선점할 수 있으므로 알림이 유실되지 않음
+- sent: Slack 전송이 성공한 뒤 window_seconds TTL로 확정
+
+내용 지문(fingerprint) 중복 억제는 선택 기능입니다 (fingerprint=True로 요청한 메시지만).
+같은 배포의 COMPLETED / FAILED처럼 다시 보내도 의미가 없는 상태 메시지에만 사용하고,
+unhealthy → healthy → unhealthy처럼 반복될 수 있는 상태 변화에는 사용하지 않습니다.
+
+저장소
+- DynamoDBDedupStore: 운영용 (테이블 키: pk(S), TTL 속성: expires_at, 상태: status)
+- InMemoryDedupStore: 로컬 테스트 / 단일 컨테이너용 대역
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from lambda_runtime import get_client
+from structured_log import get_logger
+
+STATUS_PENDING = 'pending'
+STATUS_SENT = 'sent'
+
+
+def message_fingerprint(message: Dict[str, Any]) -> str:
+    """
+    Slack 메시지 내용의 지문을 계산합니다 (전송 시각 `ts`는 제외).
+    """
+    attachments = [
+        {key: value for key, value in attachment.items() if key != 'ts'}
+        for attachment in message.get('attachments', [])
+    ]
+    content = dict(message, attachments=attachments)
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class InMemoryDedupStore:
+    """
+    프로세스 메모리 기반 저장소 (로컬 테스트 / 단일 컨테이너용)
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, ttl: int, now: float) -> Tuple[bool, Optional[str]]:
+        """
+        (선점 여부, 이미 선점된 경우 기존 상태)를 반환합니다.
+        """
+        with self._lock:
+            status, expires_at = self._entries.get(key, (None, 0))
+            if expires_at > now:
+                return False, status
+            self._entries[key] = (STATUS_PENDING, now + ttl)
+            return True, None
+
+    def confirm(self, key: str, ttl: int, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (STATUS_SENT, now + ttl)
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DynamoDBDedupStore:
+    """
+    DynamoDB 조건부 쓰기 기반 저장소
+    """
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+
+    def claim(self, key: str, ttl: int, now: float) -> Tuple[bool, Optional[str]]:
+        client = get_client('dynamodb')
+        try:
+            client.put_item(
+                TableName=self.table_name,
+                Item={
+                    'pk': {'S': key},
+                    'status': {'S': STATUS_PENDING},
+                    'expires_at': {'N': str(int(now + ttl))}
+                },
+                # TTL 삭제는 지연될 수 있으므로 만료 시각도 직접 비교
+                ConditionExpression='attribute_not_exists(pk) OR expires_at < :now',
+                ExpressionAttributeValues={':now': {'N': str(int(now))}},
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+            return True, None
+        except client.exceptions.ConditionalCheckFailedException as e:
+            item = e.response.get('Item') or {}
+            return False, item.get('status', {}).get('S', STATUS_SENT)
+
+    def confirm(self, key: str, ttl: int, now: float) -> None:
+        get_client('dynamodb').put_item(
+            TableName=self.table_name,
+            Item={
+                'pk': {'S': key},
+                'status': {'S': STATUS_SENT},
+                'expires_at': {'N': str(int(now + ttl))}
+            }
+        )
+
+    def release(self, key: str) -> None:
+        get_client('dynamodb').delete_item(TableName=self.table_name, Key={'pk': {'S': key}})
+
+
+class DuplicateInFlight(Exception):
+    """
+    같은 이벤트를 다른 호출이 전송 중인 경우 (pending 선점)
+    SQS 배치에서는 batchItemFailures로 보고해 SQS가 다시 전달하게 하고, EventBridge 직접 호출에서는
+    예외를 핸들러 밖으로 올려 Lambda 비동기 재시도로 다시 받습니다. 앞선 전송이 실패해도 알림이 유실되지 않습니다.
+    """
+
+
+class Deduplicator:
+    """
+    이벤트 id(+ 선택적으로 내용 지문)로 중복 전송을 막습니다.
+    """
+
+    def __init__(self, store, window_seconds: int, pending_seconds: int = 60):
+        self.store = store
+        self.window_seconds = window_seconds
+        self.pending_seconds = min(pending_seconds, window_seconds)
+
+    def acquire(self, event: Dict[str, Any], message: Dict[str, Any], fingerprint: bool = False,
+                now: Optional[float] = None) -> Tuple[bool, Optional[str], List[str]]:
+        """
+        전송 전에 키를 pending으로 선점하고 (전송 여부, 억제 사유, 선점한 키 목록)을 반환합니다.
+        억제 사유는 'event_id' 또는 'fingerprint' 입니다.
+        다른 호출이 같은 키를 전송 중이면 DuplicateInFlight를 발생시킵니다.
+        """
+        now = time.time() if now is None else now
+        keys = []
+        event_id = event.get('id')
+        if event_id:
+            keys.append(('event_id', f"id#{event_id}"))
+        if fingerprint:
+            keys.append(('fingerprint', f"fp#{message_fingerprint(message)}"))
+
+        claimed: List[str] = []
+        for reason, key in keys:
+            acquired, status = self.store.claim(key, self.pending_seconds, now)
+            if not acquired:
+                self.release(claimed)
+                if status == STATUS_PENDING:
+                    raise DuplicateInFlight(f"{reason} {key} is being delivered by another invocation")
+                return False, reason, []
+            claimed.append(key)
+        return True, None, claimed
+
+    def confirm(self, keys: List[str], now: Optional[float] = None) -> None:
+        """
+        전송에 성공한 뒤 선점을 window_seconds 동안 유지되도록 확정합니다.
+        확정에 실패해도 pending TTL 동안은 중복이 억제되므로 경고만 남깁니다.
+        """
+        now = time.time() if now is None else now
+        for key in keys:
+            try:
+                self.store.confirm(key, self.window_seconds, now)
+            except Exception as e:
+                get_logger('slack-notification').warning('Failed to confirm dedup key', key=key, error=str(e))
+
+    def release(self, keys: List[str]) -> None:
+        """
+        전송에 실패했을 때 선점한 키를 풀어 재시도가 억제되지 않게 합니다.
+        """
+        for key in keys:
+            try:
+                self.store.release(key)
+            except Exception as e:
+                get_logger('slack-notification').warning('Failed to release dedup key', key=key, error=str(e))
@@ -0,0 +1,300 @@
+"""
+ALB 타겟 헬스 이벤트 윈도우 집계 (다이제스트)
+타겟 그룹별로 일정 시간(window) 동안의 Target Health 이벤트를 모아
+윈도우가 끝나면 타겟별 최종 상태와 상태 전환 횟수를 한 번에 알립니다.
+
+저장소
+- DynamoDBDigestStore: 운영용 (여러 Lambda 컨테이너가 같은 윈도우를 공유)
+- InMemoryDigestStore: 로컬 테스트 / 단일 프로세스용 대역
+
+윈도우 하나당 마커 한 개를 두고, 마커를 조건부 삭제한 호출만 다이제스트를 전송하므로
+동시에 여러 Lambda가 flush 하더라도 윈도우당 메시지는 한 번만 전송됩니다.
+
+전환 횟수(transitions)는 이벤트 수가 아니라 상태가 바뀐 횟수입니다.
+타겟의 첫 이벤트, 중복 전달된 이벤트, 같은 상태가 반복된 이벤트는 세지 않습니다.
+순서가 뒤바뀌어 늦게 도착한 이벤트는 저장된 최종 상태와 다를 때만 셉니다 (근사값).
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lambda_runtime import get_client
+from structured_log import get_logger
+
+# (타겟 그룹, 윈도우 시작, 윈도우 끝)
+Window = Tuple[str, int, int]
+
+# DynamoDB 항목 보관 기간 (초, TTL)
+ITEM_TTL_SECONDS = 24 * 3600
+
+
+def window_bounds(event_time: float, window_seconds: int) -> Tuple[int, int]:
+    """
+    이벤트 시각이 속한 윈도우의 (시작, 끝) epoch 초를 반환합니다.
+    """
+    start = int(event_time // window_seconds * window_seconds)
+    return start, start + window_seconds
+
+
+class InMemoryDigestStore:
+    """
+    프로세스 메모리 기반 저장소 (로컬 테스트 / 단일 컨테이너용)
+    """
+
+    def __init__(self):
+        self._targets: Dict[Tuple[str, int], Dict[str, Dict[str, Any]]] = {}
+        self._open: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, target_group: str, window_start: int, window_end: int, target: str,
+               state: str, reason: str, event_time: float) -> None:
+        with self._lock:
+            targets = self._targets.setdefault((target_group, window_start), {})
+            entry = targets.setdefault(target, {'state': state, 'reason': reason, 'last_time': event_time, 'transitions': 0})
+            if state != entry['state']:
+                entry['transitions'] += 1
+            if event_time >= entry['last_time']:
+                entry.update(state=state, reason=reason, last_time=event_time)
+            self._open.setdefault((target_group, window_start), window_end)
+
+    def claim_closed_windows(self, cutoff: float) -> List[Window]:
+        with self._lock:
+            closed = [(tg, start, end) for (tg, start), end in self._open.items() if end <= cutoff]
+            for tg, start, _ in closed:
+                del self._open[(tg, start)]
+            return sorted(closed, key=lambda w: w[2])
+
+    def release_window(self, window: Window) -> None:
+        with self._lock:
+            target_group, window_start, window_end = window
+            self._open[(target_group, window_start)] = window_end
+
+    def load_window(self, window: Window) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            targets = self._targets.get((window[0], window[1]), {})
+            return {target: dict(entry) for target, entry in targets.items()}
+
+    def complete_window(self, window: Window) -> None:
+        with self._lock:
+            # 다시 열리지 않는 윈도우이므로 warm 컨테이너에 계속 쌓이지 않도록 제거
+            self._targets.pop((window[0], window[1]), None)
+
+
+class DynamoDBDigestStore:
+    """
+    DynamoDB 기반 저장소 (테이블 키: pk(S), sk(S), TTL 속성: expires_at)
+    - 타겟 항목: pk = "TG#{타겟 그룹}#{윈도우 시작}", sk = 타겟
+    - 윈도우 마커: pk = "WINDOWS", sk = "{윈도우 끝}#{타겟 그룹}#{윈도우 시작}"
+    """
+
+    MARKER_PK = 'WINDOWS'
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        # 이 컨테이너에서 이미 마커를 만든, 아직 끝나지 않은 윈도우 (중복 조건부 쓰기 생략)
+        # 윈도우 끝 이전에는 어떤 호출도 마커를 가져갈 수 없으므로 그때까지만 유효하고,
+        # 끝난 뒤(유예 시간 중 늦은 이벤트)에는 다른 호출이 마커를 지웠을 수 있어 매번 다시 씀
+        self._known_windows: set = set()
+
+    @property
+    def _client(self):
+        return get_client('dynamodb')
+
+    @staticmethod
+    def _target_pk(target_group: str, window_start: int) -> str:
+        return f"TG#{target_group}#{window_start}"
+
+    @classmethod
+    def _marker_sk(cls, window: Window) -> str:
+        target_group, window_start, window_end = window
+        return f"{window_end:012d}#{target_group}#{window_start}"
+
+    def record(self, target_group: str, window_start: int, window_end: int, target: str,
+               state: str, reason: str, event_time: float) -> None:
+        client = self._client
+        key = {'pk': {'S': self._target_pk(target_group, window_start)}, 'sk': {'S': target}}
+        expires_at = {'N': str(window_end + ITEM_TTL_SECONDS)}
+
+        try:
+            # 더 최근 이벤트일 때만 최종 상태 갱신 (이전 상태를 돌려받아 바뀌었는지 판단)
+            response = client.update_item(
+                TableName=self.table_name,
+                Key=key,
+                UpdateExpression=('SET #state = :state, reason = :reason, last_time = :time, expires_at = :exp, '
+                                  'transitions = if_not_exists(transitions, :zero)'),
+                ConditionExpression='attribute_not_exists(last_time) OR last_time <= :time',
+                ExpressionAttributeNames={'#state': 'state'},
+                ExpressionAttributeValues={
+                    ':zero': {'N': '0'},
+                    ':state': {'S': state},
+                    ':reason': {'S': reason},
+                    ':time': {'N': str(event_time)},
+                    ':exp': expires_at
+                },
+                ReturnValues='UPDATED_OLD',
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+            previous = response.get('Attributes', {}).get('state', {}).get('S')
+        except client.exceptions.ConditionalCheckFailedException as e:
+            # 순서가 뒤바뀐 이전 이벤트는 최종 상태를 바꾸지 않고 전환 횟수만 판단
+            previous = (e.response.get('Item') or {}).get('state', {}).get('S')
+
+        if previous is not None and previous != state:
+            client.update_item(
+                TableName=self.table_name,
+                Key=key,
+                UpdateExpression='ADD transitions :one',
+                ExpressionAttributeValues={':one': {'N': '1'}}
+            )
+
+        window = (target_group, window_start, window_end)
+        now = time.time()
+        self._known_windows = {known for known in self._known_windows if known[2] > now}
+        if window in self._known_windows:
+            return
+        try:
+            client.put_item(
+                TableName=self.table_name,
+                Item=self._marker_item(window),
+                ConditionExpression='attribute_not_exists(pk)'
+            )
+        except client.exceptions.ConditionalCheckFailedException:
+            pass
+        if window_end > now:
+            self._known_windows.add(window)
+
+    def _marker_item(self, window: Window) -> Dict[str, Any]:
+        target_group, window_start, window_end = window
+        return {
+            'pk': {'S': self.MARKER_PK},
+            'sk': {'S': self._marker_sk(window)},
+            'target_group': {'S': target_group},
+            'window_start': {'N': str(window_start)},
+            'window_end': {'N': str(window_end)},
+            'expires_at': {'N': str(window_end + ITEM_TTL_SECONDS)}
+        }
+
+    def _closed_markers(self, cutoff: float) -> Iterator[Dict[str, Any]]:
+        """
+        윈도우 끝이 cutoff 이하인 마커를 모든 페이지에 걸쳐 반환합니다.
+        """
+        kwargs = {
+            'TableName': self.table_name,
+            'KeyConditionExpression': 'pk = :pk AND sk < :cutoff',
+            'ExpressionAttributeValues': {
+                ':pk': {'S': self.MARKER_PK},
+                # "{윈도우 끝+1}" 보다 작은 sk = 윈도우 끝이 cutoff 이하인 마커
+                ':cutoff': {'S': f"{int(cutoff) + 1:012d}"}
+            }
+        }
+        while True:
+            response = self._client.query(**kwargs)
+            yield from response.get('Items', [])
+            if 'LastEvaluatedKey' not in response:
+                return
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def claim_closed_windows(self, cutoff: float) -> List[Window]:
+        """
+        닫힌 윈도우의 마커를 조건부 삭제해 가져옵니다.
+        도중에 오류가 나면 그때까지 가져온(마커를 지운) 윈도우는 버리지 않고 반환합니다.
+        """
+        client = self._client
+        claimed = []
+        try:
+            for item in self._closed_markers(cutoff):
+                window = (item['target_group']['S'], int(item['window_start']['N']), int(item['window_end']['N']))
+                try:
+                    # 마커를 먼저 지운 호출만 다이제스트 전송
+                    client.delete_item(
+                        TableName=self.table_name,
+                        Key={'pk': item['pk'], 'sk': item['sk']},
+                        ConditionExpression='attribute_exists(pk)'
+                    )
+                except client.exceptions.ConditionalCheckFailedException:
+                    continue
+                self._known_windows.discard(window)
+                claimed.append(window)
+        except Exception as e:
+            if not claimed:
+                raise
+            # 삭제하지 못한 마커는 남아 있으므로 다음 flush에서 다시 시도됨
+            get_logger('slack-notification').error('Stopped claiming health digest windows',
+                                                   claimed=len(claimed), error=str(e))
+        return claimed
+
+    def release_window(self, window: Window) -> None:
+        self._client.put_item(TableName=self.table_name, Item=self._marker_item(window))
+
+    def load_window(self, window: Window) -> Dict[str, Dict[str, Any]]:
+        target_group, window_start, _ = window
+        client = self._client
+        targets: Dict[str, Dict[str, Any]] = {}
+        kwargs = {
+            'TableName': self.table_name,
+            'KeyConditionExpression': 'pk = :pk',
+            'ExpressionAttributeValues': {':pk': {'S': self._target_pk(target_group, window_start)}},
+            'ConsistentRead': True
+        }
+        while True:
+            response = client.query(**kwargs)
+            for item in response.get('Items', []):
+                targets[item['sk']['S']] = {
+                    'state': item['state']['S'],
+                    'reason': item.get('reason', {}).get('S', ''),
+                    'last_time': float(item['last_time']['N']),
+                    'transitions': int(item['transitions']['N'])
+                }
+            if 'LastEvaluatedKey' not in response:
+                return targets
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def complete_window(self, window: Window) -> None:
+        # 타겟 항목은 TTL(expires_at)로 삭제됨
+        pass
+
+
+class HealthDigest:
+    """
+    Target Health 이벤트를 윈도우 단위로 모으고, 닫힌 윈도우를 꺼내는 진입점
+    """
+
+    def __init__(self, store, window_seconds: int, grace_seconds: int = 5):
+        self.store = store
+        self.window_seconds = window_seconds
+        self.grace_seconds = grace_seconds
+
+    def add(self, target_group: str, target: str, state: str, reason: str,
+            event_time: float, now: Optional[float] = None) -> bool:
+        """
+        이벤트를 해당 윈도우에 기록합니다. 이미 닫힌 윈도우의 늦은 이벤트면 False를 반환합니다.
+        """
+        now = time.time() if now is None else now
+        window_start, window_end = window_bounds(event_time, self.window_seconds)
+        if now >= window_end + self.grace_seconds:
+            return False
+        self.store.record(target_group, window_start, window_end, target, state, reason, event_time)
+        return True
+
+    def claim_closed(self, now: Optional[float] = None) -> List[Window]:
+        """
+        유예 시간까지 지난 윈도우를 가져옵니다 (다른 호출과 중복되지 않음).
+        """
+        now = time.time() if now is None else now
+        return self.store.claim_closed_windows(now - self.grace_seconds)
+
+    def load(self, window: Window) -> Dict[str, Dict[str, Any]]:
+        return self.store.load_window(window)
+
+    def release(self, window: Window) -> None:
+        """
+        다이제스트 전송에 실패한 윈도우를 다시 열어 다음 flush에서 재시도하게 합니다.
+        """
+        self.store.release_window(window)
+
+    def complete(self, window: Window) -> None:
+        """
+        다이제스트를 전송한(또는 보낼 타겟이 없는) 윈도우의 집계를 정리합니다.
+        """
+        self.store.complete_window(window)
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Slack 알림 Lambda 리플레이 / 처리량 벤치마크
+기록해 둔 EventBridge 이벤트나 합성 이벤트를 지정한 속도로 `lambda_handler`에 넣고,
+SSM은 대역(stub)으로, Slack Webhook은 로컬 HTTP 서버로 대체해서 측정합니다.
+
+측정 항목
+- 처리량: 초당 처리 이벤트 수 / 초당 생성(format)된 메시지 수
+- 단계별 지연: routing(라우터 매칭), format(메시지 생성), serialize(JSON 직렬화), deliver(Webhook 전송)
+- 외부 호출 수: SSM GetParameter, Webhook HTTP 요청, Webhook TCP 연결
+- 핸들러 로그 출력량 (bytes)
+
+사용 예:
+    python replay_notifications.py --count 2000
+    python replay_notifications.py --count 5000 --mix deployment=1,target_health=20,task=50,service=5 --batch-size 50
+    python replay_notifications.py --events recorded-events.jsonl --rate 200 --json
+    python replay_notifications.py --count 1000 --webhook-latency 0.05 --webhook-429-every 100
+
+--events 파일은 EventBridge 이벤트 JSON 배열이나 한 줄에 이벤트 하나(JSON Lines) 형식입니다.
+같은 옵션으로 변경 전/후 revision에서 실행하면 slack_notification.py 변경의 회귀를 비교할 수 있습니다.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+NOTIFIER_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMON_DIR = os.path.join(NOTIFIER_DIR, '..', 'lambda-common')
+
+WEBHOOK_PARAMETER = '/replay/slack/webhook-url'
+
+STAGES = ('routing', 'format', 'serialize', 'deliver')
+
+
+class StubSSM:
+    """
+    SSM 클라이언트 대역 (get_parameter 호출 수 집계)
+    """
+
+    def __init__(self, webhook_url: str):
+        self.webhook_url = webhook_url
+        self.calls = 0
+
+    def get_parameter(self, Name: str, WithDecryption: bool = False) -> Dict[str, Any]:
+        self.calls += 1
+        return {'Parameter': {'Name': Name, 'Value': self.webhook_url}}
+
+
+class WebhookServer:
+    """
+    로컬 Slack Webhook 대역 (keep-alive 지원, 요청 / 연결 수 집계)
+    - latency: 응답 전 대기 시간 (초)
+    - throttle_every: N번째 요청마다 429 + Retry-After: 0 응답
+    """
+
+    def __init__(self, latency: float = 0.0, throttle_every: int = 0):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.connections = 0
+        self.statuses: Counter = Counter()
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 따로 쓰므로 Nagle + delayed ACK 지연(~40ms)이 측정에 섞이지 않게 함
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with server._lock:
+                    server.requests += 1
+                    throttled = server.throttle_every and server.requests % server.throttle_every == 0
+                if server.latency:
+                    time.sleep(server.latency)
+                status, body = (429, b'rate_limited') if throttled else (200, b'ok')
+                with server._lock:
+                    server.statuses[status] += 1
+                self.send_response(status)
+                if throttled:
+                    self.send_header('Retry-After', '0')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/services/REPLAY/WEBHOOK"
+
+    def __enter__(self) -> 'WebhookServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class StageTimer:
+    """
+    단계별 소요 시간(ms) 수집
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    def wrap(self, stage: str, fn):
+        samples = self.samples[stage]
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for stage, values in self.samples.items():
+            ordered = sorted(values)
+            if not ordered:
+                result[stage] = {'count': 0}
+                continue
+            result[stage] = {
+                'count': len(ordered),
+                'total_ms': round(sum(ordered), 2),
+                'p50_ms': round(ordered[len(ordered) // 2], 4),
+                'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                'max_ms': round(ordered[-1], 4)
+            }
+        return result
+
+
+# ---------------------------------------------------------------------------
+# 합성 이벤트
+# ---------------------------------------------------------------------------
+
+def _iso(ts: datetime) -> str:
+    return ts.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def synth_deployment(i: int, rng: random.Random, ts: datetime) -> Dict[str, Any]:
+    service = rng.choice(['chatapp-blue', 'chatapp-green'])
+    return {
+        'id': f'replay-deploy-{i}',
+        'source': 'aws.ecs',
+        'detail-type': 'ECS Deployment State Change',
+        'time': _iso(ts),
+        'resources': [f'arn:aws:ecs:ap-northeast-2:000000000000:service/replay/{service}'],
+        'detail': {
+            'serviceName': service,
+            'eventName': 'SERVICE_DEPLOYMENT_COMPLETED',
+            'deploymentStatus': rng.choice(['COMPLETED', 'COMPLETED', 'FAILED', 'IN_PROGRESS']),
+            'deployment': {
+                'id': f'ecs-svc/{i}',
+                'taskDefinition': f'arn:aws:ecs:ap-northeast-2:000000000000:task-definition/chatapp:{i}',
+                'desiredCount': 2,
+                'runningCount': rng.randint(0, 2),
+                'pendingCount': rng.randint(0, 2),
+                'failedTasks': rng.randint(0, 1),
+                'rolloutState': 'COMPLETED'
+            }
+        }
+    }
+
+
+def synth_target_health(i: int, rng: random.Random, ts: datetime) -> Dict[str, Any]:
+    tg = rng.choice(['chatapp-blue-tg/0123456789abcdef', 'chatapp-green-tg/fedcba9876543210'])
+    state = rng.choice(['healthy', 'unhealthy', 'draining'])
+    return {
+        'id': f'replay-health-{i}',
+        'source': 'aws.elasticloadbalancing',
+        'detail-type': 'Target Health',
+        'time': _iso(ts),
+        'resources': [f'arn:aws:elasticloadbalancing:ap-northeast-2:000000000000:targetgroup/{tg}'],
+        'detail': {
+            'target': {'id': f'10.0.{i % 4}.{i % 250}', 'port': 3000},
+            'targetHealth': {
+                'state': state,
+                'reason': '' if state == 'healthy' else 'Target.FailedHealthChecks',
+                'description': '' if state == 'healthy' else 'Health checks failed'
+            }
+        }
+    }
+
+
+def synth_task(i: int, rng: random.Random, ts: datetime) -> Dict[str, Any]:
+    last_status = rng.choice(['PROVISIONING', 'PENDING', 'RUNNING', 'STOPPED', 'STOPPED'])
+    failed = last_status == 'STOPPED' and rng.random() < 0.5
+    detail = {
+        'clusterArn': 'arn:aws:ecs:ap-northeast-2:000000000000:cluster/replay',
+        'taskArn': f'arn:aws:ecs:ap-northeast-2:000000000000:task/replay/{i:032x}',
+        'group': f"service:{rng.choice(['chatapp-blue', 'chatapp-green'])}",
+        'lastStatus': last_status,
+        'desiredStatus': 'STOPPED' if last_status == 'STOPPED' else 'RUNNING',
+        'containers': [{'name': 'app', 'lastStatus': last_status}]
+    }
+    if last_status == 'STOPPED':
+        detail['stopCode'] = 'EssentialContainerExited' if failed else 'ServiceSchedulerInitiated'
+        detail['stoppedReason'] = 'Essential container in task exited' if failed else 'Scaling activity initiated'
+    return {
+        'id': f'replay-task-{i}',
+        'source': 'aws.ecs',
+        'detail-type': 'ECS Task State Change',
+        'time': _iso(ts),
+        'resources': [detail['taskArn']],
+        'detail': detail
+    }
+
+
+def synth_service(i: int, rng: random.Random, ts: datetime) -> Dict[str, Any]:
+    service = rng.choice(['chatapp-blue', 'chatapp-green'])
+    event_type = rng.choice(['INFO', 'INFO', 'WARN', 'ERROR'])
+    return {
+        'id': f'replay-service-{i}',
+        'source': 'aws.ecs',
+        'detail-type': 'ECS Service Action',
+        'time': _iso(ts),
+        'resources': [f'arn:aws:ecs:ap-northeast-2:000000000000:service/replay/{service}'],
+        'detail': {
+            'eventType': event_type,
+            'eventName': 'SERVICE_STEADY_STATE' if event_type == 'INFO' else 'SERVICE_TASK_PLACEMENT_FAILURE',
+            'clusterArn': 'arn:aws:ecs:ap-northeast-2:000000000000:cluster/replay'
+        }
+    }
+
+
+SYNTHESIZERS = {
+    'deployment': synth_deployment,
+    'target_health': synth_target_health,
+    'task': synth_task,
+    'service': synth_service
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SYNTHESIZERS:
+            raise argparse.ArgumentTypeError(f"unknown event kind: {name} (choose from {', '.join(SYNTHESIZERS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def synthesize_events(count: int, mix: Dict[str, float], seed: int) -> List[Dict[str, Any]]:
+    """
+    배포 폭주 상황을 흉내 낸 합성 이벤트 목록 (이벤트 시각은 현재 기준 최근 몇 초)
+    """
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    now = datetime.now(timezone.utc)
+    return [
+        SYNTHESIZERS[rng.choices(kinds, weights)[0]](i, rng, now - timedelta(seconds=rng.uniform(0, 5)))
+        for i in range(count)
+    ]
+
+
+def load_events(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding='utf-8') as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+
+def load_handler(args):
+    """
+    로컬 대역용 환경 변수를 설정한 뒤 핸들러 모듈을 새로 로드합니다.
+    (DynamoDB 테이블 없이 다이제스트 / 중복 억제는 메모리 저장소 사용)
+    """
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-northeast-2')
+    os.environ['SLACK_WEBHOOK_PARAMETER'] = WEBHOOK_PARAMETER
+    os.environ['HEALTH_DIGEST_TABLE'] = ''
+    os.environ['DEDUP_TABLE'] = ''
+    os.environ['HEALTH_DIGEST_WINDOW_SECONDS'] = str(args.digest_window)
+    os.environ['DEDUP_WINDOW_SECONDS'] = str(args.dedup_window)
+    os.environ['TASK_EVENT_SAMPLE_RATE'] = str(args.task_sample_rate)
+    for path in (COMMON_DIR, NOTIFIER_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    path = os.path.join(NOTIFIER_DIR, 'slack_notification.py')
+    spec = importlib.util.spec_from_file_location('replay_slack_notification', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def instrument(module, timer: StageTimer) -> None:
+    """
+    라우터 매칭 / 포매터 / JSON 직렬화 / 전송 함수를 시간 측정 래퍼로 감쌉니다.
+    """
+    router = module.router
+    router.match = timer.wrap('routing', router.match)
+    for routes in router._by_source.values():
+        for route in routes:
+            route.formatter = timer.wrap('format', route.formatter)
+
+    slack_client_module = sys.modules['slack_client']
+
+    class TimedJSON:
+        dumps = staticmethod(timer.wrap('serialize', json.dumps))
+        loads = staticmethod(json.loads)
+
+    slack_client_module.json = TimedJSON
+    module.deliver_message = timer.wrap('deliver', module.deliver_message)
+
+
+def make_invocations(events: List[Dict[str, Any]], batch_size: int) -> List[Any]:
+    """
+    batch_size == 1 이면 EventBridge 직접 호출, 그보다 크면 SQS 배치 레코드로 묶습니다.
+    """
+    if batch_size <= 1:
+        return list(events)
+    invocations = []
+    for offset in range(0, len(events), batch_size):
+        chunk = events[offset:offset + batch_size]
+        invocations.append({'Records': [
+            {'messageId': f'msg-{offset + idx}', 'eventSource': 'aws:sqs', 'body': json.dumps(event)}
+            for idx, event in enumerate(chunk)
+        ]})
+    return invocations
+
+
+def run_replay(events: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    with WebhookServer(args.webhook_latency, args.webhook_429_every) as webhook:
+        module = load_handler(args)
+        lambda_runtime = sys.modules['lambda_runtime']
+        ssm = StubSSM(webhook.url)
+        lambda_runtime.set_client('ssm', ssm)
+        # 재시도 대기 없이 측정 (429 Retry-After: 0)
+        module.slack_client._sleep = lambda seconds: None
+
+        timer = StageTimer()
+        instrument(module, timer)
+
+        invocations = make_invocations(events, args.batch_size)
+        interval = args.batch_size / args.rate if args.rate > 0 else 0
+        output = io.StringIO()
+        failures = 0
+        invoke_ms: List[float] = []
+
+        wall_start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                for idx, invocation in enumerate(invocations):
+                    if interval:
+                        delay = wall_start + idx * interval - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    start = time.perf_counter()
+                    response = module.lambda_handler(invocation, None)
+                    invoke_ms.append((time.perf_counter() - start) * 1000)
+                    if 'batchItemFailures' in response:
+                        failures += len(response['batchItemFailures'])
+                    elif response.get('statusCode') != 200:
+                        failures += 1
+        finally:
+            module.slack_client.close()
+            lambda_runtime.reset_clients()
+        wall_seconds = time.perf_counter() - wall_start
+
+    stages = timer.summary()
+    formatted = stages['format']['count']
+    ordered_invoke = sorted(invoke_ms)
+    return {
+        'events': len(events),
+        'invocations': len(invocations),
+        'batch_size': args.batch_size,
+        'target_rate': args.rate,
+        'wall_seconds': round(wall_seconds, 4),
+        'events_per_second': round(len(events) / wall_seconds, 1) if wall_seconds else None,
+        'formatted_messages': formatted,
+        'formatted_per_second': round(formatted / wall_seconds, 1) if wall_seconds else None,
+        'failed_records': failures,
+        'invoke_p50_ms': round(ordered_invoke[len(ordered_invoke) // 2], 4) if ordered_invoke else None,
+        'invoke_max_ms': round(ordered_invoke[-1], 4) if ordered_invoke else None,
+        'stages': stages,
+        'outbound': {
+            'ssm_get_parameter': ssm.calls,
+            'webhook_requests': webhook.requests,
+            'webhook_connections': webhook.connections,
+            'webhook_statuses': {str(code): count for code, count in sorted(webhook.statuses.items())}
+        },
+        'log_bytes': len(output.getvalue().encode('utf-8'))
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"events={report['events']} invocations={report['invocations']} batch_size={report['batch_size']} "
+          f"wall={report['wall_seconds']:.3f}s failed={report['failed_records']}")
+    print(f"throughput: {report['events_per_second']} events/s, "
+          f"{report['formatted_per_second']} formatted messages/s ({report['formatted_messages']} messages)")
+    print(f"invoke latency: p50={report['invoke_p50_ms']}ms max={report['invoke_max_ms']}ms, "
+          f"log output={report['log_bytes']} bytes")
+    print()
+    header = f"{'stage':<10} {'count':>7} {'total(ms)':>11} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9}"
+    print(header)
+    print('-' * len(header))
+    for stage in STAGES:
+        s = report['stages'][stage]
+        if not s['count']:
+            print(f"{stage:<10} {0:>7}")
+            continue
+        print(f"{stage:<10} {s['count']:>7} {s['total_ms']:>11.2f} {s['p50_ms']:>9.4f} {s['p95_ms']:>9.4f} {s['max_ms']:>9.4f}")
+    print()
+    outbound = report['outbound']
+    print(f"outbound: ssm.GetParameter={outbound['ssm_get_parameter']} webhook requests={outbound['webhook_requests']} "
+          f"connections={outbound['webhook_connections']} statuses={outbound['webhook_statuses']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Slack 알림 Lambda 리플레이 / 처리량 벤치마크')
+    parser.add_argument('--events', help='기록된 EventBridge 이벤트 파일 (JSON 배열 또는 JSON Lines)')
+    parser.add_argument('--count', type=int, default=1000, help='합성 이벤트 수 (--events 미지정 시)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('deployment=1,target_health=10,task=20,service=3'),
+                        help='합성 이벤트 종류별 비중 (예: deployment=1,target_health=10,task=20,service=3)')
+    parser.add_argument('--rate', type=float, default=0, help='초당 투입 이벤트 수 (0 = 최대 속도)')
+    parser.add_argument('--batch-size', type=int, default=1, help='호출당 이벤트 수 (1 = EventBridge 직접 호출, >1 = SQS 배치)')
+    parser.add_argument('--webhook-latency', type=float, default=0.0, help='로컬 Webhook 응답 지연 (초)')
+    parser.add_argument('--webhook-429-every', type=int, default=0, help='N번째 Webhook 요청마다 429 응답 (0 = 없음)')
+    parser.add_argument('--digest-window', type=int, default=0, help='HEALTH_DIGEST_WINDOW_SECONDS (0 = 비활성화)')
+    parser.add_argument('--dedup-window', type=int, default=600, help='DEDUP_WINDOW_SECONDS (0 = 비활성화)')
+    parser.add_argument('--task-sample-rate', type=float, default=0.0, help='TASK_EVENT_SAMPLE_RATE')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    events = load_events(args.events) if args.events else synthesize_events(args.count, args.mix, args.seed)
+    report = run_replay(events, args)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+테이블 기반 이벤트 라우터
+(source, detail-type, predicate) → (formatter, 전송 정책) 매핑으로 알림 대상 이벤트를 고릅니다.
+
+- source / detail-type 은 dict 조회와 문자열 비교만으로 걸러내고,
+  predicate 도 메시지 생성이나 I/O 이전에 평가하므로 대상이 아닌 이벤트는 저렴하게 버려집니다.
+- 전송 정책
+  - always: 항상 전송
+  - sampled: 이벤트 id 해시 기준으로 일정 비율만 전송 (재전달된 이벤트도 같은 결정)
+  - rate_limited: 키(서비스 등)별로 윈도우당 최대 N건만 전송 (컨테이너 메모리 기준)
+  - digest: 즉시 전송하지 않고 집계 단계로 넘김
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+POLICY_ALWAYS = 'always'
+POLICY_SAMPLED = 'sampled'
+POLICY_RATE_LIMITED = 'rate_limited'
+POLICY_DIGEST = 'digest'
+
+Event = Dict[str, Any]
+
+
+class RateLimiter:
+    """
+    키별 고정 윈도우 카운터 (윈도우당 최대 limit건 허용)
+    """
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._counters: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        window_start = now - now % self.window_seconds
+        with self._lock:
+            start, count = self._counters.get(key, (window_start, 0))
+            if start != window_start:
+                start, count = window_start, 0
+            if count >= self.limit:
+                self._counters[key] = (start, count)
+                return False
+            self._counters[key] = (start, count + 1)
+            # 오래된 키 정리
+            if len(self._counters) > 1000:
+                self._counters = {k: v for k, v in self._counters.items() if v[0] == window_start}
+            return True
+
+
+class Route:
+    """
+    라우팅 규칙 하나
+    - detail_type: 정확히 일치해야 하는 detail-type (detail_type_contains 를 쓰면 부분 일치)
+    - predicate: 이벤트를 받아 알림 대상 여부를 반환 (메시지 생성 전에 평가)
+    - formatter: 이벤트 → Slack 메시지
+    - key: rate_limited 정책에서 제한 단위를 구하는 함수 (예: 서비스 이름)
+    - digest: digest 정책에서 이벤트를 집계 단계로 넘기는 함수
+    """
+
+    def __init__(self, name: str, source: str, formatter: Callable[[Event], Dict[str, Any]],
+                 detail_type: Optional[str] = None, detail_type_contains: Optional[str] = None,
+                 predicate: Optional[Callable[[Event], bool]] = None, policy: str = POLICY_ALWAYS,
+                 sample_rate: float = 1.0, rate_limiter: Optional[RateLimiter] = None,
+                 key: Optional[Callable[[Event], str]] = None,
+                 digest: Optional[Callable[[Event], None]] = None):
+        if policy == POLICY_RATE_LIMITED and rate_limiter is None:
+            raise ValueError(f"Route {name}: rate_limited policy requires rate_limiter")
+        if policy == POLICY_DIGEST and digest is None:
+            raise ValueError(f"Route {name}: digest policy requires digest function")
+
+        self.name = name
+        self.source = source
+        self.detail_type = detail_type
+        self.detail_type_contains = detail_type_contains
+        self.predicate = predicate
+        self.formatter = formatter
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.rate_limiter = rate_limiter
+        self.key = key
+        self.digest = digest
+
+    def matches(self, event: Event) -> bool:
+        detail_type = event.get('detail-type', '')
+        if self.detail_type is not None and detail_type != self.detail_type:
+            return False
+        if self.detail_type_contains is not None and self.detail_type_contains not in detail_type:
+            return False
+        return self.predicate is None or self.predicate(event)
+
+    def admit(self, event: Event) -> Tuple[bool, Optional[str]]:
+        """
+        전송 정책에 따라 (통과 여부, 탈락 사유)를 반환합니다. digest 정책은 항상 통과합니다.
+        """
+        if self.policy == POLICY_SAMPLED:
+            if not sampled_in(event, self.sample_rate):
+                return False, 'sampled'
+        elif self.policy == POLICY_RATE_LIMITED:
+            key = self.key(event) if self.key else self.name
+            if not self.rate_limiter.allow(key):
+                return False, 'rate_limited'
+        return True, None
+
+
+def sampled_in(event: Event, rate: float) -> bool:
+    """
+    이벤트 id 해시로 샘플링 여부를 결정합니다 (같은 이벤트는 항상 같은 결정).
+    """
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    event_id = event.get('id') or repr(sorted(event.get('detail', {}).items()))
+    bucket = int(hashlib.sha1(str(event_id).encode('utf-8')).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return bucket < rate
+
+
+class Router:
+    """
+    source 별로 규칙을 묶어 두고 등록 순서대로 첫 번째로 일치하는 규칙을 반환합니다.
+    """
+
+    def __init__(self, routes: List[Route]):
+        self._by_source: Dict[str, List[Route]] = {}
+        for route in routes:
+            self._by_source.setdefault(route.source, []).append(route)
+
+    def match(self, event: Event) -> Optional[Route]:
+        for route in self._by_source.get(event.get('source', ''), ()):
+            if route.matches(event):
+                return route
+        return None
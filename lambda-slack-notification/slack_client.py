@@ -0,0 +1,215 @@
+"""
+Slack Webhook 전송 클라이언트
+- warm 호출 간에 keep-alive TLS 연결을 유지하여 메시지마다 핸드셰이크하지 않음
+- 429 응답은 Retry-After 만큼 기다렸다가 재시도 (총 대기 시간 예산 내에서)
+- 5xx 응답과 연결 단계 오류(DNS / TCP / TLS)는 지터가 들어간 지수 백오프로 재시도
+- 요청을 보낸 뒤의 오류(응답 읽기 타임아웃 등)는 Slack이 이미 메시지를 받았을 수 있으므로 재시도하지 않음
+- 재사용하던 연결이 서버 쪽에서 이미 닫혀 있었으면 새 연결로 즉시 재시도
+- deadline(time.monotonic() 기준)을 넘겨 기다리거나 재시도하지 않음 (소켓 타임아웃도 deadline까지로 제한)
+- http:// URL도 지원하므로 로컬 HTTP 서버로 테스트 가능
+"""
+
+import http.client
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 재사용 중이던 연결이 서버 쪽에서 닫혔을 때 발생하는 예외
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError
+)
+
+# deadline까지 이보다 적게 남았으면 새 시도를 시작하지 않음 (초)
+MIN_ATTEMPT_SECONDS = 1.0
+
+
+class SlackConnectError(ConnectionError):
+    """
+    연결 단계(DNS / TCP / TLS)에서 실패한 경우 (요청을 보내기 전이므로 재시도해도 중복 전송되지 않음)
+    """
+
+
+class SlackDeadlineExceeded(TimeoutError):
+    """
+    deadline 안에 전송을 시작하거나 재시도할 수 없는 경우
+    """
+
+
+class SlackDeliveryError(Exception):
+    """
+    Slack이 메시지를 거부했거나 재시도 한도를 넘긴 경우
+    """
+
+    def __init__(self, code: int, body: str, attempts: int):
+        super().__init__(f"Slack webhook returned HTTP {code}: {body}")
+        self.code = code
+        self.body = body
+        self.attempts = attempts
+
+
+class DeliveryResult:
+    """
+    전송 한 건의 결과 (지연 시간 / 시도 횟수 / 사유별 재시도 횟수)
+    """
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.retries: Dict[str, int] = {}
+        self.latency_ms = 0.0
+        self.waited_seconds = 0.0
+
+    def add_retry(self, reason: str) -> None:
+        self.retries[reason] = self.retries.get(reason, 0) + 1
+
+
+class SlackClient:
+    """
+    호스트별로 HTTP(S) 연결 하나를 유지하면서 메시지를 순차 전송합니다.
+    (http.client는 요청 파이프라이닝을 지원하지 않으므로 같은 연결에서 요청을 이어서 보냅니다)
+    """
+
+    def __init__(self, timeout: float = 10.0, max_attempts: int = 4, retry_budget: float = 10.0,
+                 backoff_base: float = 0.5, backoff_cap: float = 4.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_budget = retry_budget
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._sleep = sleep
+        self._connections: Dict[Tuple[str, str, Optional[int]], http.client.HTTPConnection] = {}
+        self._lock = threading.Lock()
+
+    def _connection(self, scheme: str, host: str, port: Optional[int]) -> http.client.HTTPConnection:
+        key = (scheme, host, port)
+        conn = self._connections.get(key)
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            conn = conn_class(host, port, timeout=self.timeout)
+            self._connections[key] = conn
+        return conn
+
+    def _drop_connection(self, scheme: str, host: str, port: Optional[int]) -> None:
+        conn = self._connections.pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(self, scheme: str, host: str, port: Optional[int], path: str,
+                 body: bytes, timeout: float) -> Tuple[int, Dict[str, str], str]:
+        """
+        요청 한 번을 보냅니다. 재사용하던 연결이 끊겼으면 새 연결로 한 번 더 시도합니다.
+        새 연결을 맺다가 실패하면 SlackConnectError를 발생시킵니다.
+        """
+        headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive'}
+        for reconnect in (False, True):
+            conn = self._connection(scheme, host, port)
+            reused = conn.sock is not None
+            conn.timeout = timeout
+            if reused:
+                conn.sock.settimeout(timeout)
+            else:
+                try:
+                    conn.connect()
+                except OSError as e:
+                    self._drop_connection(scheme, host, port)
+                    raise SlackConnectError(f"Failed to connect to {host}: {e}") from e
+            try:
+                conn.request('POST', path, body=body, headers=headers)
+                response = conn.getresponse()
+                # 연결을 재사용하려면 응답 본문을 끝까지 읽어야 함
+                text = response.read().decode('utf-8', errors='replace')
+                if response.will_close:
+                    self._drop_connection(scheme, host, port)
+                return response.status, {k.lower(): v for k, v in response.getheaders()}, text
+            except STALE_CONNECTION_ERRORS:
+                # keep-alive로 쉬던 연결을 서버가 먼저 닫은 경우에만 재시도 (응답 없이 끊김 = 요청을 처리하지 않음)
+                self._drop_connection(scheme, host, port)
+                if reconnect or not reused:
+                    raise
+            except Exception:
+                self._drop_connection(scheme, host, port)
+                raise
+        raise RuntimeError('unreachable')
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(cap, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _retry_after(headers: Dict[str, str]) -> float:
+        try:
+            return max(0.0, float(headers.get('retry-after', '1')))
+        except ValueError:
+            return 1.0
+
+    def _attempt_timeout(self, deadline: Optional[float]) -> float:
+        """
+        이번 시도의 소켓 타임아웃 (deadline까지 남은 시간 이하)
+        """
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_ATTEMPT_SECONDS:
+            raise SlackDeadlineExceeded(f"Slack delivery deadline exceeded ({remaining:.2f}s left)")
+        return min(self.timeout, remaining)
+
+    def _can_retry(self, result: DeliveryResult, delay: float, deadline: Optional[float]) -> bool:
+        if result.attempts >= self.max_attempts or result.waited_seconds + delay > self.retry_budget:
+            return False
+        return deadline is None or time.monotonic() + delay + MIN_ATTEMPT_SECONDS <= deadline
+
+    def post(self, url: str, message: Dict[str, Any], deadline: Optional[float] = None) -> DeliveryResult:
+        """
+        메시지를 전송하고 결과를 반환합니다. 최종 실패 시 SlackDeliveryError를 발생시킵니다.
+        deadline(time.monotonic() 기준)이 주어지면 그 시각을 넘겨 기다리거나 재시도하지 않습니다.
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        body = json.dumps(message).encode('utf-8')
+        result = DeliveryResult()
+        start = time.perf_counter()
+
+        with self._lock:
+            try:
+                while True:
+                    timeout = self._attempt_timeout(deadline)
+                    result.attempts += 1
+                    try:
+                        status, headers, text = self._request(parts.scheme, parts.hostname, parts.port,
+                                                              path, body, timeout)
+                    except SlackConnectError:
+                        delay, reason = self._backoff(result.attempts), 'connection'
+                        if not self._can_retry(result, delay, deadline):
+                            raise
+                    else:
+                        result.status = status
+                        if 200 <= status < 300:
+                            return result
+                        if status == 429:
+                            delay, reason = self._retry_after(headers), 'rate_limited'
+                        elif status >= 500:
+                            delay, reason = self._backoff(result.attempts), 'server_error'
+                        else:
+                            raise SlackDeliveryError(status, text, result.attempts)
+
+                        if not self._can_retry(result, delay, deadline):
+                            raise SlackDeliveryError(status, text, result.attempts)
+
+                    result.add_retry(reason)
+                    result.waited_seconds += delay
+                    self._sleep(delay)
+            finally:
+                result.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    def close(self) -> None:
+        with self._lock:
+            for key in list(self._connections):
+                self._drop_connection(*key)
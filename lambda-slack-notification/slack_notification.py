@@ -1,12 +1,83 @@
 import json
 import os
-import urllib.request
-import urllib.error
-from datetime import datetime
-import boto3
-from typing import Dict, Any, Optional
-
-ssm = boto3.client('ssm')
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+import lambda_runtime
+from dedup import Deduplicator, DuplicateInFlight, DynamoDBDedupStore, InMemoryDedupStore
+from emf_metrics import MetricsLogger
+from health_digest import DynamoDBDigestStore, HealthDigest, InMemoryDigestStore
+from lambda_runtime import get_client
+from router import (POLICY_ALWAYS, POLICY_DIGEST, POLICY_RATE_LIMITED, POLICY_SAMPLED,
+                    RateLimiter, Route, Router)
+from slack_client import SlackClient, SlackDeliveryError
+from structured_log import get_logger, parse_sample_rates, summarize_event
+
+# 한국 시간 오프셋 (UTC+9)
+KST_OFFSET = timedelta(hours=9)
+
+# Slack Webhook URL 캐시 설정 (초)
+WEBHOOK_CACHE_TTL = int(os.environ.get('SLACK_WEBHOOK_CACHE_TTL', '300'))
+WEBHOOK_REFRESH_AHEAD = int(os.environ.get('SLACK_WEBHOOK_REFRESH_AHEAD', '30'))
+
+# 배치 처리 중 남은 실행 시간이 이보다 적으면 새 레코드를 시작하지 않고 실패로 보고 (밀리초)
+# 한 레코드의 전송이 함수 타임아웃을 넘겨 배치 전체가 재전달되는 것을 막기 위함
+BATCH_TIME_RESERVE_MS = int(os.environ.get('BATCH_TIME_RESERVE_MS', '12000'))
+
+# Slack이 Webhook 자체를 거부할 때의 상태 코드 (토큰 폐기, 채널 삭제/보관 등)
+WEBHOOK_REJECTED_STATUSES = (403, 404, 410)
+
+# Target Health 다이제스트 설정 (윈도우 0 = 비활성화, 이벤트마다 즉시 알림)
+HEALTH_DIGEST_WINDOW_SECONDS = int(os.environ.get('HEALTH_DIGEST_WINDOW_SECONDS', '0'))
+HEALTH_DIGEST_GRACE_SECONDS = int(os.environ.get('HEALTH_DIGEST_GRACE_SECONDS', '30'))
+HEALTH_DIGEST_TABLE = os.environ.get('HEALTH_DIGEST_TABLE', '')
+
+# 다이제스트 메시지에 표시할 최대 타겟 수
+DIGEST_MAX_TARGETS = 20
+
+# 중복 알림 억제 설정 (윈도우 0 = 비활성화)
+DEDUP_WINDOW_SECONDS = int(os.environ.get('DEDUP_WINDOW_SECONDS', '600'))
+DEDUP_TABLE = os.environ.get('DEDUP_TABLE', '')
+# 전송 중(pending) 선점 유지 시간 (초) - 함수 타임아웃보다 길고 SQS visibility timeout보다 짧게
+DEDUP_PENDING_SECONDS = int(os.environ.get('DEDUP_PENDING_SECONDS', '60'))
+# true면 배포 COMPLETED / FAILED 메시지는 이벤트 id가 달라도 내용이 같으면 한 번만 전송
+DEDUP_DEPLOYMENT_FINGERPRINT = os.environ.get('DEDUP_DEPLOYMENT_FINGERPRINT', 'false').lower() == 'true'
+
+# Slack 전송 설정 (429 Retry-After / 5xx 재시도의 총 대기 예산은 Lambda timeout보다 작게)
+SLACK_HTTP_TIMEOUT = float(os.environ.get('SLACK_HTTP_TIMEOUT', '10'))
+SLACK_MAX_ATTEMPTS = int(os.environ.get('SLACK_MAX_ATTEMPTS', '4'))
+SLACK_RETRY_BUDGET_SECONDS = float(os.environ.get('SLACK_RETRY_BUDGET_SECONDS', '10'))
+# Slack 전송(타임아웃 / 재시도 포함)은 함수 타임아웃보다 이만큼 먼저 끝냄 (밀리초)
+# 남은 시간은 dedup 선점 해제, 배치 결과 보고, 메트릭 flush에 사용
+DELIVERY_TIME_RESERVE_MS = int(os.environ.get('DELIVERY_TIME_RESERVE_MS', '3000'))
+
+# ECS Task / Service 이벤트 전송 정책 (대량 발생 시 서비스별로 제한)
+# - 태스크 실패(비정상 종료)는 서비스별 윈도우당 TASK_FAILURE_RATE_LIMIT 건까지 전송
+# - 그 외 RUNNING / STOPPED 전환은 TASK_EVENT_SAMPLE_RATE 비율만 전송 (0 = 전송 안 함)
+# - 서비스 WARN / ERROR 이벤트는 서비스별 윈도우당 SERVICE_EVENT_RATE_LIMIT 건까지 전송
+TASK_FAILURE_RATE_LIMIT = int(os.environ.get('TASK_FAILURE_RATE_LIMIT', '3'))
+TASK_EVENT_SAMPLE_RATE = float(os.environ.get('TASK_EVENT_SAMPLE_RATE', '0'))
+SERVICE_EVENT_RATE_LIMIT = int(os.environ.get('SERVICE_EVENT_RATE_LIMIT', '3'))
+EVENT_RATE_WINDOW_SECONDS = int(os.environ.get('EVENT_RATE_WINDOW_SECONDS', '300'))
+
+# 비정상 종료로 보는 태스크 stopCode
+TASK_FAILURE_STOP_CODES = ('TaskFailedToStart', 'EssentialContainerExited')
+
+# CloudWatch 메트릭 네임스페이스 (EMF 로그로 전송)
+METRIC_NAMESPACE = 'Infrastructure/SlackNotification'
+
+# 호출 단위로 flush 되는 메트릭 버퍼
+metrics = MetricsLogger(METRIC_NAMESPACE)
+
+# 이벤트 수신 로그 샘플링 비율 (대량 발생하는 이벤트 종류만, 오류 로그는 샘플링하지 않음)
+DEFAULT_LOG_SAMPLE_RATES = 'ECS Task State Change=0.05,ECS Service Action=0.2,Target Health=0.2'
+
+# 구조화 로거 (LOG_LEVEL / LOG_SAMPLE_RATES 로 조정)
+log = get_logger(
+    'slack-notification',
+    sample_rates=parse_sample_rates(os.environ.get('LOG_SAMPLE_RATES', DEFAULT_LOG_SAMPLE_RATES))
+)
 
 def get_slack_webhook_url() -> str:
     """
@@ -15,16 +86,60 @@ def get_slack_webhook_url() -> str:
     parameter_name = os.environ.get('SLACK_WEBHOOK_PARAMETER', '/chatapp/slack/webhook-url')
 
     try:
-        response = ssm.get_parameter(
+        response = get_client('ssm').get_parameter(
             Name=parameter_name,
             WithDecryption=True
         )
         return response['Parameter']['Value']
     except Exception as e:
-        print(f"Error getting Slack webhook URL from Parameter Store: {str(e)}")
+        log.error('Failed to get Slack webhook URL from Parameter Store', parameter=parameter_name, error=str(e))
         raise
 
 
+# warm 호출 간에 유지되는 Webhook URL 캐시 (만료 직전 호출 안에서 동기 갱신)
+webhook_url_cache = lambda_runtime.CachedValue(
+    get_slack_webhook_url,
+    ttl=WEBHOOK_CACHE_TTL,
+    refresh_ahead=WEBHOOK_REFRESH_AHEAD,
+    logger=log
+)
+
+
+def build_health_digest() -> Optional[HealthDigest]:
+    """
+    Target Health 다이제스트를 구성합니다.
+    HEALTH_DIGEST_TABLE이 없으면 프로세스 메모리 저장소를 사용합니다 (로컬 테스트용).
+    """
+    if HEALTH_DIGEST_WINDOW_SECONDS <= 0:
+        return None
+    store = DynamoDBDigestStore(HEALTH_DIGEST_TABLE) if HEALTH_DIGEST_TABLE else InMemoryDigestStore()
+    return HealthDigest(store, HEALTH_DIGEST_WINDOW_SECONDS, HEALTH_DIGEST_GRACE_SECONDS)
+
+
+health_digest = build_health_digest()
+
+
+def build_deduplicator() -> Optional[Deduplicator]:
+    """
+    중복 알림 억제기를 구성합니다.
+    DEDUP_TABLE이 없으면 프로세스 메모리 저장소를 사용합니다 (warm 컨테이너 내에서만 유효).
+    """
+    if DEDUP_WINDOW_SECONDS <= 0:
+        return None
+    store = DynamoDBDedupStore(DEDUP_TABLE) if DEDUP_TABLE else InMemoryDedupStore()
+    return Deduplicator(store, DEDUP_WINDOW_SECONDS, DEDUP_PENDING_SECONDS)
+
+
+deduplicator = build_deduplicator()
+
+# warm 호출 간에 keep-alive 연결을 유지하는 Slack 전송 클라이언트
+slack_client = SlackClient(
+    timeout=SLACK_HTTP_TIMEOUT,
+    max_attempts=SLACK_MAX_ATTEMPTS,
+    retry_budget=SLACK_RETRY_BUDGET_SECONDS
+)
+
+
 def format_timestamp(timestamp_str: str) -> str:
     """
     ISO 8601 타임스탬프를 읽기 쉬운 형식으로 변환합니다.
@@ -264,8 +379,7 @@ def create_deployment_state_change_message(event: Dict[str, Any]) -> Dict[str, A
     title = f"{emoji} {env_emoji} {env_name} 환경 - {status_text}"
 
     # 배포 시간 (한국 시간으로 변환)
-    from datetime import timedelta
-    deploy_time = datetime.fromisoformat(event['time'].replace('Z', '+00:00')) + timedelta(hours=9)
+    deploy_time = datetime.fromisoformat(event['time'].replace('Z', '+00:00')) + KST_OFFSET
     deploy_time_str = deploy_time.strftime('%Y년 %m월 %d일 %H:%M')
 
     # 필드 정보 구성
@@ -391,81 +505,444 @@ def create_target_health_message(event: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def send_slack_notification(webhook_url: str, message: Dict[str, Any]) -> None:
+def create_target_health_digest_message(target_group: str, window_start: int, window_end: int,
+                                        targets: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    윈도우 동안의 ALB 타겟 헬스 변경을 요약한 Slack 메시지를 생성합니다.
+    타겟별 최종 상태와 상태 전환 횟수를 표시합니다.
+    """
+    states = [entry['state'] for entry in targets.values()]
+    unhealthy = states.count('unhealthy')
+    healthy = states.count('healthy')
+    others = len(states) - unhealthy - healthy
+    transitions = sum(entry['transitions'] for entry in targets.values())
+
+    if unhealthy:
+        emoji, color = "💔", "danger"
+    elif others:
+        emoji, color = "💛", "warning"
+    else:
+        emoji, color = "💚", "good"
+
+    title = f"{emoji} Target Health Digest: {target_group}"
+
+    start_str = (datetime.fromtimestamp(window_start, timezone.utc) + KST_OFFSET).strftime('%H:%M:%S')
+    end_str = (datetime.fromtimestamp(window_end, timezone.utc) + KST_OFFSET).strftime('%H:%M:%S')
+
+    # 비정상 타겟을 먼저 표시
+    ordered = sorted(targets.items(), key=lambda item: (item[1]['state'] == 'healthy', item[0]))
+    lines = []
+    for target, entry in ordered[:DIGEST_MAX_TARGETS]:
+        state = entry['state']
+        state_emoji = "💚" if state == 'healthy' else "💔" if state == 'unhealthy' else "💛"
+        line = f"{state_emoji} `{target}` {state} (전환 {entry['transitions']}회)"
+        if state != 'healthy' and entry.get('reason'):
+            line += f" - {entry['reason']}"
+        lines.append(line)
+    if len(ordered) > DIGEST_MAX_TARGETS:
+        lines.append(f"… 외 {len(ordered) - DIGEST_MAX_TARGETS}개 타겟")
+
+    fields = [
+        {
+            "title": "Window (KST)",
+            "value": f"{start_str} ~ {end_str}",
+            "short": True
+        },
+        {
+            "title": "Summary",
+            "value": f"healthy {healthy} | unhealthy {unhealthy} | other {others} | 전환 {transitions}회",
+            "short": True
+        },
+        {
+            "title": "Targets",
+            "value": "\n".join(lines),
+            "short": False
+        }
+    ]
+
+    return {
+        "attachments": [{
+            "color": color,
+            "title": title,
+            "fields": fields,
+            "footer": "ECS Deployment Monitor",
+            "ts": window_end
+        }]
+    }
+
+
+def delivery_deadline(context: Any) -> Optional[float]:
+    """
+    Slack 전송을 끝내야 하는 시각 (time.monotonic() 기준, context가 없으면 None = 제한 없음)
+    """
+    if context is None:
+        return None
+    return time.monotonic() + (context.get_remaining_time_in_millis() - DELIVERY_TIME_RESERVE_MS) / 1000
+
+
+def send_slack_notification(webhook_url: str, message: Dict[str, Any], deadline: Optional[float] = None) -> None:
     """
     Slack Webhook으로 메시지를 전송합니다.
+    전송 지연 시간과 재시도 횟수를 메트릭으로 기록합니다.
     """
-    data = json.dumps(message).encode('utf-8')
-    req = urllib.request.Request(
-        webhook_url,
-        data=data,
-        headers={'Content-Type': 'application/json'}
+    try:
+        result = slack_client.post(webhook_url, message, deadline=deadline)
+    except SlackDeliveryError as e:
+        log.error('Slack notification failed', status=e.code, attempts=e.attempts, response=e.body)
+        metrics.put_metric('DeliveryFailures', 1, 'Count')
+        raise
+    except Exception as e:
+        log.error('Error sending Slack notification', error=str(e))
+        metrics.put_metric('DeliveryFailures', 1, 'Count')
+        raise
+
+    metrics.put_metric('DeliveryLatency', result.latency_ms, 'Milliseconds')
+    metrics.put_metric('DeliveryAttempts', result.attempts, 'Count')
+    for reason, count in result.retries.items():
+        metrics.put_metric('DeliveryRetries', count, 'Count', {'Reason': reason})
+    log.debug('Slack notification sent', latency_ms=result.latency_ms, attempts=result.attempts)
+
+
+def deliver_message(message: Dict[str, Any], deadline: Optional[float] = None) -> None:
+    """
+    캐시된 Webhook URL로 메시지를 전송합니다.
+    Webhook이 거부되면 캐시를 무효화하고, Parameter Store 값이 바뀌었으면 한 번 재시도합니다.
+    """
+    webhook_url = webhook_url_cache.get()
+    try:
+        send_slack_notification(webhook_url, message, deadline)
+    except SlackDeliveryError as e:
+        if e.code not in WEBHOOK_REJECTED_STATUSES:
+            raise
+        log.warning('Slack webhook rejected, invalidating cached URL', status=e.code)
+        webhook_url_cache.invalidate()
+        fresh_url = webhook_url_cache.get()
+        if fresh_url == webhook_url:
+            raise
+        send_slack_notification(fresh_url, message, deadline)
+
+
+# 모듈 import/init 완료 시점 기록 (클라이언트는 첫 사용 시 생성)
+lambda_runtime.mark_init()
+
+
+def buffer_target_health(event: Dict[str, Any]) -> None:
+    """
+    Target Health 이벤트를 즉시 알리지 않고 다이제스트 윈도우에 기록합니다.
+    """
+    detail = event.get('detail', {})
+    target = detail.get('target', {})
+    target_health = detail.get('targetHealth', {})
+
+    resources = event.get('resources', [])
+    target_group_arn = resources[0] if resources else 'N/A'
+    tg_name = target_group_arn.split(':')[-1] if ':' in target_group_arn else target_group_arn
+
+    event_time = datetime.fromisoformat(event['time'].replace('Z', '+00:00')).timestamp()
+    buffered = health_digest.add(
+        target_group=tg_name,
+        target=f"{target.get('id', 'N/A')}:{target.get('port', 'N/A')}",
+        state=target_health.get('state', 'unknown'),
+        reason=target_health.get('reason', ''),
+        event_time=event_time
     )
+    if not buffered:
+        log.warning('Dropped late target health event (window already closed)', target_group=tg_name)
 
+
+def flush_health_digests(deadline: Optional[float] = None) -> int:
+    """
+    닫힌 다이제스트 윈도우마다 요약 메시지를 한 번 전송합니다.
+    전송에 실패한 윈도우는 다시 열어 다음 호출에서 재시도합니다.
+    """
+    if health_digest is None:
+        return 0
+
+    sent = 0
     try:
-        with urllib.request.urlopen(req, timeout=10) as response:
-            if response.status != 200:
-                print(f"Slack notification failed with status {response.status}")
-                print(f"Response: {response.read().decode('utf-8')}")
-            else:
-                print("Slack notification sent successfully")
-    except urllib.error.URLError as e:
-        print(f"Error sending Slack notification: {str(e)}")
+        windows = health_digest.claim_closed()
+    except Exception as e:
+        log.error('Failed to claim health digest windows', error=str(e))
+        return 0
+
+    for window in windows:
+        try:
+            targets = health_digest.load(window)
+            if targets:
+                message = create_target_health_digest_message(window[0], window[1], window[2], targets)
+                deliver_message(message, deadline)
+                metrics.put_metric('DigestsSent', 1, 'Count')
+                sent += 1
+            health_digest.complete(window)
+        except Exception as e:
+            log.error('Failed to send health digest', target_group=window[0], error=str(e))
+            try:
+                health_digest.release(window)
+            except Exception as release_error:
+                # 윈도우를 다시 열지 못하면 이 다이제스트는 유실되므로 메트릭으로 남김
+                log.error('Failed to release health digest window', target_group=window[0],
+                          window_start=window[1], error=str(release_error))
+                metrics.put_metric('DigestsLost', 1, 'Count')
+    return sent
+
+
+def task_service_name(event: Dict[str, Any]) -> str:
+    """
+    ECS Task 이벤트의 서비스 이름 (group = "service:<이름>")
+    """
+    group = event.get('detail', {}).get('group', '')
+    return group.replace('service:', '') if group.startswith('service:') else group or 'N/A'
+
+
+def service_event_name(event: Dict[str, Any]) -> str:
+    """
+    ECS Service Action 이벤트의 서비스 이름 (resources[0] = 서비스 ARN)
+    """
+    resources = event.get('resources', [])
+    service_arn = resources[0] if resources else 'N/A'
+    return service_arn.split('/')[-1] if '/' in service_arn else service_arn
+
+
+def is_task_failure(event: Dict[str, Any]) -> bool:
+    detail = event.get('detail', {})
+    return detail.get('lastStatus') == 'STOPPED' and detail.get('stopCode') in TASK_FAILURE_STOP_CODES
+
+
+def is_task_transition(event: Dict[str, Any]) -> bool:
+    # PENDING / PROVISIONING 등 중간 상태는 제외하고 목표 상태에 도달한 전환만
+    detail = event.get('detail', {})
+    last_status = detail.get('lastStatus')
+    return last_status in ('RUNNING', 'STOPPED') and last_status == detail.get('desiredStatus')
+
+
+def build_router() -> Router:
+    """
+    알림 라우팅 테이블을 구성합니다. 먼저 등록한 규칙이 우선합니다.
+    """
+    routes = [
+        # 배포 상태 변경 - COMPLETED 또는 FAILED 상태만 알림
+        Route(
+            'deployment', 'aws.ecs', create_deployment_state_change_message,
+            detail_type='ECS Deployment State Change',
+            predicate=lambda e: e.get('detail', {}).get('deploymentStatus') in ('COMPLETED', 'FAILED')
+        ),
+        # ALB 타겟 헬스 변경 (다이제스트가 켜져 있으면 윈도우 단위로 묶어서 알림)
+        Route(
+            'target_health', 'aws.elasticloadbalancing', create_target_health_message,
+            detail_type_contains='Target Health',
+            policy=POLICY_DIGEST if health_digest is not None else POLICY_ALWAYS,
+            digest=buffer_target_health if health_digest is not None else None
+        ),
+        Route(
+            'task_failure', 'aws.ecs', create_task_state_change_message,
+            detail_type='ECS Task State Change',
+            predicate=is_task_failure,
+            policy=POLICY_RATE_LIMITED,
+            rate_limiter=RateLimiter(TASK_FAILURE_RATE_LIMIT, EVENT_RATE_WINDOW_SECONDS),
+            key=task_service_name
+        ),
+        Route(
+            'service_event', 'aws.ecs', create_service_deployment_message,
+            detail_type='ECS Service Action',
+            predicate=lambda e: e.get('detail', {}).get('eventType') in ('WARN', 'ERROR'),
+            policy=POLICY_RATE_LIMITED,
+            rate_limiter=RateLimiter(SERVICE_EVENT_RATE_LIMIT, EVENT_RATE_WINDOW_SECONDS),
+            key=service_event_name
+        )
+    ]
+    if TASK_EVENT_SAMPLE_RATE > 0:
+        routes.append(Route(
+            'task_transition', 'aws.ecs', create_task_state_change_message,
+            detail_type='ECS Task State Change',
+            predicate=is_task_transition,
+            policy=POLICY_SAMPLED,
+            sample_rate=TASK_EVENT_SAMPLE_RATE
+        ))
+    return Router(routes)
+
+
+router = build_router()
+
+
+def create_message(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    EventBridge 이벤트 하나에 대한 Slack 메시지를 생성합니다 (전송 정책은 적용하지 않음).
+    알림 대상이 아니면 None을 반환합니다.
+    """
+    route = router.match(event)
+    return route.formatter(event) if route else None
+
+
+def process_event(event: Dict[str, Any], deadline: Optional[float] = None) -> bool:
+    """
+    이벤트 하나를 처리합니다. 메시지를 전송했으면 True, 알림 대상이 아니면 False를 반환합니다.
+    전송 실패 시 예외가 그대로 전달됩니다.
+    라우팅 / 전송 정책 판단은 메시지 생성과 Webhook 조회 이전에 끝냅니다.
+    """
+    route = router.match(event)
+    if route is None:
+        log.debug('No route for event', detail_type=event.get('detail-type', ''))
+        return False
+
+    if route.policy == POLICY_DIGEST:
+        route.digest(event)
+        return False
+
+    admitted, drop_reason = route.admit(event)
+    if not admitted:
+        metrics.put_metric('EventsDropped', 1, 'Count', {'Route': route.name, 'Reason': drop_reason})
+        return False
+
+    message = route.formatter(event)
+
+    claimed_keys: List[str] = []
+    if deduplicator is not None:
+        fingerprint = DEDUP_DEPLOYMENT_FINGERPRINT and route.name == 'deployment'
+        try:
+            should_send, reason, claimed_keys = deduplicator.acquire(event, message, fingerprint=fingerprint)
+        except DuplicateInFlight:
+            metrics.put_metric('NotificationsSuppressed', 1, 'Count', {'Reason': 'in_flight'})
+            raise
+        if not should_send:
+            log.info('Suppressed duplicate notification', reason=reason, event_id=event.get('id'))
+            metrics.put_metric('NotificationsSuppressed', 1, 'Count', {'Reason': reason})
+            return False
+
+    # Slack으로 전송 (Webhook URL은 이때만 조회)
+    try:
+        deliver_message(message, deadline)
+    except Exception:
+        if deduplicator is not None:
+            deduplicator.release(claimed_keys)
         raise
+    if deduplicator is not None:
+        deduplicator.confirm(claimed_keys)
+    metrics.put_metric('NotificationsSent', 1, 'Count', {'Route': route.name})
+    return True
 
 
-def lambda_handler(event, context):
+def extract_batch(event: Any) -> Optional[List[Tuple[str, Any]]]:
     """
-    Lambda 핸들러 함수
+    배치 입력이면 (itemIdentifier, 레코드) 목록을 반환하고, 단일 이벤트면 None을 반환합니다.
+    - SQS 배치: {"Records": [{"messageId": ..., "body": "<EventBridge 이벤트 JSON>"}]}
+    - 이벤트 목록: [{EventBridge 이벤트}, ...]
     """
-    print(f"Received event: {json.dumps(event)}")
+    if isinstance(event, list):
+        return [(item.get('id', str(idx)) if isinstance(item, dict) else str(idx), item)
+                for idx, item in enumerate(event)]
 
+    records = event.get('Records') if isinstance(event, dict) else None
+    if isinstance(records, list):
+        return [(record.get('messageId', str(idx)), record) for idx, record in enumerate(records)]
+
+    return None
+
+
+def parse_record(record: Any) -> Dict[str, Any]:
+    """
+    배치 레코드에서 EventBridge 이벤트를 꺼냅니다 (SQS 레코드면 body를 파싱).
+    """
+    if isinstance(record, dict) and record.get('eventSource') == 'aws:sqs':
+        return json.loads(record['body'])
+    if not isinstance(record, dict):
+        raise ValueError(f"Unsupported record type: {type(record).__name__}")
+    return record
+
+
+def process_batch(items: List[Tuple[str, Any]], context: Any = None) -> Dict[str, Any]:
+    """
+    배치를 한 번에 처리하고 실패한 레코드만 batchItemFailures로 보고합니다.
+    (SQS 이벤트 소스 매핑의 ReportBatchItemFailures와 함께 사용하면 실패한 레코드만 재시도됩니다)
+    남은 실행 시간이 BATCH_TIME_RESERVE_MS보다 적으면 나머지 레코드는 처리하지 않고 실패로 보고합니다.
+    """
+    log.info('Received batch', records=len(items))
+
+    deadline = delivery_deadline(context)
+    failures = []
+    sent = skipped = deferred = 0
+    for item_id, record in items:
+        if context is not None and context.get_remaining_time_in_millis() < BATCH_TIME_RESERVE_MS:
+            failures.append({'itemIdentifier': item_id})
+            deferred += 1
+            continue
+        try:
+            event = parse_record(record)
+            log.sampled(event.get('detail-type', ''), 'Processing record', item_id=item_id,
+                        event=summarize_event(event))
+            if process_event(event, deadline):
+                sent += 1
+            else:
+                skipped += 1
+        except DuplicateInFlight:
+            # 다른 호출이 전송 중인 이벤트 (예상된 상황이므로 오류로 남기지 않고 SQS 재전달에 맡김)
+            log.warning('Deferred record being delivered by another invocation', item_id=item_id)
+            failures.append({'itemIdentifier': item_id})
+        except Exception as e:
+            log.exception('Failed to process record', item_id=item_id, error=str(e))
+            failures.append({'itemIdentifier': item_id})
+
+    if deferred:
+        log.warning('Deferred records to the next delivery (low remaining time)', deferred=deferred)
+        metrics.put_metric('RecordsDeferred', deferred, 'Count')
+
+    digests = flush_health_digests(deadline)
+    log.info('Batch summary', sent=sent, skipped=skipped, failed=len(failures) - deferred,
+             deferred=deferred, digests=digests)
+    return {'batchItemFailures': failures}
+
+
+def handle_event(event: Any, context: Any = None) -> Dict[str, Any]:
+    """
+    단일 이벤트 / 배치 입력을 구분해서 처리합니다.
+    """
+    batch = extract_batch(event)
+    if batch is not None:
+        return process_batch(batch, context)
+
+    log.sampled(event.get('detail-type', '') if isinstance(event, dict) else '', 'Received event',
+                event=summarize_event(event))
+
+    deadline = delivery_deadline(context)
     try:
-        # Slack Webhook URL 가져오기
-        webhook_url = get_slack_webhook_url()
-
-        # 이벤트 소스 확인
-        source = event.get('source', '')
-        detail_type = event.get('detail-type', '')
-
-        # 이벤트 타입에 따라 메시지 생성
-        message = None
-
-        if source == 'aws.ecs':
-            if detail_type == 'ECS Deployment State Change':
-                # 배포 상태 변경 - COMPLETED 또는 FAILED 상태만 알림
-                detail = event.get('detail', {})
-                deployment_status = detail.get('deploymentStatus', '')
-
-                # 배포 완료 또는 실패 시에만 알림
-                if deployment_status in ['COMPLETED', 'FAILED']:
-                    message = create_deployment_state_change_message(event)
-
-        elif source == 'aws.elasticloadbalancing':
-            if 'Target Health' in detail_type:
-                # ALB 타겟 헬스 변경
-                message = create_target_health_message(event)
-
-        # 메시지가 생성되었으면 Slack으로 전송
-        if message:
-            send_slack_notification(webhook_url, message)
+        sent = process_event(event, deadline)
+        flush_health_digests(deadline)
+
+        if sent:
             return {
                 'statusCode': 200,
                 'body': json.dumps('Notification sent successfully')
             }
         else:
-            print(f"No message generated for event type: {detail_type}")
             return {
                 'statusCode': 200,
                 'body': json.dumps('Event not applicable for notification')
             }
 
+    except DuplicateInFlight:
+        # 정상 반환한 비동기 호출은 재시도되지 않으므로 예외를 올려 Lambda 비동기 재시도(1분 / 2분 후)로 다시 받음
+        # 앞선 호출이 전송에 실패했으면 pending 선점(DEDUP_PENDING_SECONDS)이 만료된 뒤의 재시도가 전송함
+        log.warning('Event is being delivered by another invocation, raising for retry', event_id=event.get('id'))
+        raise
+
     except Exception as e:
-        print(f"Error processing event: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception('Failed to process event', event=summarize_event(event), error=str(e))
 
         return {
             'statusCode': 500,
             'body': json.dumps(f'Error: {str(e)}')
         }
+
+
+def lambda_handler(event, context):
+    """
+    Lambda 핸들러 함수
+    - 단일 EventBridge 이벤트
+    - SQS 배치 (EventBridge 이벤트가 body에 담긴 레코드 목록) / 이벤트 목록
+    """
+    log.bind(request_id=getattr(context, 'aws_request_id', None))
+    try:
+        return handle_event(event, context)
+    finally:
+        lambda_runtime.record_cold_start(metrics)
+        log.record_stats(metrics)
+        metrics.flush()
@@ -0,0 +1,10 @@
+"""
+테스트에서 핸들러 모듈과 lambda-common 모듈을 import 할 수 있도록 경로를 추가합니다.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'lambda-common'))
@@ -0,0 +1,73 @@
+"""
+dedup 테스트 (InMemoryDedupStore, 시각은 now 인자로 고정)
+"""
+
+import pytest
+
+from dedup import STATUS_PENDING, STATUS_SENT, Deduplicator, DuplicateInFlight, InMemoryDedupStore
+
+
+def _message(ts):
+    return {'attachments': [{'title': 'Deploy COMPLETED', 'ts': ts}]}
+
+
+def test_claim_pending_sent_expired():
+    store = InMemoryDedupStore()
+    dedup = Deduplicator(store, window_seconds=3600, pending_seconds=60)
+    event = {'id': 'evt-1'}
+
+    send, reason, keys = dedup.acquire(event, _message(1), now=1000)
+    assert (send, reason, keys) == (True, None, ['id#evt-1'])
+    assert store._entries['id#evt-1'] == (STATUS_PENDING, 1060)
+
+    dedup.confirm(keys, now=1001)
+    assert store._entries['id#evt-1'] == (STATUS_SENT, 4601)
+
+    # pending TTL이 지나도 sent는 window 동안 유지
+    assert dedup.acquire(event, _message(2), now=2000) == (False, 'event_id', [])
+
+    # window가 지나면 다시 전송
+    assert dedup.acquire(event, _message(3), now=4602) == (True, None, ['id#evt-1'])
+
+
+def test_duplicate_in_flight_until_pending_expires():
+    dedup = Deduplicator(InMemoryDedupStore(), window_seconds=3600, pending_seconds=60)
+    event = {'id': 'evt-1'}
+    dedup.acquire(event, _message(1), now=1000)
+
+    with pytest.raises(DuplicateInFlight):
+        dedup.acquire(event, _message(1), now=1059)
+
+    # 앞선 호출이 확정하지 못하고 중단되면 pending TTL 뒤에 재전달이 다시 선점
+    assert dedup.acquire(event, _message(1), now=1061)[0]
+
+
+def test_release_allows_retry():
+    dedup = Deduplicator(InMemoryDedupStore(), window_seconds=3600)
+    event = {'id': 'evt-1'}
+    _, _, keys = dedup.acquire(event, _message(1), now=1000)
+
+    dedup.release(keys)
+
+    assert dedup.acquire(event, _message(1), now=1001)[0]
+
+
+def test_fingerprint_is_opt_in_and_ignores_ts():
+    dedup = Deduplicator(InMemoryDedupStore(), window_seconds=3600)
+    _, _, keys = dedup.acquire({'id': 'evt-1'}, _message(1), fingerprint=True, now=1000)
+    dedup.confirm(keys, now=1000)
+
+    # 다른 이벤트 id, 같은 내용 (ts만 다름)
+    assert dedup.acquire({'id': 'evt-2'}, _message(2), fingerprint=True, now=1010) == (False, 'fingerprint', [])
+    assert dedup.acquire({'id': 'evt-3'}, _message(3), now=1010)[0]
+
+
+def test_failed_fingerprint_claim_releases_event_id():
+    store = InMemoryDedupStore()
+    dedup = Deduplicator(store, window_seconds=3600)
+    _, _, keys = dedup.acquire({'id': 'evt-1'}, _message(1), fingerprint=True, now=1000)
+    dedup.confirm(keys, now=1000)
+
+    dedup.acquire({'id': 'evt-2'}, _message(2), fingerprint=True, now=1010)
+
+    assert 'id#evt-2' not in store._entries
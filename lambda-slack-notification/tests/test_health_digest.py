@@ -0,0 +1,78 @@
+"""
+health_digest 테스트 (InMemoryDigestStore, 시각은 now 인자로 고정)
+"""
+
+from health_digest import HealthDigest, InMemoryDigestStore, window_bounds
+
+TG = 'web-tg'
+
+
+def _digest():
+    return HealthDigest(InMemoryDigestStore(), window_seconds=60, grace_seconds=5)
+
+
+def test_window_bounds():
+    assert window_bounds(120, 60) == (120, 180)
+    assert window_bounds(179.9, 60) == (120, 180)
+    assert window_bounds(180, 60) == (180, 240)
+
+
+def test_late_event_within_grace_is_recorded():
+    digest = _digest()
+
+    assert digest.add(TG, 'i-1', 'unhealthy', 'Target.Timeout', event_time=170, now=184)
+    assert digest.claim_closed(now=184) == []
+    assert digest.claim_closed(now=185) == [(TG, 120, 180)]
+
+
+def test_late_event_after_grace_is_dropped():
+    digest = _digest()
+    digest.add(TG, 'i-1', 'unhealthy', 'Target.Timeout', event_time=130, now=131)
+    window = digest.claim_closed(now=185)[0]
+
+    assert not digest.add(TG, 'i-1', 'healthy', '', event_time=175, now=185)
+    assert digest.load(window)['i-1']['state'] == 'unhealthy'
+    # 닫힌 윈도우가 다시 열리지 않음
+    assert digest.claim_closed(now=300) == []
+
+
+def test_transitions_count_state_changes_only():
+    digest = _digest()
+    events = [
+        (121, 'unhealthy'),
+        (122, 'unhealthy'),  # 같은 상태 반복
+        (122, 'unhealthy'),  # 중복 전달
+        (130, 'healthy'),
+        (140, 'unhealthy'),
+        (125, 'healthy'),    # 순서가 뒤바뀐 이벤트 (최종 상태와 달라 셈)
+    ]
+    for event_time, state in events:
+        digest.add(TG, 'i-1', state, '', event_time=event_time, now=event_time)
+
+    entry = digest.load((TG, 120, 180))['i-1']
+    assert entry['state'] == 'unhealthy'
+    assert entry['last_time'] == 140
+    assert entry['transitions'] == 3
+
+
+def test_released_window_is_claimed_again():
+    digest = _digest()
+    digest.add(TG, 'i-1', 'unhealthy', '', event_time=130, now=130)
+    window = digest.claim_closed(now=200)[0]
+
+    digest.release(window)
+
+    assert digest.claim_closed(now=201) == [window]
+
+
+def test_complete_clears_targets():
+    store = InMemoryDigestStore()
+    digest = HealthDigest(store, window_seconds=60, grace_seconds=5)
+    digest.add(TG, 'i-1', 'unhealthy', '', event_time=130, now=130)
+    digest.add(TG, 'i-2', 'unhealthy', '', event_time=190, now=190)
+    window = digest.claim_closed(now=200)[0]
+
+    digest.complete(window)
+
+    assert digest.load(window) == {}
+    assert list(store._targets) == [(TG, 180)]
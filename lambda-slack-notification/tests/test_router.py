@@ -0,0 +1,69 @@
+"""
+router 테스트 (시각은 now 인자로 고정)
+"""
+
+import pytest
+
+from router import (POLICY_DIGEST, POLICY_RATE_LIMITED, POLICY_SAMPLED, RateLimiter, Route, Router,
+                    sampled_in)
+
+
+def _formatter(event):
+    return {'text': event.get('detail-type', '')}
+
+
+def test_rate_limiter_allows_limit_per_window():
+    limiter = RateLimiter(limit=2, window_seconds=60)
+
+    assert limiter.allow('svc', now=120.0)
+    assert limiter.allow('svc', now=130.0)
+    assert not limiter.allow('svc', now=179.9)
+    # 다른 키는 따로 센다
+    assert limiter.allow('other', now=179.9)
+    # 다음 윈도우에서 초기화
+    assert limiter.allow('svc', now=180.0)
+
+
+def test_sampled_in_is_deterministic_per_event_id():
+    events = [{'id': f"evt-{i}"} for i in range(1000)]
+    first = [sampled_in(event, 0.3) for event in events]
+
+    assert first == [sampled_in(event, 0.3) for event in events]
+    assert 200 < sum(first) < 400
+    assert all(sampled_in(event, 1) for event in events)
+    assert not any(sampled_in(event, 0) for event in events)
+
+
+def test_router_returns_first_matching_route_in_order():
+    ecs_failed = Route('ecs-failed', 'aws.ecs', _formatter, detail_type='ECS Task State Change',
+                       predicate=lambda e: e['detail'].get('lastStatus') == 'STOPPED')
+    ecs_any = Route('ecs-any', 'aws.ecs', _formatter, detail_type_contains='ECS')
+    router = Router([ecs_failed, ecs_any])
+
+    stopped = {'source': 'aws.ecs', 'detail-type': 'ECS Task State Change', 'detail': {'lastStatus': 'STOPPED'}}
+    running = {'source': 'aws.ecs', 'detail-type': 'ECS Task State Change', 'detail': {'lastStatus': 'RUNNING'}}
+
+    assert router.match(stopped) is ecs_failed
+    assert router.match(running) is ecs_any
+    assert router.match({'source': 'aws.rds', 'detail-type': 'ECS'}) is None
+
+
+def test_route_admit_applies_policy():
+    limited = Route('limited', 'aws.ecs', _formatter, policy=POLICY_RATE_LIMITED,
+                    rate_limiter=RateLimiter(limit=1, window_seconds=3600),
+                    key=lambda e: e['detail']['service'])
+    event = {'id': 'a', 'detail': {'service': 'web'}}
+
+    assert limited.admit(event) == (True, None)
+    assert limited.admit(event) == (False, 'rate_limited')
+    assert limited.admit({'id': 'b', 'detail': {'service': 'api'}}) == (True, None)
+
+    never = Route('never', 'aws.ecs', _formatter, policy=POLICY_SAMPLED, sample_rate=0)
+    assert never.admit(event) == (False, 'sampled')
+
+
+def test_route_requires_policy_dependencies():
+    with pytest.raises(ValueError):
+        Route('bad', 'aws.ecs', _formatter, policy=POLICY_RATE_LIMITED)
+    with pytest.raises(ValueError):
+        Route('bad', 'aws.ecs', _formatter, policy=POLICY_DIGEST)
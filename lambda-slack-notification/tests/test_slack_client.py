@@ -0,0 +1,152 @@
+"""
+slack_client 테스트 (로컬 HTTP 서버, sleep 주입)
+"""
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from slack_client import SlackClient, SlackConnectError, SlackDeadlineExceeded, SlackDeliveryError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.requests += 1
+        status, headers = self.server.responses.pop(0)
+        # Connection 헤더 없이 응답한 뒤 서버 쪽에서 연결을 닫음 (keep-alive 연결이 쉬는 동안 끊긴 상황)
+        self.close_connection = headers.pop('_close', False)
+        if status is None:
+            # 요청을 받은 뒤 응답 없이 연결을 끊음
+            self.close_connection = True
+            return
+        body = b'ok' if status == 200 else b'error'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.requests = 0
+    httpd.responses = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(httpd):
+    return f"http://127.0.0.1:{httpd.server_address[1]}/hook"
+
+
+def _client(sleeps, **kwargs):
+    return SlackClient(timeout=2.0, backoff_base=0.1, sleep=sleeps.append, **kwargs)
+
+
+def test_retries_server_error_then_succeeds(server):
+    server.responses = [(500, {}), (200, {})]
+    sleeps = []
+
+    result = _client(sleeps).post(_url(server), {'text': 'hi'})
+
+    assert result.status == 200
+    assert result.attempts == 2
+    assert result.retries == {'server_error': 1}
+    assert len(sleeps) == 1
+
+
+def test_rate_limited_waits_retry_after(server):
+    server.responses = [(429, {'Retry-After': '3'}), (200, {})]
+    sleeps = []
+
+    result = _client(sleeps).post(_url(server), {'text': 'hi'})
+
+    assert result.status == 200
+    assert sleeps == [3.0]
+    assert result.retries == {'rate_limited': 1}
+
+
+def test_retry_after_beyond_deadline_gives_up(server):
+    server.responses = [(429, {'Retry-After': '30'})]
+    sleeps = []
+
+    with pytest.raises(SlackDeliveryError) as excinfo:
+        _client(sleeps, retry_budget=60).post(_url(server), {'text': 'hi'}, deadline=time.monotonic() + 5)
+
+    assert excinfo.value.code == 429
+    assert excinfo.value.attempts == 1
+    assert sleeps == []
+
+
+def test_deadline_exceeded_before_first_attempt(server):
+    sleeps = []
+
+    with pytest.raises(SlackDeadlineExceeded):
+        _client(sleeps).post(_url(server), {'text': 'hi'}, deadline=time.monotonic() + 0.5)
+
+    assert server.requests == 0
+
+
+def test_client_error_is_not_retried(server):
+    server.responses = [(400, {})]
+    sleeps = []
+
+    with pytest.raises(SlackDeliveryError) as excinfo:
+        _client(sleeps).post(_url(server), {'text': 'hi'})
+
+    assert excinfo.value.code == 400
+    assert server.requests == 1
+    assert sleeps == []
+
+
+def test_connect_error_is_retried():
+    # 아무도 listen 하지 않는 포트
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    sleeps = []
+
+    with pytest.raises(SlackConnectError):
+        _client(sleeps, max_attempts=3).post(f"http://127.0.0.1:{port}/hook", {'text': 'hi'})
+
+    assert len(sleeps) == 2
+
+
+def test_error_after_request_sent_is_not_retried(server):
+    server.responses = [(None, {}), (200, {})]
+    sleeps = []
+
+    with pytest.raises(ConnectionError):
+        _client(sleeps).post(_url(server), {'text': 'hi'})
+
+    assert server.requests == 1
+    assert sleeps == []
+
+
+def test_reconnects_when_idle_connection_was_closed(server):
+    server.responses = [(200, {'_close': True}), (200, {})]
+    sleeps = []
+    client = _client(sleeps)
+    client.post(_url(server), {'text': 'first'})
+    time.sleep(0.1)
+
+    result = client.post(_url(server), {'text': 'second'})
+    assert result.status == 200
+    assert result.attempts == 1
+    assert server.requests == 2
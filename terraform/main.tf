@@ -75,6 +75,7 @@ module "alb" {
   public_subnet_ids  = module.vpc.public_subnet_ids
   security_group_ids = [module.security_groups.alb_sg_id]
   container_port     = var.container_port
+  health_check_path  = var.health_check_path
   blue_weight        = var.blue_weight
   green_weight       = var.green_weight
 }
@@ -159,5 +160,8 @@ module "slack_notification" {
   ecs_cluster_arn                 = module.ecs.cluster_arn
   slack_webhook_parameter_name    = var.slack_webhook_parameter_name
   enable_alb_health_notifications = var.enable_alb_health_notifications
+  enable_event_batching           = var.enable_notification_batching
+  enable_health_digest            = var.enable_health_digest
+  enable_task_notifications       = var.enable_task_notifications
   target_group_arns               = var.enable_alb_health_notifications ? [module.alb.blue_target_group_arn, module.alb.green_target_group_arn] : []
 }
\ No newline at end of file
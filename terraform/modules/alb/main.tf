@@ -86,7 +86,7 @@ resource "aws_lb_target_group" "blue" {
     unhealthy_threshold = 3
     timeout             = 5
     interval            = 30
-    path                = "/health"
+    path                = var.health_check_path
     protocol            = "HTTP"
     matcher             = "200"
   }
@@ -115,7 +115,7 @@ resource "aws_lb_target_group" "green" {
     unhealthy_threshold = 3
     timeout             = 5
     interval            = 30
-    path                = "/health"
+    path                = var.health_check_path
     protocol            = "HTTP"
     matcher             = "200"
   }
@@ -29,6 +29,12 @@ variable "container_port" {
   default     = 3000
 }
 
+variable "health_check_path" {
+  description = "Target group health check path (use the readiness endpoint so new tasks get traffic only after warm-up)"
+  type        = string
+  default     = "/health"
+}
+
 variable "blue_weight" {
   description = "Traffic weight for blue target group (0-100)"
   type        = number
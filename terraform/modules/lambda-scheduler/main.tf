@@ -44,13 +44,6 @@ resource "aws_iam_role_policy" "lambda_ecs" {
           "ecs:ListServices"
         ]
         Resource = "*"
-      },
-      {
-        Effect = "Allow"
-        Action = [
-          "cloudwatch:PutMetricData"
-        ]
-        Resource = "*"
       }
     ]
   })
@@ -1,8 +1,48 @@
 # Lambda 함수 패키징을 위한 데이터 소스
+# 핸들러와 필요한 공통 모듈(lambda-common)만 ZIP 루트에 포함
 data "archive_file" "lambda_package" {
   type        = "zip"
-  source_file = "${path.module}/../../../lambda-slack-notification/slack_notification.py"
   output_path = "${path.module}/../../../lambda-slack-notification/slack_notification.zip"
+
+  source {
+    content  = file("${path.module}/../../../lambda-slack-notification/slack_notification.py")
+    filename = "slack_notification.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-slack-notification/health_digest.py")
+    filename = "health_digest.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-slack-notification/dedup.py")
+    filename = "dedup.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-slack-notification/slack_client.py")
+    filename = "slack_client.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-slack-notification/router.py")
+    filename = "router.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-common/lambda_runtime.py")
+    filename = "lambda_runtime.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-common/emf_metrics.py")
+    filename = "emf_metrics.py"
+  }
+
+  source {
+    content  = file("${path.module}/../../../lambda-common/structured_log.py")
+    filename = "structured_log.py"
+  }
 }
 
 # Lambda 실행 역할
@@ -69,6 +109,126 @@ resource "aws_iam_role_policy" "parameter_store_access" {
   })
 }
 
+# SQS 접근 정책 (이벤트 배칭 활성화 시)
+resource "aws_iam_role_policy" "sqs_access" {
+  count = var.enable_event_batching ? 1 : 0
+  name  = "${var.project_name}-${var.environment}-slack-notification-sqs-access"
+  role  = aws_iam_role.slack_notification_lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = aws_sqs_queue.notification_events[0].arn
+      }
+    ]
+  })
+}
+
+# 타겟 헬스 다이제스트 저장소 (윈도우별 타겟 상태 집계)
+resource "aws_dynamodb_table" "health_digest" {
+  count        = var.enable_health_digest ? 1 : 0
+  name         = "${var.project_name}-${var.environment}-slack-health-digest"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "pk"
+  range_key    = "sk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "sk"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-slack-health-digest"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+# 다이제스트 테이블 접근 정책
+resource "aws_iam_role_policy" "health_digest_access" {
+  count = var.enable_health_digest ? 1 : 0
+  name  = "${var.project_name}-${var.environment}-slack-health-digest-access"
+  role  = aws_iam_role.slack_notification_lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:UpdateItem",
+          "dynamodb:PutItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query"
+        ]
+        Resource = aws_dynamodb_table.health_digest[0].arn
+      }
+    ]
+  })
+}
+
+# 중복 알림 억제 저장소 (이벤트 id / 내용 지문, TTL로 자동 만료)
+resource "aws_dynamodb_table" "dedup" {
+  count        = var.enable_dedup_table ? 1 : 0
+  name         = "${var.project_name}-${var.environment}-slack-notification-dedup"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "pk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-slack-notification-dedup"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+# 중복 억제 테이블 접근 정책
+resource "aws_iam_role_policy" "dedup_access" {
+  count = var.enable_dedup_table ? 1 : 0
+  name  = "${var.project_name}-${var.environment}-slack-notification-dedup-access"
+  role  = aws_iam_role.slack_notification_lambda.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:PutItem",
+          "dynamodb:DeleteItem"
+        ]
+        Resource = aws_dynamodb_table.dedup[0].arn
+      }
+    ]
+  })
+}
+
 # Lambda 함수
 resource "aws_lambda_function" "slack_notification" {
   filename         = data.archive_file.lambda_package.output_path
@@ -83,7 +243,21 @@ resource "aws_lambda_function" "slack_notification" {
   environment {
     variables = {
       SLACK_WEBHOOK_PARAMETER = var.slack_webhook_parameter_name
+      SLACK_WEBHOOK_CACHE_TTL = tostring(var.slack_webhook_cache_ttl)
       ENVIRONMENT             = var.environment
+
+      HEALTH_DIGEST_WINDOW_SECONDS = var.enable_health_digest ? tostring(var.health_digest_window_seconds) : "0"
+      HEALTH_DIGEST_TABLE          = var.enable_health_digest ? aws_dynamodb_table.health_digest[0].name : ""
+
+      DEDUP_WINDOW_SECONDS         = tostring(var.dedup_window_seconds)
+      DEDUP_TABLE                  = var.enable_dedup_table ? aws_dynamodb_table.dedup[0].name : ""
+      DEDUP_PENDING_SECONDS        = tostring(var.dedup_pending_seconds)
+      DEDUP_DEPLOYMENT_FINGERPRINT = tostring(var.dedup_deployment_fingerprint)
+
+      TASK_FAILURE_RATE_LIMIT   = tostring(var.task_failure_rate_limit)
+      TASK_EVENT_SAMPLE_RATE    = tostring(var.task_event_sample_rate)
+      SERVICE_EVENT_RATE_LIMIT  = tostring(var.service_event_rate_limit)
+      EVENT_RATE_WINDOW_SECONDS = tostring(var.event_rate_window_seconds)
     }
   }
 
@@ -106,6 +280,82 @@ resource "aws_cloudwatch_log_group" "slack_notification" {
   }
 }
 
+# 이벤트 배칭: EventBridge → SQS → Lambda (배치 단위 호출, 실패한 레코드만 재시도)
+resource "aws_sqs_queue" "notification_events_dlq" {
+  count                     = var.enable_event_batching ? 1 : 0
+  name                      = "${var.project_name}-${var.environment}-slack-notification-dlq"
+  message_retention_seconds = 1209600  # 14일
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-slack-notification-dlq"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+resource "aws_sqs_queue" "notification_events" {
+  count                      = var.enable_event_batching ? 1 : 0
+  name                       = "${var.project_name}-${var.environment}-slack-notification-events"
+  # AWS 권장: 함수 타임아웃의 6배 이상 (처리 중인 배치가 타임아웃 전에 다시 보이지 않도록)
+  visibility_timeout_seconds = aws_lambda_function.slack_notification.timeout * 6
+  message_retention_seconds  = 86400  # 1일
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.notification_events_dlq[0].arn
+    maxReceiveCount     = 3
+  })
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-slack-notification-events"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+# SQS 큐 정책: EventBridge 규칙에서만 메시지 전송 허용
+resource "aws_sqs_queue_policy" "notification_events" {
+  count     = var.enable_event_batching ? 1 : 0
+  queue_url = aws_sqs_queue.notification_events[0].id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect    = "Allow"
+        Principal = { Service = "events.amazonaws.com" }
+        Action    = "sqs:SendMessage"
+        Resource  = aws_sqs_queue.notification_events[0].arn
+        Condition = {
+          ArnEquals = {
+            "aws:SourceArn" = compact([
+              aws_cloudwatch_event_rule.ecs_deployment_state_change.arn,
+              var.enable_alb_health_notifications ? aws_cloudwatch_event_rule.alb_target_health[0].arn : "",
+              var.enable_task_notifications ? aws_cloudwatch_event_rule.ecs_task_state_change[0].arn : "",
+              var.enable_task_notifications ? aws_cloudwatch_event_rule.ecs_service_action[0].arn : ""
+            ])
+          }
+        }
+      }
+    ]
+  })
+}
+
+resource "aws_lambda_event_source_mapping" "notification_events" {
+  count                              = var.enable_event_batching ? 1 : 0
+  event_source_arn                   = aws_sqs_queue.notification_events[0].arn
+  function_name                      = aws_lambda_function.slack_notification.arn
+  batch_size                         = var.event_batch_size
+  maximum_batching_window_in_seconds = var.event_batch_window_seconds
+  function_response_types            = ["ReportBatchItemFailures"]
+
+  depends_on = [aws_iam_role_policy.sqs_access]
+}
+
+locals {
+  # 배칭 활성화 시 EventBridge 규칙은 SQS로, 아니면 Lambda를 직접 호출
+  event_target_arn = var.enable_event_batching ? aws_sqs_queue.notification_events[0].arn : aws_lambda_function.slack_notification.arn
+}
+
 # EventBridge 규칙: ECS Deployment State Change (COMPLETED/FAILED만)
 resource "aws_cloudwatch_event_rule" "ecs_deployment_state_change" {
   name        = "${var.project_name}-${var.environment}-ecs-deployment-state-change"
@@ -131,7 +381,7 @@ resource "aws_cloudwatch_event_rule" "ecs_deployment_state_change" {
 resource "aws_cloudwatch_event_target" "ecs_deployment_state_change" {
   rule      = aws_cloudwatch_event_rule.ecs_deployment_state_change.name
   target_id = "slack-notification-lambda"
-  arn       = aws_lambda_function.slack_notification.arn
+  arn       = local.event_target_arn
 }
 
 # Lambda 권한: Deployment State Change EventBridge
@@ -169,7 +419,7 @@ resource "aws_cloudwatch_event_target" "alb_target_health" {
   count     = var.enable_alb_health_notifications ? 1 : 0
   rule      = aws_cloudwatch_event_rule.alb_target_health[0].name
   target_id = "slack-notification-lambda"
-  arn       = aws_lambda_function.slack_notification.arn
+  arn       = local.event_target_arn
 }
 
 # Lambda 권한: ALB Target Health EventBridge
@@ -181,3 +431,110 @@ resource "aws_lambda_permission" "allow_eventbridge_alb_health" {
   principal     = "events.amazonaws.com"
   source_arn    = aws_cloudwatch_event_rule.alb_target_health[0].arn
 }
+
+# EventBridge 규칙: ECS Task State Change (선택적)
+# 목표 상태에 도달한 전환만 전달하고, 서비스별 전송량 제한은 Lambda 라우터에서 적용
+resource "aws_cloudwatch_event_rule" "ecs_task_state_change" {
+  count       = var.enable_task_notifications ? 1 : 0
+  name        = "${var.project_name}-${var.environment}-ecs-task-state-change"
+  description = "Capture ECS task stops (and running transitions when sampled)"
+
+  event_pattern = jsonencode({
+    source      = ["aws.ecs"]
+    detail-type = ["ECS Task State Change"]
+    detail = {
+      clusterArn = [var.ecs_cluster_arn]
+      lastStatus = var.task_event_sample_rate > 0 ? ["RUNNING", "STOPPED"] : ["STOPPED"]
+    }
+  })
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-ecs-task-state"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+resource "aws_cloudwatch_event_target" "ecs_task_state_change" {
+  count     = var.enable_task_notifications ? 1 : 0
+  rule      = aws_cloudwatch_event_rule.ecs_task_state_change[0].name
+  target_id = "slack-notification-lambda"
+  arn       = local.event_target_arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_task_state" {
+  count         = var.enable_task_notifications ? 1 : 0
+  statement_id  = "AllowExecutionFromEventBridgeTaskState"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.slack_notification.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.ecs_task_state_change[0].arn
+}
+
+# EventBridge 규칙: ECS Service Action WARN / ERROR (선택적)
+resource "aws_cloudwatch_event_rule" "ecs_service_action" {
+  count       = var.enable_task_notifications ? 1 : 0
+  name        = "${var.project_name}-${var.environment}-ecs-service-action"
+  description = "Capture ECS service warning and error events"
+
+  event_pattern = jsonencode({
+    source      = ["aws.ecs"]
+    detail-type = ["ECS Service Action"]
+    detail = {
+      clusterArn = [var.ecs_cluster_arn]
+      eventType  = ["WARN", "ERROR"]
+    }
+  })
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-ecs-service-action"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+resource "aws_cloudwatch_event_target" "ecs_service_action" {
+  count     = var.enable_task_notifications ? 1 : 0
+  rule      = aws_cloudwatch_event_rule.ecs_service_action[0].name
+  target_id = "slack-notification-lambda"
+  arn       = local.event_target_arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_service_action" {
+  count         = var.enable_task_notifications ? 1 : 0
+  statement_id  = "AllowExecutionFromEventBridgeServiceAction"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.slack_notification.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.ecs_service_action[0].arn
+}
+
+# EventBridge 규칙: 다이제스트 flush (닫힌 윈도우를 주기적으로 전송)
+resource "aws_cloudwatch_event_rule" "health_digest_flush" {
+  count               = var.enable_health_digest ? 1 : 0
+  name                = "${var.project_name}-${var.environment}-slack-health-digest-flush"
+  description         = "Flush closed target health digest windows"
+  schedule_expression = "rate(1 minute)"
+
+  tags = {
+    Name        = "${var.project_name}-${var.environment}-slack-health-digest-flush"
+    Environment = var.environment
+    Project     = var.project_name
+  }
+}
+
+resource "aws_cloudwatch_event_target" "health_digest_flush" {
+  count     = var.enable_health_digest ? 1 : 0
+  rule      = aws_cloudwatch_event_rule.health_digest_flush[0].name
+  target_id = "slack-notification-lambda"
+  arn       = aws_lambda_function.slack_notification.arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_health_digest_flush" {
+  count         = var.enable_health_digest ? 1 : 0
+  statement_id  = "AllowExecutionFromEventBridgeHealthDigestFlush"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.slack_notification.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.health_digest_flush[0].arn
+}
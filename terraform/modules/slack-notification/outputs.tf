@@ -21,6 +21,11 @@ output "eventbridge_rules" {
   }
 }
 
+output "event_queue_url" {
+  description = "이벤트 배칭용 SQS 큐 URL (배칭 비활성화 시 null)"
+  value       = var.enable_event_batching ? aws_sqs_queue.notification_events[0].url : null
+}
+
 output "parameter_store_name" {
   description = "Slack Webhook URL Parameter Store 경로"
   value       = var.slack_webhook_parameter_name
@@ -24,6 +24,12 @@ variable "slack_webhook_parameter_name" {
   default     = "/chatapp/slack/webhook-url"
 }
 
+variable "slack_webhook_cache_ttl" {
+  description = "Slack Webhook URL 캐시 유지 시간 (초, warm 호출 간 Parameter Store 조회 생략)"
+  type        = number
+  default     = 300
+}
+
 variable "enable_alb_health_notifications" {
   description = "ALB 타겟 헬스 알림 활성화 여부"
   type        = bool
@@ -35,3 +41,92 @@ variable "target_group_arns" {
   type        = list(string)
   default     = []
 }
+
+variable "enable_event_batching" {
+  description = "EventBridge 이벤트를 SQS에 모아서 Lambda를 배치로 호출할지 여부"
+  type        = bool
+  default     = false
+}
+
+variable "event_batch_size" {
+  description = "Lambda 호출당 최대 SQS 레코드 수 (이벤트 배칭 활성화 시). 레코드를 순차 전송하므로 함수 타임아웃 안에 끝날 만큼만 지정"
+  type        = number
+  default     = 10
+
+  validation {
+    condition     = var.event_batch_size >= 1 && var.event_batch_size <= 25
+    error_message = "event_batch_size는 1~25 사이여야 합니다 (Slack 전송이 순차적이라 함수 타임아웃 안에 처리 가능한 크기)."
+  }
+}
+
+variable "event_batch_window_seconds" {
+  description = "배치를 모으기 위해 대기하는 최대 시간 (초, 이벤트 배칭 활성화 시)"
+  type        = number
+  default     = 10
+}
+
+variable "enable_health_digest" {
+  description = "ALB 타겟 헬스 이벤트를 윈도우 단위로 모아 다이제스트로 알릴지 여부 (DynamoDB 테이블 생성)"
+  type        = bool
+  default     = false
+}
+
+variable "health_digest_window_seconds" {
+  description = "타겟 헬스 다이제스트 집계 윈도우 (초)"
+  type        = number
+  default     = 60
+}
+
+variable "enable_dedup_table" {
+  description = "중복 알림 억제를 DynamoDB 테이블로 공유할지 여부 (비활성화 시 Lambda 컨테이너 메모리 사용)"
+  type        = bool
+  default     = false
+}
+
+variable "dedup_window_seconds" {
+  description = "같은 EventBridge 이벤트 id의 알림을 억제하는 시간 (초, 0 = 비활성화)"
+  type        = number
+  default     = 600
+}
+
+variable "dedup_pending_seconds" {
+  description = "전송 중(pending) 선점 유지 시간 (초, Lambda 타임아웃보다 길고 SQS visibility timeout보다 짧게)"
+  type        = number
+  default     = 60
+}
+
+variable "dedup_deployment_fingerprint" {
+  description = "배포 COMPLETED / FAILED 메시지는 이벤트 id가 달라도 내용이 같으면 한 번만 전송할지 여부"
+  type        = bool
+  default     = false
+}
+
+variable "enable_task_notifications" {
+  description = "ECS Task 비정상 종료 / Service WARN·ERROR 이벤트 알림 활성화 여부"
+  type        = bool
+  default     = false
+}
+
+variable "task_failure_rate_limit" {
+  description = "서비스별로 윈도우당 전송할 최대 태스크 실패 알림 수"
+  type        = number
+  default     = 3
+}
+
+variable "task_event_sample_rate" {
+  description = "정상 태스크 RUNNING / STOPPED 전환 알림 샘플링 비율 (0 = 전송 안 함, 1 = 전부)"
+  type        = number
+  default     = 0
+}
+
+variable "service_event_rate_limit" {
+  description = "서비스별로 윈도우당 전송할 최대 ECS Service Action 알림 수"
+  type        = number
+  default     = 3
+}
+
+variable "event_rate_window_seconds" {
+  description = "Task / Service 알림 전송량 제한 윈도우 (초)"
+  type        = number
+  default     = 300
+}
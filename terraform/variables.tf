@@ -54,6 +54,12 @@ variable "container_port" {
   default     = 3000
 }
 
+variable "health_check_path" {
+  description = "ALB 타겟 그룹 헬스 체크 경로 (test-app은 워밍업 후 200을 반환하는 /ready 사용 가능)"
+  type        = string
+  default     = "/health"
+}
+
 variable "fargate_cpu" {
   description = "Fargate CPU 유닛"
   type        = number
@@ -161,3 +167,21 @@ variable "enable_alb_health_notifications" {
   type        = bool
   default     = false
 }
+
+variable "enable_health_digest" {
+  description = "ALB 타겟 헬스 알림을 윈도우 단위 다이제스트로 묶어서 전송 (옵션)"
+  type        = bool
+  default     = false
+}
+
+variable "enable_task_notifications" {
+  description = "ECS 태스크 비정상 종료 / 서비스 경고 이벤트를 Slack으로 알림 (서비스별 전송량 제한, 옵션)"
+  type        = bool
+  default     = false
+}
+
+variable "enable_notification_batching" {
+  description = "Slack 알림 이벤트를 SQS로 모아 배치 처리 (배포 시 Lambda 호출 수 감소, 옵션)"
+  type        = bool
+  default     = false
+}
@@ -6,38 +6,169 @@
 - NAT Gateway를 통한 외부 API 호출 테스트
 """
 
+import logging
 import os
+import threading
 import time
 import json
 from datetime import datetime
-from flask import Flask, jsonify
-import boto3
-import redis
+from flask import Flask, jsonify, has_request_context, request
 import requests
 
+from dynamodb_access import DynamoDBAccess
+from redis_shards import ShardedRedis
+from tracing import Tracer, init_flask, instrument_boto_client, instrument_redis, instrument_requests
+
 app = Flask(__name__)
 
+# 로그 레벨 (LOG_LEVEL, 기본 INFO)
+# gunicorn으로 실행하면 gunicorn 에러 로그와 같은 핸들러/형식(시각, pid, 레벨)으로 출력
+_gunicorn_logger = logging.getLogger('gunicorn.error')
+if _gunicorn_logger.handlers:
+    app.logger.handlers = _gunicorn_logger.handlers
+app.logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+# 요청 트레이싱 (TRACE_EXPORT 지정 시 X-Ray 세그먼트 형식으로 내보냄)
+tracer = Tracer.from_env()
+init_flask(app, tracer)
+instrument_requests(tracer)
+
 # 환경 변수
 REDIS_HOST = os.environ.get('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.environ.get('REDIS_PORT', 6379))
 DYNAMODB_TABLE_NAME = os.environ.get('DYNAMODB_TABLE_NAME', 'test-table')
 AWS_REGION = os.environ.get('AWS_REGION', 'ap-northeast-1')
 
-# AWS 클라이언트
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
-table = dynamodb.Table(DYNAMODB_TABLE_NAME)
+# 워밍업 설정
+# - REDIS_WARMUP_CONNECTIONS: 워커 시작 시 노드별로 미리 열어 둘 Redis 연결 수
+# - READINESS_REQUIRE_DEPENDENCIES: true(기본)면 워밍업 중 실패한 의존성이 있을 때 ready로 보고하지 않음
+#   false면 의존성 실패와 관계없이 워밍업 시도가 끝나면 ready (Redis 없이 띄우는 로컬 테스트용)
+REDIS_WARMUP_CONNECTIONS = int(os.environ.get('REDIS_WARMUP_CONNECTIONS', '4'))
+READINESS_REQUIRE_DEPENDENCIES = os.environ.get('READINESS_REQUIRE_DEPENDENCIES', 'true').lower() == 'true'
+
+# 클라이언트 초기화 시점
+# - APP_INIT_IN_POST_FORK: true면 import 시 클라이언트를 만들지 않고 gunicorn post_fork 훅에서 init_worker() 호출
+#   (preload_app으로 마스터에서 import한 모듈은 공유하되, 소켓/커넥션 풀은 워커마다 따로 생성)
+APP_INIT_IN_POST_FORK = os.environ.get('APP_INIT_IN_POST_FORK', 'false').lower() == 'true'
+
+# DynamoDB 접근 계층 (재시도 모드 / 클라이언트 측 속도 제한 / 라우트별 사용량 집계)
+dynamodb = None
 
-# Redis 클라이언트
+# Redis 클라이언트 (REDIS_NODES가 있으면 여러 노드에 consistent hashing으로 분산)
 redis_client = None
-try:
-    redis_client = redis.Redis(
-        host=REDIS_HOST,
-        port=REDIS_PORT,
-        decode_responses=True,
-        socket_connect_timeout=5
+
+# 워밍업 상태 (워커 프로세스마다 한 번)
+# 워커는 자기 자신의 워밍업 결과만 알 수 있으므로 /ready는 요청을 받은 워커의 상태만 보고함
+warmup_done = threading.Event()
+warmup_state = {
+    "pid": None,
+    "started_at": None,
+    "duration_ms": None,
+    "steps": {}
+}
+_warmup_lock = threading.Lock()
+
+
+def _reset_warm_up_after_fork():
+    """
+    fork된 워커가 마스터의 워밍업 상태를 물려받지 않도록 초기화합니다.
+    (preload 시 마스터에서 워밍업이 실행됐더라도 워커의 연결은 따로 열어야 함)
+    """
+    global warmup_done, _warmup_lock
+    warmup_done = threading.Event()
+    _warmup_lock = threading.Lock()
+    warmup_state.update(pid=None, started_at=None, duration_ms=None, steps={})
+
+
+os.register_at_fork(after_in_child=_reset_warm_up_after_fork)
+
+
+def warm_up_redis():
+    """노드별 커넥션 풀에 연결을 미리 열어 둡니다 (TCP 연결 + PING)."""
+    if not redis_client:
+        raise RuntimeError("Redis 클라이언트가 초기화되지 않음")
+    opened = 0
+    for client in redis_client.clients.values():
+        pool = client.connection_pool
+        connections = [pool.get_connection('PING') for _ in range(REDIS_WARMUP_CONNECTIONS)]
+        try:
+            for connection in connections:
+                connection.send_command('PING')
+                connection.read_response()
+                opened += 1
+        finally:
+            for connection in connections:
+                pool.release(connection)
+    return {"connections": opened}
+
+
+def warm_up_dynamodb():
+    """없는 키에 대한 GetItem 한 번으로 자격 증명 조회와 HTTPS 연결 풀을 초기화합니다."""
+    dynamodb.get_item(route='warmup', Key={'pk': '__warmup__', 'timestamp': 0})
+    return {"request": "GetItem"}
+
+
+def warm_up():
+    """의존성 연결을 미리 맺고 결과를 warmup_state에 기록합니다."""
+    start = time.perf_counter()
+    for name, step in (("redis", warm_up_redis), ("dynamodb", warm_up_dynamodb)):
+        step_start = time.perf_counter()
+        try:
+            result = {"status": "✓ SUCCESS", **step()}
+        except Exception as e:
+            result = {"status": "✗ FAILED", "error": str(e)}
+        result["duration_ms"] = round((time.perf_counter() - step_start) * 1000, 2)
+        warmup_state["steps"][name] = result
+    warmup_state["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    warmup_done.set()
+    failed = [name for name, step in warmup_state["steps"].items() if not step["status"].startswith('✓')]
+    app.logger.log(logging.WARNING if failed else logging.INFO, "워밍업 완료 (실패: %s): %s",
+                   ', '.join(failed) or '없음', json.dumps(warmup_state, ensure_ascii=False))
+
+
+def start_warm_up():
+    """워커 프로세스당 한 번 백그라운드 스레드로 워밍업을 시작합니다."""
+    with _warmup_lock:
+        if warmup_state["started_at"] is not None:
+            return
+        warmup_state["pid"] = os.getpid()
+        warmup_state["started_at"] = datetime.now().isoformat()
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+
+def init_clients():
+    """현재 프로세스에서 DynamoDB / Redis 클라이언트를 생성합니다."""
+    global dynamodb, redis_client
+    dynamodb = DynamoDBAccess.from_env(
+        DYNAMODB_TABLE_NAME,
+        AWS_REGION,
+        route_getter=lambda: request.endpoint if has_request_context() else 'internal'
     )
-except Exception as e:
-    print(f"Redis 초기화 실패: {e}")
+    instrument_boto_client(dynamodb.client, tracer)
+    try:
+        redis_client = ShardedRedis.from_env(
+            decode_responses=True,
+            socket_connect_timeout=5
+        )
+        instrument_redis(redis_client, tracer)
+    except Exception as e:
+        app.logger.warning("Redis 초기화 실패: %s", e)
+
+
+def init_worker():
+    """워커 프로세스 시작 시 한 번: 클라이언트 생성 후 워밍업 시작"""
+    if dynamodb is None:
+        init_clients()
+    start_warm_up()
+
+
+def is_ready():
+    """이 워커 프로세스에서 워밍업이 끝났는지 (같은 태스크의 다른 워커 상태는 반영하지 않음)"""
+    if warmup_state["pid"] != os.getpid() or not warmup_done.is_set():
+        return False
+    if READINESS_REQUIRE_DEPENDENCIES:
+        return all(step["status"].startswith('✓') for step in warmup_state["steps"].values())
+    return True
 
 
 @app.route('/')
@@ -49,6 +180,7 @@ def hello():
         "environment": {
             "redis_host": REDIS_HOST,
             "redis_port": REDIS_PORT,
+            "redis_nodes": redis_client.nodes if redis_client else [],
             "dynamodb_table": DYNAMODB_TABLE_NAME,
             "aws_region": AWS_REGION
         }
@@ -61,6 +193,25 @@ def health():
     return jsonify({"status": "healthy"}), 200
 
 
+@app.route('/ready')
+def ready():
+    """Readiness 엔드포인트 (요청을 받은 워커의 워밍업이 끝난 뒤에만 200, ALB 헬스 체크용)"""
+    if is_ready():
+        return jsonify({"status": "ready", "warmup": warmup_state}), 200
+    status = "dependencies_unavailable" if warmup_done.is_set() else "warming_up"
+    return jsonify({"status": status, "warmup": warmup_state}), 503
+
+
+@app.route('/metrics')
+def metrics():
+    """워커 프로세스별 DynamoDB 사용량 (라우트별 소비 용량 / 스로틀 / 재시도) + 트레이싱 통계"""
+    return jsonify({
+        "timestamp": datetime.now().isoformat(),
+        "dynamodb": dynamodb.snapshot(),
+        "tracing": tracer.stats()
+    }), 200
+
+
 @app.route('/test/all')
 def test_all():
     """모든 테스트 실행"""
@@ -80,10 +231,10 @@ def test_all():
         }
 
         # 쓰기 테스트
-        table.put_item(Item=test_data)
+        dynamodb.put_item(Item=test_data)
 
         # 읽기 테스트
-        response = table.get_item(Key={'pk': test_key, 'timestamp': test_data['timestamp']})
+        response = dynamodb.get_item(Key={'pk': test_key, 'timestamp': test_data['timestamp']})
 
         if 'Item' in response:
             results['tests']['dynamodb'] = {
@@ -183,8 +334,8 @@ def test_dynamodb():
             'ttl': int(time.time()) + 3600
         }
 
-        table.put_item(Item=test_data)
-        response = table.get_item(Key={'pk': test_key, 'timestamp': test_data['timestamp']})
+        dynamodb.put_item(Item=test_data)
+        response = dynamodb.get_item(Key={'pk': test_key, 'timestamp': test_data['timestamp']})
 
         return jsonify({
             "status": "✓ SUCCESS",
@@ -228,6 +379,44 @@ def test_redis():
         }), 500
 
 
+@app.route('/test/redis/shards')
+def test_redis_shards():
+    """Redis 샤딩 테스트 (여러 키를 노드별 파이프라인으로 쓰고 읽기)"""
+    try:
+        if not redis_client:
+            return jsonify({
+                "status": "✗ FAILED",
+                "error": "Redis 클라이언트가 초기화되지 않음"
+            }), 500
+
+        prefix = f"shard-test-{int(time.time())}"
+        mapping = {f"{prefix}:{i}": f"value-{i}" for i in range(100)}
+
+        start = time.perf_counter()
+        redis_client.mset(mapping, ex=60)
+        values = redis_client.mget(list(mapping))
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        mismatched = sum(1 for key, value in zip(mapping, values) if value != mapping[key])
+        distribution = {node: 0 for node in redis_client.nodes}
+        for key in mapping:
+            distribution[redis_client.ring.node_for(key)] += 1
+
+        return jsonify({
+            "status": "✓ SUCCESS" if mismatched == 0 else "✗ FAILED",
+            "keys": len(mapping),
+            "mismatched": mismatched,
+            "elapsed_ms": elapsed_ms,
+            "nodes": redis_client.ping(),
+            "distribution": distribution
+        }), 200 if mismatched == 0 else 500
+    except Exception as e:
+        return jsonify({
+            "status": "✗ FAILED",
+            "error": str(e)
+        }), 500
+
+
 @app.route('/test/nat')
 def test_nat():
     """NAT Gateway (외부 인터넷 연결)만 테스트"""
@@ -247,6 +436,11 @@ def test_nat():
         }), 500
 
 
+# gunicorn.conf.py를 쓰면 post_fork 훅에서, 그 외(로컬 실행 등)에는 import 시점에 초기화
+if not APP_INIT_IN_POST_FORK:
+    init_worker()
+
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 3000))
     app.run(host='0.0.0.0', port=port, debug=False)
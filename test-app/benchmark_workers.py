@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Gunicorn 워커 모델별 처리량 벤치마크
+gunicorn.conf.py로 모드마다 gunicorn을 띄우고, keep-alive 연결을 쓰는 동시 클라이언트로 부하를 준 뒤
+처리량 / 지연 시간 / 워커 메모리를 비교합니다.
+
+측정 항목
+- 처리량: 초당 응답 수 (상태 코드별 집계)
+- 지연 시간: p50 / p95 / p99 / max
+- 메모리: 마스터 + 워커 RSS 합계, PSS 합계 (preload 시 copy-on-write로 공유되는 페이지는 PSS에서 나눠 계산됨)
+
+모드 형식: <worker_class>[:nopreload] (예: sync, gthread, gevent, gthread:nopreload)
+
+사용 예:
+    python benchmark_workers.py --modes sync,gthread,gevent --path /health
+    python benchmark_workers.py --modes gthread,gthread:nopreload --workers 2 --concurrency 64 --duration 20
+    REDIS_HOST=localhost python benchmark_workers.py --modes gthread,gevent --path /test/redis
+    python benchmark_workers.py --url http://<ALB_DNS_NAME> --path /test/dynamodb --duration 30
+
+--url을 지정하면 gunicorn을 띄우지 않고 이미 실행 중인 대상(로컬 컨테이너, ALB 등)에 부하만 줍니다.
+같은 옵션으로 변경 전/후에 실행하면 워커 설정 변경의 효과를 비교할 수 있습니다.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_load(url: str, paths: List[str], concurrency: int, duration: float, warmup: float) -> Dict[str, Any]:
+    """
+    concurrency개 스레드가 각자 keep-alive 연결 하나로 duration초 동안 요청을 보냅니다.
+    처음 warmup초 동안의 응답은 집계하지 않습니다.
+    """
+    target = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if target.scheme == 'https' else http.client.HTTPConnection
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    statuses: List[Counter] = [Counter() for _ in range(concurrency)]
+
+    def client(index: int) -> None:
+        connection = connection_class(target.hostname, target.port, timeout=30)
+        i = index
+        while True:
+            path = paths[i % len(paths)]
+            i += 1
+            sent = time.perf_counter()
+            if sent >= deadline:
+                break
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+                status = str(response.status)
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+            except (OSError, http.client.HTTPException) as e:
+                status = type(e).__name__
+                connection.close()
+            done = time.perf_counter()
+            if sent >= measure_from:
+                latencies[index].append((done - sent) * 1000)
+                statuses[index][status] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged = sorted(value for values in latencies for value in values)
+    status_counts: Counter = Counter()
+    for counter in statuses:
+        status_counts.update(counter)
+    return {
+        "requests": len(merged),
+        "requests_per_second": round(len(merged) / duration, 1),
+        "statuses": dict(status_counts),
+        "p50_ms": round(percentile(merged, 50), 2),
+        "p95_ms": round(percentile(merged, 95), 2),
+        "p99_ms": round(percentile(merged, 99), 2),
+        "max_ms": round(merged[-1], 2) if merged else 0.0
+    }
+
+
+def process_tree(pid: int) -> List[int]:
+    pids = [pid]
+    for current in pids:
+        for task in os.listdir(f"/proc/{current}/task"):
+            children = open(f"/proc/{current}/task/{task}/children").read().split()
+            pids.extend(int(child) for child in children)
+    return pids
+
+
+def memory_usage(pid: int) -> Dict[str, Any]:
+    """
+    프로세스 트리의 RSS / PSS 합계 (MB, Linux /proc 기준)
+    """
+    rss_kb = pss_kb = 0
+    pids = []
+    try:
+        pids = process_tree(pid)
+        for current in pids:
+            with open(f"/proc/{current}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith('Rss:'):
+                        rss_kb += int(line.split()[1])
+                    elif line.startswith('Pss:'):
+                        pss_kb += int(line.split()[1])
+    except OSError:
+        return {"processes": len(pids), "rss_mb": None, "pss_mb": None}
+    return {"processes": len(pids), "rss_mb": round(rss_kb / 1024, 1), "pss_mb": round(pss_kb / 1024, 1)}
+
+
+def wait_until_up(url: str, timeout: float) -> bool:
+    target = urlsplit(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection(target.hostname, target.port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def run_mode(mode: str, port: int, args) -> Dict[str, Any]:
+    """
+    모드 하나로 gunicorn을 띄우고 부하를 준 뒤 종료합니다.
+    """
+    worker_class, _, option = mode.partition(':')
+    env = dict(os.environ)
+    env['GUNICORN_WORKER_CLASS'] = worker_class
+    env['GUNICORN_PRELOAD'] = 'false' if option == 'nopreload' else 'true'
+    env['PORT'] = str(port)
+    if args.workers:
+        env['GUNICORN_WORKERS'] = str(args.workers)
+    if args.threads:
+        env['GUNICORN_THREADS'] = str(args.threads)
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f"127.0.0.1:{port}", 'app:app'],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_until_up(url, args.startup_timeout):
+            server.kill()
+            return {"mode": mode, "error": (server.communicate()[1] or 'startup timeout')[-2000:]}
+        idle_memory = memory_usage(server.pid)
+        result = run_load(url, args.path, args.concurrency, args.duration, args.warmup)
+        result["memory_idle"] = idle_memory
+        result["memory_loaded"] = memory_usage(server.pid)
+        result["mode"] = mode
+        return result
+    finally:
+        if server.poll() is None:
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=35)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+def print_report(results: List[Dict[str, Any]], args) -> None:
+    print(f"paths={','.join(args.path)} concurrency={args.concurrency} duration={args.duration}s warmup={args.warmup}s")
+    print()
+    header = (f"{'mode':<20} {'req/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9} "
+              f"{'procs':>6} {'rss(MB)':>8} {'pss(MB)':>8}  statuses")
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        if 'error' in result:
+            print(f"{result['mode']:<20} FAILED: {result['error'].strip().splitlines()[-1]}")
+            continue
+        memory = result.get('memory_loaded') or {}
+        print(f"{result['mode']:<20} {result['requests_per_second']:>9} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+              f"{result['p99_ms']:>9} {result['max_ms']:>9} {memory.get('processes', '-'):>6} "
+              f"{str(memory.get('rss_mb', '-')):>8} {str(memory.get('pss_mb', '-')):>8}  {result['statuses']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Gunicorn 워커 모델별 처리량 벤치마크')
+    parser.add_argument('--modes', default='sync,gthread,gevent',
+                        help='비교할 모드 목록 (예: sync,gthread,gevent,gthread:nopreload)')
+    parser.add_argument('--path', action='append', help='요청 경로 (여러 번 지정 시 번갈아 요청, 기본 /health)')
+    parser.add_argument('--url', help='이미 실행 중인 대상 URL (지정 시 gunicorn을 띄우지 않음)')
+    parser.add_argument('--concurrency', type=int, default=32, help='동시 클라이언트 연결 수')
+    parser.add_argument('--duration', type=float, default=10, help='측정 시간 (초)')
+    parser.add_argument('--warmup', type=float, default=2, help='집계하지 않는 초기 부하 시간 (초)')
+    parser.add_argument('--workers', type=int, default=0, help='GUNICORN_WORKERS (0 = 자동 계산)')
+    parser.add_argument('--threads', type=int, default=0, help='GUNICORN_THREADS (0 = 기본값)')
+    parser.add_argument('--port', type=int, default=3100, help='모드별 gunicorn 포트 시작 번호')
+    parser.add_argument('--startup-timeout', type=float, default=30, help='gunicorn 기동 대기 시간 (초)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+    args.path = args.path or ['/health']
+
+    if args.url:
+        result = run_load(args.url, args.path, args.concurrency, args.duration, args.warmup)
+        result["mode"] = urlsplit(args.url).netloc
+        results = [result]
+    else:
+        results = [run_mode(mode, args.port + i, args) for i, mode in enumerate(args.modes.split(','))]
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print_report(results, args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
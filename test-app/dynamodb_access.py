@@ -0,0 +1,233 @@
+"""
+DynamoDB 접근 계층
+- 재시도 모드 설정 (기본 adaptive: 스로틀 응답에 맞춰 클라이언트가 스스로 요청 속도를 낮춤)
+- 스레드 간 공유하는 클라이언트 측 토큰 버킷 (테이블 용량을 넘기 전에 앱에서 먼저 속도 제한)
+- ReturnConsumedCapacity로 라우트별 소비 용량(RCU/WCU) 집계
+- 스로틀 / 재시도 횟수와 호출 지연 시간 집계 → /metrics 엔드포인트에서 조회
+
+환경 변수
+- DYNAMODB_RETRY_MODE: legacy / standard / adaptive (기본 adaptive)
+- DYNAMODB_MAX_ATTEMPTS: 최초 요청 포함 최대 시도 횟수 (기본 5)
+- DYNAMODB_MAX_POOL_CONNECTIONS: HTTPS 커넥션 풀 크기 (기본 20)
+- DYNAMODB_CLIENT_RATE: 프로세스당 초당 허용 요청 수 (기본 0 = 제한 없음)
+- DYNAMODB_CLIENT_BURST: 토큰 버킷 버스트 크기 (기본 = rate)
+- DYNAMODB_CLIENT_WAIT_TIMEOUT: 토큰을 기다리는 최대 시간 (초, 기본 1)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# 스로틀로 보는 DynamoDB 오류 코드
+THROTTLE_ERROR_CODES = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+)
+
+
+class ClientThrottled(Exception):
+    """
+    클라이언트 측 토큰 버킷에서 제한 시간 안에 토큰을 얻지 못한 경우
+    """
+
+
+class TokenBucket:
+    """
+    스레드 간 공유하는 토큰 버킷 (초당 rate개 충전, 최대 burst개)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> float:
+        """
+        토큰 하나를 얻을 때까지 기다리고 대기한 시간(초)을 반환합니다.
+        timeout 안에 얻지 못하면 ClientThrottled를 발생시킵니다.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - start
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                raise ClientThrottled(f"client-side rate limit ({self.rate}/s) exceeded")
+            time.sleep(wait)
+
+
+class RouteStats:
+    """
+    라우트 하나의 DynamoDB 사용량
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.read_capacity = 0.0
+        self.write_capacity = 0.0
+        self.retries = 0
+        self.throttled_calls = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+        self.bucket_wait_ms_total = 0.0
+        self.client_throttled = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "consumed_rcu": round(self.read_capacity, 2),
+            "consumed_wcu": round(self.write_capacity, 2),
+            "retries": self.retries,
+            "throttled_calls": self.throttled_calls,
+            "client_throttled": self.client_throttled,
+            "latency_ms_avg": round(self.latency_ms_total / self.calls, 2) if self.calls else None,
+            "latency_ms_max": round(self.latency_ms_max, 2),
+            "bucket_wait_ms_total": round(self.bucket_wait_ms_total, 2)
+        }
+
+
+class DynamoDBAccess:
+    """
+    Table 리소스를 감싸서 호출마다 속도 제한과 사용량 집계를 적용합니다.
+    route_getter는 현재 라우트 이름을 반환하는 함수입니다 (예: Flask request.endpoint).
+    """
+
+    def __init__(self, table_name: str, region: str, retry_mode: str = 'adaptive', max_attempts: int = 5,
+                 max_pool_connections: int = 20, client_rate: float = 0, client_burst: Optional[float] = None,
+                 wait_timeout: float = 1.0, route_getter: Optional[Callable[[], str]] = None):
+        self.table_name = table_name
+        self.retry_mode = retry_mode
+        self.max_attempts = max_attempts
+        self.wait_timeout = wait_timeout
+        self.route_getter = route_getter or (lambda: 'default')
+        self.bucket = TokenBucket(client_rate, client_burst) if client_rate > 0 else None
+
+        config = Config(
+            retries={'mode': retry_mode, 'total_max_attempts': max_attempts},
+            max_pool_connections=max_pool_connections
+        )
+        self.resource = boto3.resource('dynamodb', region_name=region, config=config)
+        self.table = self.resource.Table(table_name)
+        self.client = self.resource.meta.client
+
+        self._stats: Dict[str, RouteStats] = {}
+        self._throttle_events: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+        # 재시도 판단 시점마다 호출됨 → 중간에 스로틀 후 성공한 요청도 집계
+        self.client.meta.events.register('needs-retry.dynamodb', self._on_needs_retry)
+
+    @classmethod
+    def from_env(cls, table_name: str, region: str, **kwargs: Any) -> 'DynamoDBAccess':
+        rate = float(os.environ.get('DYNAMODB_CLIENT_RATE', '0'))
+        burst = os.environ.get('DYNAMODB_CLIENT_BURST')
+        return cls(
+            table_name,
+            region,
+            retry_mode=os.environ.get('DYNAMODB_RETRY_MODE', 'adaptive'),
+            max_attempts=int(os.environ.get('DYNAMODB_MAX_ATTEMPTS', '5')),
+            max_pool_connections=int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', '20')),
+            client_rate=rate,
+            client_burst=float(burst) if burst else None,
+            wait_timeout=float(os.environ.get('DYNAMODB_CLIENT_WAIT_TIMEOUT', '1')),
+            **kwargs
+        )
+
+    def _route_stats(self, route: str) -> RouteStats:
+        stats = self._stats.get(route)
+        if stats is None:
+            stats = self._stats[route] = RouteStats()
+        return stats
+
+    def _on_needs_retry(self, response=None, operation=None, **kwargs) -> None:
+        if not response:
+            return
+        code = response[1].get('Error', {}).get('Code', '')
+        if code in THROTTLE_ERROR_CODES:
+            with self._lock:
+                key = f"{operation.name if operation else 'unknown'}:{code}"
+                self._throttle_events[key] = self._throttle_events.get(key, 0) + 1
+
+    def _call(self, method: Callable[..., Dict[str, Any]], route: Optional[str], **kwargs: Any) -> Dict[str, Any]:
+        route = route or self.route_getter()
+        waited = 0.0
+        if self.bucket is not None:
+            try:
+                waited = self.bucket.acquire(self.wait_timeout)
+            except ClientThrottled:
+                with self._lock:
+                    self._route_stats(route).client_throttled += 1
+                raise
+
+        kwargs.setdefault('ReturnConsumedCapacity', 'TOTAL')
+        start = time.perf_counter()
+        response: Dict[str, Any] = {}
+        error: Optional[ClientError] = None
+        try:
+            response = method(**kwargs)
+            return response
+        except ClientError as e:
+            error = e
+            response = e.response
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            capacity = response.get('ConsumedCapacity') or {}
+            retries = response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+            with self._lock:
+                stats = self._route_stats(route)
+                stats.calls += 1
+                stats.retries += retries
+                stats.latency_ms_total += elapsed_ms
+                stats.latency_ms_max = max(stats.latency_ms_max, elapsed_ms)
+                stats.bucket_wait_ms_total += waited * 1000
+                stats.read_capacity += capacity.get('ReadCapacityUnits', 0) or 0
+                stats.write_capacity += capacity.get('WriteCapacityUnits', 0) or 0
+                if error is not None:
+                    stats.errors += 1
+                    if error.response.get('Error', {}).get('Code') in THROTTLE_ERROR_CODES:
+                        stats.throttled_calls += 1
+
+    def put_item(self, route: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self.table.put_item, route, **kwargs)
+
+    def get_item(self, route: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self.table.get_item, route, **kwargs)
+
+    def query(self, route: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        return self._call(self.table.query, route, **kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        프로세스(워커) 시작 이후 누적 사용량
+        """
+        with self._lock:
+            routes = {route: stats.as_dict() for route, stats in self._stats.items()}
+            throttle_events = dict(self._throttle_events)
+        return {
+            "table": self.table_name,
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "retry_mode": self.retry_mode,
+            "max_attempts": self.max_attempts,
+            "client_rate_limit": self.bucket.rate if self.bucket else None,
+            "throttle_events": throttle_events,
+            "routes": routes
+        }
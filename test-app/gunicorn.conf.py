@@ -0,0 +1,215 @@
+"""
+Gunicorn 설정 (컨테이너 CPU / 메모리 한도에 맞춰 워커 수 결정)
+
+- 워커 모델: GUNICORN_WORKER_CLASS = gthread (기본) / gevent / sync
+- 워커 수: cgroup CPU 한도(cpu.max, v1은 cfs_quota_us) → 없으면 ECS 태스크 메타데이터 → 호스트 CPU 수
+  메모리 한도(memory.max, v1은 memory.limit_in_bytes)로 상한을 둠
+- preload_app: 마스터에서 Flask / boto3 등을 한 번만 import하고 워커는 fork로 copy-on-write 공유
+- 클라이언트(DynamoDB / Redis)는 post_fork 훅에서 워커마다 생성 (소켓 / 커넥션 풀은 fork 간 공유하지 않음)
+- max_requests + jitter: 워커를 요청 수 기준으로 재시작하되 동시에 재시작되지 않도록 분산
+
+환경 변수
+- GUNICORN_WORKER_CLASS: gthread / gevent / sync (기본 gthread, gevent 미설치 시 gthread로 대체)
+- GUNICORN_WORKERS: 워커 수 직접 지정 (기본 자동 계산)
+- GUNICORN_MIN_WORKERS: 자동 계산 시 최소 워커 수 (기본 2, 재시작 중에도 요청 처리)
+- GUNICORN_THREADS: gthread 워커당 스레드 수 (기본 4)
+- GUNICORN_WORKER_CONNECTIONS: gevent 워커당 동시 연결 수 (기본 100)
+- GUNICORN_WORKER_MEMORY_MB: 워커 하나에 잡는 메모리 (기본 128)
+- GUNICORN_MEMORY_RESERVE_MB: 마스터 등 워커 외에 남겨 둘 메모리 (기본 96)
+- GUNICORN_PRELOAD: true / false (기본 true)
+- GUNICORN_MAX_REQUESTS: 워커 재시작 기준 요청 수 (기본 10000, 0이면 재시작 안 함)
+- GUNICORN_MAX_REQUESTS_JITTER: 재시작 기준에 더할 무작위 값 상한 (기본 max_requests의 10%)
+- GUNICORN_TIMEOUT / GUNICORN_KEEPALIVE: 워커 타임아웃 (기본 60초) / keep-alive 유지 시간 (기본 65초)
+
+계산 결과 확인: python gunicorn.conf.py
+"""
+
+import json
+import math
+import os
+import urllib.request
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# cgroup v1에서 한도 없음을 나타내는 값 (이보다 크면 무제한으로 간주)
+UNLIMITED_MEMORY_BYTES = 1 << 60
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _ecs_task_limits():
+    """
+    ECS 태스크 메타데이터(v4)의 태스크 CPU(vCPU) / 메모리(MB) 한도
+    Fargate는 태스크 단위로 한도를 걸어 컨테이너 cgroup에는 보이지 않을 수 있음
+    """
+    uri = os.environ.get('ECS_CONTAINER_METADATA_URI_V4')
+    if not uri:
+        return {}
+    try:
+        with urllib.request.urlopen(f"{uri}/task", timeout=1) as response:
+            return json.load(response).get('Limits') or {}
+    except (OSError, ValueError):
+        return {}
+
+
+def cpu_limit():
+    """
+    사용할 수 있는 CPU 수 (소수 가능, 예: Fargate 256 유닛 = 0.25)
+    """
+    # cgroup v2: "<quota> <period>" 또는 "max <period>"
+    value = _read(f"{CGROUP_ROOT}/cpu.max")
+    if value:
+        quota, _, period = value.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+
+    # cgroup v1
+    quota = _read(f"{CGROUP_ROOT}/cpu/cpu.cfs_quota_us")
+    period = _read(f"{CGROUP_ROOT}/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+
+    limits = _ecs_task_limits()
+    if limits.get('CPU'):
+        return float(limits['CPU'])
+
+    if hasattr(os, 'sched_getaffinity'):
+        return float(len(os.sched_getaffinity(0)))
+    return float(os.cpu_count() or 1)
+
+
+def memory_limit_mb():
+    """
+    메모리 한도 (MB), 한도가 없으면 None
+    """
+    value = _read(f"{CGROUP_ROOT}/memory.max")
+    if value and value != 'max':
+        return int(value) // (1024 * 1024)
+
+    value = _read(f"{CGROUP_ROOT}/memory/memory.limit_in_bytes")
+    if value and int(value) < UNLIMITED_MEMORY_BYTES:
+        return int(value) // (1024 * 1024)
+
+    limits = _ecs_task_limits()
+    if limits.get('Memory'):
+        return int(limits['Memory'])
+    return None
+
+
+def resolve_worker_class(requested):
+    """
+    gevent는 선택 의존성이므로 설치되지 않았으면 gthread로 대체합니다.
+    """
+    if requested != 'gevent':
+        return requested
+    try:
+        import gevent  # noqa: F401
+    except ImportError:
+        print("gevent가 설치되지 않아 gthread 워커를 사용합니다 (requirements-gevent.txt 참고)")
+        return 'gthread'
+    return 'gevent'
+
+
+def size_workers(mode, cpus, memory_mb):
+    """
+    CPU / 메모리 한도로 워커 수를 계산합니다.
+    - sync: 요청 하나가 워커 하나를 점유하므로 2 * CPU + 1
+    - gthread: 워커 안의 스레드가 I/O 대기를 겹치므로 CPU당 2개
+    - gevent: 워커 하나가 수백 개 연결을 처리하므로 CPU당 1개
+    """
+    explicit = os.environ.get('GUNICORN_WORKERS')
+    if explicit:
+        return int(explicit)
+
+    cores = math.ceil(cpus)
+    if mode == 'sync':
+        count = 2 * cores + 1
+    elif mode == 'gevent':
+        count = cores
+    else:
+        count = 2 * cores
+    count = max(int(os.environ.get('GUNICORN_MIN_WORKERS', '2')), count)
+
+    if memory_mb:
+        per_worker = int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', '128'))
+        reserve = int(os.environ.get('GUNICORN_MEMORY_RESERVE_MB', '96'))
+        count = min(count, max(1, (memory_mb - reserve) // per_worker))
+    return count
+
+
+cpus = cpu_limit()
+memory_mb = memory_limit_mb()
+
+worker_class = resolve_worker_class(os.environ.get('GUNICORN_WORKER_CLASS', 'gthread'))
+workers = size_workers(worker_class, cpus, memory_mb)
+threads = int(os.environ.get('GUNICORN_THREADS', '4')) if worker_class == 'gthread' else 1
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '100'))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '3000')}"
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# 너무 낮으면 부하 중에 워커가 수 초마다 재시작되어 p99가 튐 (1000일 때 /health p99 430~710ms, README 측정 참고)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', str(max_requests // 10)))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+# ALB idle timeout(60초)보다 길게 유지해야 ALB가 닫힌 연결을 재사용하여 502가 나는 것을 막음
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '65'))
+
+# 워커 heartbeat 파일을 디스크 대신 메모리에 기록 (컨테이너 overlay 파일시스템의 fsync 지연 회피)
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# app.py가 import 시점에 클라이언트를 만들지 않도록 하고 아래 훅에서 워커마다 초기화
+raw_env = ['APP_INIT_IN_POST_FORK=true']
+
+# gevent는 마스터가 앱을 preload하기 전에 패치해야 boto3 / requests / redis의 소켓과 ssl이 협력형으로 동작
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def when_ready(server):
+    server.log.info(
+        "Gunicorn 설정: worker_class=%s workers=%s threads=%s cpus=%.2f memory_mb=%s preload=%s max_requests=%s(+%s)",
+        worker_class, workers, threads, cpus, memory_mb, preload_app, max_requests, max_requests_jitter
+    )
+
+
+def post_fork(server, worker):
+    """
+    fork 직후 워커에서 DynamoDB / Redis 클라이언트를 생성합니다.
+    (preload 시 app 모듈은 이미 import되어 있으므로 클라이언트만 새로 만듦)
+    """
+    import app as application
+    application.init_clients()
+
+
+def post_worker_init(worker):
+    """
+    워커 초기화(gevent 허브 재초기화 포함)가 끝난 뒤 워밍업을 시작합니다.
+    """
+    import app as application
+    application.start_warm_up()
+
+
+if __name__ == '__main__':
+    print(json.dumps({
+        "cpus": cpus,
+        "memory_mb": memory_mb,
+        "worker_class": worker_class,
+        "workers": workers,
+        "threads": threads,
+        "worker_connections": worker_connections,
+        "preload_app": preload_app,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests_jitter,
+        "timeout": timeout,
+        "keepalive": keepalive
+    }, indent=2))
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+클라이언트 측 Redis 샤딩 (consistent hashing)
+여러 Redis 노드에 키를 분산하여 캐시 메모리와 쓰기 처리량을 노드 수만큼 늘립니다.
+
+- 가상 노드(virtual node)를 둔 해시 링으로 키를 노드에 배정
+  → 노드를 하나 추가/제거해도 약 1/N 의 키만 다른 노드로 이동
+- `{tag}` 해시 태그를 지원하여 관련 키를 같은 노드에 모을 수 있음 (Redis Cluster와 같은 규칙)
+- mget / mset 은 노드별 파이프라인 하나씩으로 묶어 노드들에 동시에 전송
+- 노드 추가/제거는 새 링 / 클라이언트 목록 / 실행기를 만들어 통째로 교체하므로
+  요청을 처리 중인 스레드는 항상 한 시점의 구성만 보게 됨 (락은 구성을 바꾸는 쪽만 사용)
+
+환경 변수
+- REDIS_NODES: "host1:6379,host2:6379" (없으면 REDIS_HOST:REDIS_PORT 단일 노드)
+- REDIS_VIRTUAL_NODES: 노드당 가상 노드 수 (기본 160)
+- REDIS_MAX_CONNECTIONS: 노드별 커넥션 풀 크기 (기본 20)
+
+로컬 검증 예:
+    # 키 이동 비율 / 분포 시뮬레이션 (Redis 불필요)
+    python redis_shards.py simulate --nodes 3 --add 1 --keys 100000
+
+    # 로컬 Redis 여러 개에 실제로 쓰고 읽기
+    docker run -d -p 6380:6379 redis:7 && docker run -d -p 6381:6379 redis:7 && docker run -d -p 6382:6379 redis:7
+    python redis_shards.py check --nodes localhost:6380,localhost:6381,localhost:6382 --keys 1000
+"""
+
+import argparse
+import bisect
+import hashlib
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import redis
+
+DEFAULT_VIRTUAL_NODES = 160
+
+
+def key_hash(value: str) -> int:
+    """
+    64비트 해시 (프로세스/플랫폼과 무관하게 항상 같은 값)
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def hash_slot_key(key: str) -> str:
+    """
+    키에 `{tag}` 가 있으면 tag 부분만 해시합니다 (예: "user:{42}:profile" → "42").
+    """
+    start = key.find('{')
+    if start != -1:
+        end = key.find('}', start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class HashRing:
+    """
+    가상 노드를 둔 consistent hash 링
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        self.virtual_nodes = virtual_nodes
+        self._positions: List[int] = []
+        self._owners: List[str] = []
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.virtual_nodes):
+            position = key_hash(f"{node}#{i}")
+            index = bisect.bisect(self._positions, position)
+            self._positions.insert(index, position)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        kept = [(p, o) for p, o in zip(self._positions, self._owners) if o != node]
+        self._positions = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def copy(self) -> 'HashRing':
+        ring = HashRing(virtual_nodes=self.virtual_nodes)
+        ring._positions = list(self._positions)
+        ring._owners = list(self._owners)
+        ring.nodes = list(self.nodes)
+        return ring
+
+    def node_for(self, key: str) -> str:
+        if not self._positions:
+            raise ValueError('HashRing has no nodes')
+        index = bisect.bisect(self._positions, key_hash(hash_slot_key(key)))
+        return self._owners[index % len(self._owners)]
+
+
+def parse_nodes(value: str) -> List[str]:
+    """
+    "host1:6379,host2" → ["host1:6379", "host2:6379"]
+    """
+    nodes = []
+    for part in value.split(','):
+        part = part.strip()
+        if part:
+            nodes.append(part if ':' in part else f"{part}:6379")
+    return nodes
+
+
+class _Topology:
+    """
+    해시 링 + 노드별 클라이언트 + 노드 수만큼의 실행기 (만든 뒤에는 변경하지 않음)
+    """
+
+    def __init__(self, ring: HashRing, clients: Dict[str, redis.Redis]):
+        self.ring = ring
+        self.clients = clients
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(clients)), thread_name_prefix='redis-shard')
+
+
+class ShardedRedis:
+    """
+    노드별 redis.Redis 클라이언트를 해시 링으로 묶은 클라이언트
+    단일 키 명령은 해당 노드로 바로 보내고, 여러 키 명령은 노드별 파이프라인으로 나눠 보냅니다.
+    """
+
+    def __init__(self, nodes: List[str], virtual_nodes: int = DEFAULT_VIRTUAL_NODES,
+                 max_connections: int = 20, **client_kwargs: Any):
+        if not nodes:
+            raise ValueError('ShardedRedis requires at least one node')
+        self.max_connections = max_connections
+        self.client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+        self._topology = _Topology(HashRing(nodes, virtual_nodes), {node: self._build_client(node) for node in nodes})
+
+    @classmethod
+    def from_env(cls, **client_kwargs: Any) -> 'ShardedRedis':
+        nodes = parse_nodes(os.environ.get('REDIS_NODES', ''))
+        if not nodes:
+            nodes = [f"{os.environ.get('REDIS_HOST', 'localhost')}:{os.environ.get('REDIS_PORT', '6379')}"]
+        return cls(
+            nodes,
+            virtual_nodes=int(os.environ.get('REDIS_VIRTUAL_NODES', DEFAULT_VIRTUAL_NODES)),
+            max_connections=int(os.environ.get('REDIS_MAX_CONNECTIONS', '20')),
+            **client_kwargs
+        )
+
+    def _build_client(self, node: str) -> redis.Redis:
+        host, _, port = node.rpartition(':')
+        pool = redis.ConnectionPool(host=host, port=int(port), max_connections=self.max_connections,
+                                    **self.client_kwargs)
+        return redis.Redis(connection_pool=pool)
+
+    @property
+    def ring(self) -> HashRing:
+        return self._topology.ring
+
+    @property
+    def clients(self) -> Dict[str, redis.Redis]:
+        return self._topology.clients
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._topology.ring.nodes)
+
+    def add_node(self, node: str) -> None:
+        """
+        노드를 추가합니다. 약 1/N 의 키가 새 노드로 배정되며 기존 값은 옮기지 않습니다 (캐시 미스로 채워짐).
+        """
+        with self._lock:
+            current = self._topology
+            if node in current.clients:
+                return
+            ring = current.ring.copy()
+            ring.add_node(node)
+            self._topology = _Topology(ring, {**current.clients, node: self._build_client(node)})
+        # 이전 실행기는 shutdown 하지 않음 (이전 구성으로 실행 중인 요청이 아직 submit 할 수 있음)
+        # 참조가 모두 사라지면 유휴 스레드는 스스로 종료됨
+
+    def remove_node(self, node: str) -> None:
+        with self._lock:
+            current = self._topology
+            if node not in current.clients:
+                return
+            ring = current.ring.copy()
+            ring.remove_node(node)
+            self._topology = _Topology(ring, {n: c for n, c in current.clients.items() if n != node})
+        # 이전 구성으로 실행 중인 명령이 쓰는 연결은 두고 유휴 연결만 닫음
+        current.clients[node].connection_pool.disconnect(inuse_connections=False)
+
+    def client_for(self, key: str) -> redis.Redis:
+        topology = self._topology
+        return topology.clients[topology.ring.node_for(key)]
+
+    # 단일 키 명령 ------------------------------------------------------------
+
+    def get(self, key: str) -> Any:
+        return self.client_for(key).get(key)
+
+    def set(self, key: str, value: Any, **kwargs: Any) -> Any:
+        return self.client_for(key).set(key, value, **kwargs)
+
+    def setex(self, key: str, seconds: int, value: Any) -> Any:
+        return self.client_for(key).setex(key, seconds, value)
+
+    def delete(self, *keys: str) -> int:
+        topology = self._topology
+        grouped = self._group(topology, keys)
+        results = self._run(topology, grouped, lambda pipe, key: pipe.delete(key))
+        return sum(sum(node_results) for node_results in results.values())
+
+    # 여러 키 명령 ------------------------------------------------------------
+
+    @staticmethod
+    def _group(topology: _Topology, keys: Iterable[str]) -> Dict[str, List[Tuple[int, str]]]:
+        grouped: Dict[str, List[Tuple[int, str]]] = {}
+        for index, key in enumerate(keys):
+            grouped.setdefault(topology.ring.node_for(key), []).append((index, key))
+        return grouped
+
+    @staticmethod
+    def _run(topology: _Topology, grouped: Dict[str, List[Tuple[int, Any]]], build) -> Dict[str, List[Any]]:
+        """
+        노드별로 파이프라인 하나를 만들어 동시에 실행하고 노드별 결과 목록을 반환합니다.
+        키를 나눌 때와 같은 구성(topology)의 클라이언트 / 실행기를 사용합니다.
+        """
+        def execute(node: str) -> List[Any]:
+            pipe = topology.clients[node].pipeline(transaction=False)
+            for _, item in grouped[node]:
+                build(pipe, item)
+            return pipe.execute()
+
+        if len(grouped) == 1:
+            node = next(iter(grouped))
+            return {node: execute(node)}
+        futures = {node: topology.executor.submit(execute, node) for node in grouped}
+        return {node: future.result() for node, future in futures.items()}
+
+    def mget(self, keys: List[str]) -> List[Any]:
+        """
+        여러 키를 조회합니다. 결과 순서는 keys 순서와 같습니다.
+        """
+        topology = self._topology
+        grouped = self._group(topology, keys)
+        values: List[Any] = [None] * len(keys)
+        for node, results in self._run(topology, grouped, lambda pipe, key: pipe.get(key)).items():
+            for (index, _), value in zip(grouped[node], results):
+                values[index] = value
+        return values
+
+    def mset(self, mapping: Dict[str, Any], ex: Optional[int] = None) -> None:
+        """
+        여러 키를 저장합니다 (ex 지정 시 만료 시간 설정).
+        """
+        topology = self._topology
+        grouped = self._group(topology, mapping)
+        self._run(topology, grouped, lambda pipe, key: pipe.set(key, mapping[key], ex=ex))
+
+    def ping(self) -> Dict[str, bool]:
+        """
+        노드별 연결 상태
+        """
+        status = {}
+        for node, client in self.clients.items():
+            try:
+                status[node] = bool(client.ping())
+            except redis.RedisError:
+                status[node] = False
+        return status
+
+    def close(self) -> None:
+        topology = self._topology
+        topology.executor.shutdown(wait=False)
+        for client in topology.clients.values():
+            client.connection_pool.disconnect()
+
+
+# ---------------------------------------------------------------------------
+# 로컬 검증 도구
+# ---------------------------------------------------------------------------
+
+def simulate(args) -> int:
+    """
+    노드 추가 시 이동하는 키 비율과 노드별 분포를 계산합니다 (Redis 불필요).
+    """
+    before_nodes = [f"redis-{i}:6379" for i in range(args.nodes)]
+    after_nodes = before_nodes + [f"redis-{i}:6379" for i in range(args.nodes, args.nodes + args.add)]
+    before = HashRing(before_nodes, args.virtual_nodes)
+    after = HashRing(after_nodes, args.virtual_nodes)
+
+    keys = [f"key:{i}" for i in range(args.keys)]
+    moved = 0
+    distribution: Counter = Counter()
+    for key in keys:
+        new_owner = after.node_for(key)
+        distribution[new_owner] += 1
+        if before.node_for(key) != new_owner:
+            moved += 1
+
+    expected = args.add / len(after_nodes)
+    print(f"nodes {args.nodes} -> {len(after_nodes)}, virtual nodes {args.virtual_nodes}, keys {args.keys}")
+    print(f"moved keys: {moved} ({moved / len(keys):.2%}, ideal {expected:.2%})")
+    mean = len(keys) / len(after_nodes)
+    for node in after_nodes:
+        print(f"  {node:<14} {distribution[node]:>8} ({distribution[node] / mean - 1:+.1%} vs mean)")
+    return 0
+
+
+def check(args) -> int:
+    """
+    실제 Redis 노드들에 키를 쓰고 mget으로 읽어 결과와 노드별 키 수를 확인합니다.
+    """
+    client = ShardedRedis(parse_nodes(args.nodes), args.virtual_nodes, decode_responses=True,
+                          socket_connect_timeout=2)
+    try:
+        print(f"ping: {client.ping()}")
+        mapping = {f"shard-check:{i}": f"value-{i}" for i in range(args.keys)}
+        client.mset(mapping, ex=300)
+        values = client.mget(list(mapping))
+        mismatched = sum(1 for key, value in zip(mapping, values) if value != mapping[key])
+        owners = Counter(client.ring.node_for(key) for key in mapping)
+        print(f"wrote {len(mapping)} keys, read back {len(values) - mismatched} correct, {mismatched} mismatched")
+        for node in client.nodes:
+            print(f"  {node:<20} {owners[node]:>6} keys")
+        return 0 if mismatched == 0 else 1
+    finally:
+        client.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Redis consistent-hash 샤딩 검증 도구')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sim = sub.add_parser('simulate', help='노드 추가 시 키 이동 비율 계산')
+    sim.add_argument('--nodes', type=int, default=3)
+    sim.add_argument('--add', type=int, default=1)
+    sim.add_argument('--keys', type=int, default=100000)
+    sim.add_argument('--virtual-nodes', type=int, default=DEFAULT_VIRTUAL_NODES)
+    sim.set_defaults(func=simulate)
+
+    chk = sub.add_parser('check', help='로컬 Redis 노드들에 쓰고 읽기')
+    chk.add_argument('--nodes', required=True, help='예: localhost:6380,localhost:6381')
+    chk.add_argument('--keys', type=int, default=1000)
+    chk.add_argument('--virtual-nodes', type=int, default=DEFAULT_VIRTUAL_NODES)
+    chk.set_defaults(func=check)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
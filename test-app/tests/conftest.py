@@ -0,0 +1,8 @@
+"""
+테스트에서 test-app 모듈을 import 할 수 있도록 경로를 추가합니다.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
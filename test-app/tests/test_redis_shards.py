@@ -0,0 +1,90 @@
+"""
+redis_shards 테스트 (해시 링 / 구성 교체만 검사하므로 Redis 서버 불필요)
+"""
+
+from redis_shards import HashRing, ShardedRedis, hash_slot_key, parse_nodes
+
+NODES = [f"redis-{i}:6379" for i in range(4)]
+KEYS = [f"key:{i}" for i in range(20000)]
+
+
+def _owners(ring):
+    return {key: ring.node_for(key) for key in KEYS}
+
+
+def test_add_node_moves_about_one_over_n_keys_to_new_node():
+    before = _owners(HashRing(NODES))
+    after = _owners(HashRing(NODES + ['redis-4:6379']))
+
+    moved = [key for key in KEYS if before[key] != after[key]]
+
+    # 이상적인 비율 1/5 = 20%
+    assert 0.15 < len(moved) / len(KEYS) < 0.25
+    # 기존 노드끼리는 키를 주고받지 않음
+    assert all(after[key] == 'redis-4:6379' for key in moved)
+
+
+def test_remove_node_moves_only_its_keys():
+    ring = HashRing(NODES)
+    before = _owners(ring)
+    ring.remove_node('redis-1:6379')
+    after = _owners(ring)
+
+    moved = {key for key in KEYS if before[key] != after[key]}
+
+    assert moved == {key for key in KEYS if before[key] == 'redis-1:6379'}
+    assert 0.2 < len(moved) / len(KEYS) < 0.3
+    assert 'redis-1:6379' not in after.values()
+
+
+def test_ring_is_independent_of_node_order():
+    assert _owners(HashRing(NODES)) == _owners(HashRing(reversed(NODES)))
+
+
+def test_copy_does_not_share_state():
+    ring = HashRing(NODES)
+    copied = ring.copy()
+    copied.add_node('redis-4:6379')
+
+    assert ring.nodes == NODES
+    assert _owners(ring) == _owners(HashRing(NODES))
+
+
+def test_hash_tag_keeps_keys_together():
+    assert hash_slot_key('user:{42}:profile') == '42'
+    assert hash_slot_key('user:{}:profile') == 'user:{}:profile'
+    assert hash_slot_key('plain') == 'plain'
+
+    ring = HashRing(NODES)
+    owners = {ring.node_for(f"user:{{42}}:{field}") for field in ('profile', 'cart', 'session', 'orders')}
+    assert len(owners) == 1
+
+
+def test_parse_nodes():
+    assert parse_nodes('host1:6380, host2,') == ['host1:6380', 'host2:6379']
+    assert parse_nodes('') == []
+
+
+def test_sharded_redis_swaps_topology_on_add_and_remove():
+    # redis.Redis 클라이언트는 명령을 보낼 때 연결하므로 서버 없이 구성만 확인 가능
+    client = ShardedRedis(NODES[:3])
+    old_topology = client._topology
+    old_clients = dict(client.clients)
+    try:
+        client.add_node(NODES[3])
+        assert client.nodes == NODES
+        assert client._topology is not old_topology
+        # 기존 노드의 클라이언트(커넥션 풀)는 그대로 재사용
+        assert all(client.clients[node] is old_clients[node] for node in NODES[:3])
+        # 이전 구성은 바뀌지 않음 (처리 중인 요청은 한 시점의 구성만 봄)
+        assert old_topology.ring.nodes == NODES[:3]
+
+        client.add_node(NODES[3])
+        assert client.nodes == NODES
+
+        client.remove_node(NODES[0])
+        assert client.nodes == NODES[1:]
+        assert NODES[0] not in client.clients
+        assert all(client.ring.node_for(key) != NODES[0] for key in KEYS[:1000])
+    finally:
+        client.close()
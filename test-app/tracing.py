@@ -0,0 +1,512 @@
+"""
+요청 트레이싱 (X-Ray 세그먼트 형식)
+- ALB가 붙여 주는 X-Amzn-Trace-Id(Root=...;Parent=...;Sampled=...)를 이어받아 같은 트레이스로 기록
+- Flask 요청 하나 = 세그먼트 하나, DynamoDB / Redis / 외부 HTTP 호출 = 서브세그먼트
+- 외부 HTTP 호출에 X-Amzn-Trace-Id를 붙여 다음 홉으로 전파
+- 세그먼트는 요청 스레드에서 큐에 넣기만 하고, 백그라운드 스레드가 모아서 X-Ray 데몬(UDP) 또는 파일로 내보냄
+
+환경 변수
+- TRACE_EXPORT: 내보낼 곳 (기본 빈 값 = 비활성화)
+    udp                      → AWS_XRAY_DAEMON_ADDRESS 또는 127.0.0.1:2000 (X-Ray 데몬 / ADOT Collector)
+    udp://host:port          → 지정한 주소
+    file:///tmp/traces.jsonl → 한 줄에 세그먼트 문서 하나
+- TRACE_SAMPLE_RATE: 샘플링 비율 (기본 0.05)
+- TRACE_RESERVOIR_PER_SECOND: 비율과 별개로 초당 항상 기록할 요청 수 (기본 1)
+- TRACE_RESPECT_UPSTREAM: 헤더에 Sampled=0/1이 있으면 따름 (기본 true)
+- TRACE_SLOW_THRESHOLD_MS: 0보다 크면 샘플링되지 않은 요청도 기록해 두고 이 시간보다 느린 요청만 내보냄 (기본 0)
+- TRACE_SERVICE_NAME: 세그먼트 이름 (기본 test-app)
+- TRACE_BATCH_SIZE / TRACE_FLUSH_INTERVAL / TRACE_QUEUE_SIZE: 내보내기 배치 크기 (기본 50) / 주기 (초, 기본 1) / 큐 크기 (기본 1000)
+- TRACE_MAX_SUBSEGMENTS: 세그먼트당 최대 서브세그먼트 수 (기본 100, UDP 64KB 제한)
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import random
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+TRACE_HEADER = 'X-Amzn-Trace-Id'
+
+# X-Ray 데몬 UDP 프로토콜: 헤더 줄 + 세그먼트 문서
+DAEMON_HEADER = b'{"format": "json", "version": 1}\n'
+DEFAULT_DAEMON_ADDRESS = '127.0.0.1:2000'
+
+THROTTLE_ERROR_CODES = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+)
+
+_current: contextvars.ContextVar = contextvars.ContextVar('trace_entity', default=None)
+
+
+def new_trace_id() -> str:
+    return f"1-{int(time.time()):08x}-{random.getrandbits(96):024x}"
+
+
+def new_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_trace_header(value: Optional[str]) -> Dict[str, str]:
+    """
+    "Root=1-...;Parent=...;Sampled=1" → {'Root': ..., 'Parent': ..., 'Sampled': '1'}
+    """
+    fields = {}
+    for part in (value or '').split(';'):
+        key, sep, item = part.strip().partition('=')
+        if sep:
+            fields[key] = item
+    return fields
+
+
+class Sampler:
+    """
+    X-Ray 기본 규칙과 같은 방식: 초당 reservoir개는 항상 기록하고 나머지는 rate 비율로 기록
+    """
+
+    def __init__(self, rate: float, reservoir_per_second: int):
+        self.rate = rate
+        self.reservoir_per_second = reservoir_per_second
+        self._second = 0
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def sample(self) -> bool:
+        if self.reservoir_per_second > 0:
+            now = int(time.time())
+            with self._lock:
+                if now != self._second:
+                    self._second = now
+                    self._used = 0
+                if self._used < self.reservoir_per_second:
+                    self._used += 1
+                    return True
+        return self.rate > 0 and random.random() < self.rate
+
+
+class Entity:
+    """
+    세그먼트 / 서브세그먼트 공통 (X-Ray 문서 필드를 그대로 가짐)
+    """
+
+    __slots__ = ('segment', 'doc', 'subsegments')
+
+    def __init__(self, segment: 'Segment', name: str, **fields: Any):
+        self.segment = segment
+        self.doc: Dict[str, Any] = {'id': new_id(), 'name': name, 'start_time': time.time()}
+        self.doc.update(fields)
+        self.subsegments: List['Entity'] = []
+
+    @property
+    def id(self) -> str:
+        return self.doc['id']
+
+    def close(self, status: Optional[int] = None, error: Optional[BaseException] = None,
+              throttle: bool = False) -> None:
+        self.doc['end_time'] = time.time()
+        if status is not None:
+            self.doc.setdefault('http', {})['response'] = {'status': status}
+            if status == 429:
+                throttle = True
+            if status >= 500:
+                self.doc['fault'] = True
+            elif status >= 400:
+                self.doc['error'] = True
+        if throttle:
+            self.doc['throttle'] = True
+            self.doc['error'] = True
+        if error is not None:
+            self.doc.setdefault('fault', not self.doc.get('error', False))
+            self.doc['cause'] = {'exceptions': [{
+                'id': new_id(),
+                'type': type(error).__name__,
+                'message': str(error)[:256]
+            }]}
+
+    def to_dict(self) -> Dict[str, Any]:
+        doc = dict(self.doc)
+        if self.subsegments:
+            doc['subsegments'] = [child.to_dict() for child in self.subsegments]
+        return doc
+
+
+class Segment(Entity):
+    """
+    요청 하나의 세그먼트 (트레이스 ID / 샘플링 결정 포함)
+    """
+
+    __slots__ = ('trace_id', 'sampled', 'recording', 'subsegment_count', 'max_subsegments')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, recording: bool,
+                 max_subsegments: int, **fields: Any):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.recording = recording
+        self.subsegment_count = 0
+        self.max_subsegments = max_subsegments
+        super().__init__(self, name, trace_id=trace_id, **fields)
+        if parent_id:
+            self.doc['parent_id'] = parent_id
+
+    def header(self, parent_id: Optional[str] = None) -> str:
+        """
+        다음 홉으로 전파할 X-Amzn-Trace-Id 값
+        """
+        value = f"Root={self.trace_id}"
+        if parent_id:
+            value += f";Parent={parent_id}"
+        return value + f";Sampled={1 if self.sampled else 0}"
+
+
+class SegmentExporter:
+    """
+    세그먼트를 큐에 모았다가 백그라운드 스레드에서 배치로 내보냅니다.
+    큐가 가득 차면 요청을 막지 않고 버린 뒤 개수만 셉니다.
+    """
+
+    def __init__(self, target: str, batch_size: int = 50, flush_interval: float = 1.0, queue_size: int = 1000):
+        self.target = target
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self._queue: deque = deque()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._socket = None
+        self.exported = 0
+        self.dropped = 0
+        self.send_errors = 0
+
+        scheme, _, rest = target.partition('://')
+        if scheme == 'file':
+            self._path = rest
+            self._address = None
+        else:
+            host, _, port = (rest or os.environ.get('AWS_XRAY_DAEMON_ADDRESS', DEFAULT_DAEMON_ADDRESS)).rpartition(':')
+            self._path = None
+            self._address = (host, int(port))
+
+    def _ensure_worker(self) -> None:
+        # gunicorn fork 이후에는 워커 프로세스마다 스레드 / 소켓을 새로 만듦
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue.clear()
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) if self._address else None
+            threading.Thread(target=self._run, name='trace-exporter', daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, doc: Dict[str, Any]) -> None:
+        self._ensure_worker()
+        if len(self._queue) >= self.queue_size:
+            self.dropped += 1
+            return
+        self._queue.append(doc)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        while self._queue:
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            try:
+                self._send(batch)
+                self.exported += len(batch)
+            except (OSError, ValueError, TypeError):
+                self.send_errors += 1
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        lines = [json.dumps(doc, separators=(',', ':'), default=str) for doc in batch]
+        if self._path:
+            with open(self._path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+            return
+        # X-Ray 데몬은 UDP 패킷 하나에 세그먼트 문서 하나를 받음
+        for line in lines:
+            self._socket.sendto(DAEMON_HEADER + line.encode('utf-8'), self._address)
+
+
+class Tracer:
+    """
+    세그먼트 / 서브세그먼트 생성과 샘플링 결정
+    샘플링되지 않은 요청은 서브세그먼트를 만들지 않고 헤더 전파만 합니다.
+    """
+
+    def __init__(self, service_name: str = 'test-app', exporter: Optional[SegmentExporter] = None,
+                 sample_rate: float = 0.05, reservoir_per_second: int = 1, respect_upstream: bool = True,
+                 slow_threshold_ms: float = 0, max_subsegments: int = 100):
+        self.service_name = service_name
+        self.exporter = exporter
+        self.sampler = Sampler(sample_rate, reservoir_per_second)
+        self.respect_upstream = respect_upstream
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_subsegments = max_subsegments
+        self.requests = 0
+        self.sampled = 0
+        self.slow_exported = 0
+
+    @classmethod
+    def from_env(cls) -> 'Tracer':
+        target = os.environ.get('TRACE_EXPORT', '').strip()
+        exporter = None
+        if target:
+            exporter = SegmentExporter(
+                target,
+                batch_size=int(os.environ.get('TRACE_BATCH_SIZE', '50')),
+                flush_interval=float(os.environ.get('TRACE_FLUSH_INTERVAL', '1')),
+                queue_size=int(os.environ.get('TRACE_QUEUE_SIZE', '1000'))
+            )
+            atexit.register(exporter.flush)
+        return cls(
+            service_name=os.environ.get('TRACE_SERVICE_NAME', 'test-app'),
+            exporter=exporter,
+            sample_rate=float(os.environ.get('TRACE_SAMPLE_RATE', '0.05')),
+            reservoir_per_second=int(os.environ.get('TRACE_RESERVOIR_PER_SECOND', '1')),
+            respect_upstream=os.environ.get('TRACE_RESPECT_UPSTREAM', 'true').lower() == 'true',
+            slow_threshold_ms=float(os.environ.get('TRACE_SLOW_THRESHOLD_MS', '0')),
+            max_subsegments=int(os.environ.get('TRACE_MAX_SUBSEGMENTS', '100'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current(self) -> Optional[Entity]:
+        return _current.get()
+
+    def begin_segment(self, header: Optional[str], **fields: Any) -> Segment:
+        """
+        들어온 X-Amzn-Trace-Id를 이어받아 세그먼트를 시작하고 현재 컨텍스트로 설정합니다.
+        """
+        self.requests += 1
+        upstream = parse_trace_header(header)
+        trace_id = upstream.get('Root') or new_trace_id()
+        decision = upstream.get('Sampled') if self.respect_upstream else None
+        if decision in ('0', '1'):
+            sampled = decision == '1'
+        else:
+            sampled = self.enabled and self.sampler.sample()
+        recording = self.enabled and (sampled or self.slow_threshold_ms > 0)
+        segment = Segment(self.service_name, trace_id, upstream.get('Parent'), sampled, recording,
+                          self.max_subsegments, origin='AWS::ECS::Container', **fields)
+        _current.set(segment)
+        return segment
+
+    def end_segment(self, segment: Segment, status: Optional[int] = None,
+                    error: Optional[BaseException] = None) -> None:
+        _current.set(None)
+        if not segment.recording:
+            return
+        segment.close(status, error)
+        duration_ms = (segment.doc['end_time'] - segment.doc['start_time']) * 1000
+        if segment.sampled:
+            self.sampled += 1
+        elif duration_ms >= self.slow_threshold_ms:
+            self.slow_exported += 1
+            segment.doc.setdefault('annotations', {})['slow_request'] = True
+        else:
+            return
+        if segment.subsegment_count > segment.max_subsegments:
+            segment.doc.setdefault('metadata', {})['truncated_subsegments'] = (
+                segment.subsegment_count - segment.max_subsegments)
+        self.exporter.submit(segment.to_dict())
+
+    def begin_subsegment(self, name: str, namespace: str = 'remote', **fields: Any) -> Optional[Entity]:
+        parent = _current.get()
+        if parent is None or not parent.segment.recording:
+            return None
+        segment = parent.segment
+        segment.subsegment_count += 1
+        if segment.subsegment_count > segment.max_subsegments:
+            return None
+        child = Entity(segment, name, namespace=namespace, **fields)
+        parent.subsegments.append(child)
+        return child
+
+    @contextlib.contextmanager
+    def subsegment(self, name: str, namespace: str = 'remote', **fields: Any) -> Iterator[Optional[Entity]]:
+        """
+        with 블록 하나를 서브세그먼트로 기록합니다 (기록하지 않는 요청이면 None).
+        """
+        child = self.begin_subsegment(name, namespace, **fields)
+        if child is None:
+            yield None
+            return
+        token = _current.set(child)
+        try:
+            yield child
+        except BaseException as e:
+            child.close(error=e)
+            raise
+        else:
+            child.close()
+        finally:
+            _current.reset(token)
+
+    def outgoing_header(self) -> Optional[str]:
+        entity = _current.get()
+        if entity is None:
+            return None
+        return entity.segment.header(entity.id if entity.segment.recording else None)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "enabled": self.enabled,
+            "sample_rate": self.sampler.rate,
+            "reservoir_per_second": self.sampler.reservoir_per_second,
+            "slow_threshold_ms": self.slow_threshold_ms,
+            "requests": self.requests,
+            "sampled": self.sampled,
+            "slow_exported": self.slow_exported
+        }
+        if self.exporter:
+            stats.update({
+                "target": self.exporter.target,
+                "exported": self.exporter.exported,
+                "dropped": self.exporter.dropped,
+                "send_errors": self.exporter.send_errors,
+                "queued": len(self.exporter._queue)
+            })
+        return stats
+
+
+def init_flask(app: Any, tracer: Tracer) -> None:
+    """
+    Flask 요청마다 세그먼트를 만들고 응답 헤더에 트레이스 ID를 돌려줍니다.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _begin_segment():
+        segment = tracer.begin_segment(request.headers.get(TRACE_HEADER))
+        if segment.recording:
+            segment.doc['http'] = {'request': {
+                'method': request.method,
+                'url': request.base_url,
+                'client_ip': request.access_route[0] if request.access_route else request.remote_addr,
+                'user_agent': request.user_agent.string,
+                'x_forwarded_for': bool(request.headers.get('X-Forwarded-For'))
+            }}
+            segment.doc['annotations'] = {'route': request.endpoint or 'unknown'}
+        g.trace_segment = segment
+
+    @app.after_request
+    def _trace_response(response):
+        segment = g.get('trace_segment')
+        if segment is not None:
+            response.headers[TRACE_HEADER] = segment.header()
+            g.trace_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _end_segment(error=None):
+        segment = g.pop('trace_segment', None)
+        if segment is not None:
+            tracer.end_segment(segment, g.pop('trace_status', 500 if error else None), error)
+
+
+def instrument_boto_client(client: Any, tracer: Tracer) -> None:
+    """
+    botocore 이벤트 훅으로 API 호출마다 서브세그먼트를 기록합니다 (재시도 포함 전체 시간).
+    """
+    service = client.meta.service_model.service_id.hyphenize()
+    name = client.meta.service_model.service_id
+
+    def before_parameter_build(params=None, context=None, **kwargs):
+        if isinstance(params, dict) and 'TableName' in params:
+            context['trace_table_name'] = params['TableName']
+
+    def before_call(model=None, context=None, **kwargs):
+        child = tracer.begin_subsegment(name, 'aws', aws={'operation': model.name, 'region': client.meta.region_name})
+        if child is not None:
+            if 'trace_table_name' in context:
+                child.doc['aws']['table_name'] = context['trace_table_name']
+            context['trace_subsegment'] = child
+
+    def after_call(http_response=None, parsed=None, context=None, **kwargs):
+        child = context.pop('trace_subsegment', None)
+        if child is None:
+            return
+        metadata = (parsed or {}).get('ResponseMetadata', {})
+        child.doc['aws']['request_id'] = metadata.get('RequestId')
+        child.doc['aws']['retries'] = metadata.get('RetryAttempts', 0)
+        code = (parsed or {}).get('Error', {}).get('Code')
+        child.close(status=http_response.status_code if http_response is not None else None,
+                    throttle=code in THROTTLE_ERROR_CODES)
+
+    def after_call_error(exception=None, context=None, **kwargs):
+        child = context.pop('trace_subsegment', None)
+        if child is not None:
+            child.close(error=exception)
+
+    client.meta.events.register(f"before-parameter-build.{service}", before_parameter_build)
+    client.meta.events.register(f"before-call.{service}", before_call)
+    client.meta.events.register(f"after-call.{service}", after_call)
+    client.meta.events.register(f"after-call-error.{service}", after_call_error)
+
+
+def instrument_redis(client: Any, tracer: Tracer,
+                     methods: Any = ('get', 'set', 'setex', 'delete', 'mget', 'mset', 'ping')) -> None:
+    """
+    Redis 클라이언트(ShardedRedis 등) 인스턴스의 명령 메서드를 서브세그먼트로 감쌉니다.
+    """
+    def wrap(method_name: str, method: Any) -> Any:
+        command = method_name.upper()
+
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            with tracer.subsegment('Redis', metadata={'redis': {'command': command}}):
+                return method(*args, **kwargs)
+        return traced
+
+    for method_name in methods:
+        method = getattr(client, method_name, None)
+        if method is not None:
+            setattr(client, method_name, wrap(method_name, method))
+
+
+def instrument_requests(tracer: Tracer) -> None:
+    """
+    requests의 모든 외부 호출을 서브세그먼트로 기록하고 X-Amzn-Trace-Id를 전파합니다.
+    """
+    import requests
+
+    send = requests.Session.send
+    if getattr(send, '_traced', False):
+        return
+
+    def traced_send(session, prepared, **kwargs):
+        host = urlsplit(prepared.url).hostname or 'remote'
+        with tracer.subsegment(host, 'remote', http={'request': {'method': prepared.method,
+                                                                  'url': prepared.url.split('?')[0]}}) as child:
+            header = tracer.outgoing_header()
+            if header:
+                prepared.headers[TRACE_HEADER] = header
+            response = send(session, prepared, **kwargs)
+            if child is not None:
+                child.doc['http']['response'] = {'status': response.status_code}
+                if response.status_code >= 500:
+                    child.doc['fault'] = True
+                elif response.status_code >= 400:
+                    child.doc['error'] = True
+            return response
+
+    traced_send._traced = True
+    requests.Session.send = traced_send